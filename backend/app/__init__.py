@@ -15,6 +15,7 @@ jwt = JWTManager()
 
 def create_app(config_class=Config):
     app = Flask(__name__)
+    app.config.from_object(config_class)
     
     # Configuration de base
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL')
@@ -29,16 +30,44 @@ def create_app(config_class=Config):
     CORS(app)
     jwt.init_app(app)
 
+    # En premier : son after_request s'exécute après tous les autres
+    from app.services.query_metrics import query_metrics
+    query_metrics.init_app(app)
+    from app.services.notification_service import notification_dispatcher
+    notification_dispatcher.init_app(app)
+    from app.services.events import tournament_events
+    tournament_events.init_app(app)
+    from app.services.response_cache import response_cache
+    response_cache.init_app(app)
+    from app.services.password_service import password_hasher
+    password_hasher.init_app(app)
+    from app.services.user_cache import user_cache
+    user_cache.init_app(app)
+
+    # ETag / 304 et compression de toutes les réponses JSON
+    from app import conditional
+    conditional.init_app(app)
+
     with app.app_context():
         # Import models
-        from app.models import user, tournament
+        from app.models import user, tournament, notification, standing, rating, user_stats
         
         # Create database tables
         db.create_all()
 
         # Register blueprints
-        from app.routes import auth, tournaments
+        from app.routes import auth, tournaments, notifications, exports, ratings, users, search, debug
         app.register_blueprint(auth.bp)
         app.register_blueprint(tournaments.bp)
+        app.register_blueprint(notifications.bp)
+        app.register_blueprint(exports.bp)
+        app.register_blueprint(ratings.bp)
+        app.register_blueprint(users.bp)
+        app.register_blueprint(search.bp)
+        app.register_blueprint(debug.bp)
+
+    # Commandes CLI (flask backfill-matches, ...)
+    from app.cli import register_commands
+    register_commands(app)
 
     return app 
\ No newline at end of file
@@ -0,0 +1,62 @@
+import click
+
+
+def register_commands(app):
+    @app.cli.command('backfill-matches')
+    @click.option('--batch-size', default=100, show_default=True, help='Tournaments per transaction')
+    def backfill_matches(batch_size):
+        """Projette les brackets existants dans la table match."""
+        from app.services.match_sync import MatchSyncService
+        total = MatchSyncService.backfill(batch_size, echo=click.echo)
+        click.echo(f'Done: {total} tournaments synchronized')
+
+    @app.cli.command('process-notifications')
+    @click.option('--batch-size', default=100, show_default=True)
+    def process_notifications(batch_size):
+        """Traite les envois de notifications restés en attente dans l'outbox."""
+        from app.services.notification_service import NotificationService
+        total = NotificationService.process_pending(batch_size)
+        click.echo(f'Done: {total} outbox entries processed')
+
+    @app.cli.command('rebuild-unread-counts')
+    def rebuild_unread_counts():
+        """Recalcule les compteurs de notifications non lues."""
+        from app.services.notification_service import NotificationService
+        total = NotificationService.rebuild_unread_counts()
+        click.echo(f'Done: {total} users updated')
+
+    @app.cli.command('rebuild-seat-counts')
+    def rebuild_seat_counts():
+        """Recalcule les compteurs de places occupées des tournois."""
+        from app.services.participant_service import ParticipantService
+        total = ParticipantService.rebuild_seat_counts()
+        click.echo(f'Done: {total} tournaments updated')
+
+    @app.cli.command('rebuild-standings')
+    @click.option('--tournament-id', type=int, help='Only this tournament')
+    def rebuild_standings(tournament_id):
+        """Recalcule les classements depuis la table match."""
+        from app import db
+        from app.models.tournament import Tournament
+        from app.services.standings_service import StandingsService
+        if tournament_id is not None:
+            ids = [tournament_id]
+        else:
+            ids = db.session.scalars(db.select(Tournament.id).order_by(Tournament.id)).all()
+        for current_id in ids:
+            StandingsService.rebuild(current_id)
+        click.echo(f'Done: {len(ids)} tournaments rebuilt')
+
+    @app.cli.command('replay-ratings')
+    def replay_ratings():
+        """Recalcule les classements Elo depuis tout l'historique des matchs."""
+        from app.services.rating_service import RatingService
+        total = RatingService.replay()
+        click.echo(f'Done: {total} ratings replayed')
+
+    @app.cli.command('rebuild-user-stats')
+    def rebuild_user_stats():
+        """Recalcule les bilans des comptes (tournois, podiums, matchs) en quelques agrégats SQL."""
+        from app.services.user_stats_service import UserStatsService
+        total = UserStatsService.rebuild(echo=click.echo)
+        click.echo(f'Done: {total} users rebuilt')
@@ -0,0 +1,81 @@
+"""Requêtes conditionnelles et compression des réponses JSON.
+
+Enregistré dans ``create_app`` : chaque réponse GET en JSON reçoit un ETag
+fort (empreinte du corps, sauf si la route en fournit un), un
+``If-None-Match`` correspondant est servi en 304 sans corps, et les corps
+au-delà de COMPRESS_MIN_SIZE sont compressés en brotli (si le module est
+installé) ou gzip selon ``Accept-Encoding``.
+
+Une réponse compressée n'a pas les mêmes octets : son ETag reçoit le
+suffixe du codage (``"…-gzip"``). ``If-None-Match`` accepte les deux
+formes, et les routes qui comparent elles-mêmes un ETag (``If-Match``)
+passent par ``etag_variants``.
+"""
+import gzip
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/plain', 'text/csv', 'text/html')
+ENCODINGS = ('br', 'gzip')
+
+
+def etag_variants(etag):
+    """ETag d'une représentation et ses formes compressées."""
+    return [etag] + [f'{etag}-{encoding}' for encoding in ENCODINGS]
+
+
+def _accepted_encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def _compress(app, data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=app.config.get('COMPRESS_BR_QUALITY', 5))
+    return gzip.compress(data, compresslevel=app.config.get('COMPRESS_GZIP_LEVEL', 6))
+
+
+def init_app(app):
+    @app.after_request
+    def conditional_and_compressed(response):
+        # Flux (SSE, exports) et fichiers : laissés tels quels
+        if response.is_streamed or response.direct_passthrough:
+            return response
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+
+        encoding = None
+        if response.status_code == 200 and 'Content-Encoding' not in response.headers:
+            response.vary.add('Accept-Encoding')
+            if len(response.get_data()) >= app.config.get('COMPRESS_MIN_SIZE', 1024):
+                encoding = _accepted_encoding()
+
+        if request.method in ('GET', 'HEAD') and response.status_code == 200:
+            if 'ETag' not in response.headers:
+                response.add_etag()
+            # Revalidation systématique ; réponses authentifiées hors des caches partagés
+            response.headers.setdefault(
+                'Cache-Control', 'private, no-cache' if 'Authorization' in request.headers else 'no-cache'
+            )
+            etag, weak = response.get_etag()
+            # Forme non compressée présentée par le client : 304 sous cet ETag, sinon ETag du codage
+            if encoding is not None and not request.if_none_match.contains_weak(etag):
+                response.set_etag(f'{etag}-{encoding}', weak)
+            response.make_conditional(request)
+            if response.status_code == 304:
+                return response
+
+        if encoding is None:
+            return response
+        response.set_data(_compress(app, response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+        return response
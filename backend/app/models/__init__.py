@@ -1 +1 @@
-from . import user, tournament 
\ No newline at end of file
+from . import user, tournament, notification, standing, rating, user_stats, event
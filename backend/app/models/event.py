@@ -0,0 +1,12 @@
+from app import db
+
+class TournamentEventSequence(db.Model):
+    """Dernier id d'évènement SSE émis pour un tournoi (EVENTS_BACKEND='postgres').
+
+    Partagé par tous les workers : l'id est attribué par l'émetteur, dans la
+    transaction du NOTIFY, et un Last-Event-ID a le même sens sur chaque
+    worker. Pas de clé étrangère : l'évènement 'deleted' suit la suppression.
+    """
+    __tablename__ = 'tournament_event_sequence'
+    tournament_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    last_id = db.Column(db.Integer, nullable=False, default=0, server_default='0')
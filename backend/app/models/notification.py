@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from app import db
 
 class Notification(db.Model):
@@ -7,4 +9,28 @@ class Notification(db.Model):
     message = db.Column(db.Text, nullable=False)
     type = db.Column(db.String(50), nullable=False)
     read = db.Column(db.Boolean, default=False)
-    user = db.relationship('User', backref='notifications') 
\ No newline at end of file
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, server_default=db.func.now())
+    user = db.relationship('User', backref='notifications')
+    __table_args__ = (
+        db.Index('ix_notification_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+        # Index partiel : seules les notifications non lues sont indexées ; les requêtes
+        # écrivent ``read == db.false()`` pour reprendre ce prédicat (``IS false`` ne l'utilise pas)
+        db.Index('ix_notification_user_id_unread', 'user_id',
+                 postgresql_where=db.text('read = false'), sqlite_where=db.text('read = 0')),
+    )
+
+class NotificationOutbox(db.Model):
+    """Envoi de notifications en attente, traité hors de la requête par le dispatcher."""
+    __tablename__ = 'notification_outbox'
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, server_default=db.func.now())
+    # Début du traitement en cours : une ligne 'processing' trop ancienne est reprise
+    claimed_at = db.Column(db.DateTime)
+    __table_args__ = (
+        db.Index('ix_notification_outbox_status_id', 'status', 'id'),
+    )
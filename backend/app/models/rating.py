@@ -0,0 +1,33 @@
+from app import db
+
+# game_type des lignes du classement toutes disciplines confondues
+ALL_GAME_TYPES = '*'
+# Tranches de RatingBucket : niveau 0 = un point de rating, niveau 1 = RATING_BUCKET_GROUP tranches
+RATING_BUCKET_GROUP = 100
+
+class PlayerRating(db.Model):
+    """Classement Elo d'un compte pour un type de jeu (ou ALL_GAME_TYPES), tenu à jour par RatingService."""
+    __tablename__ = 'player_rating'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    game_type = db.Column(db.String(64), nullable=False)
+    rating = db.Column(db.Float, nullable=False)
+    games = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'game_type', name='unique_player_rating_game_type'),
+        # Top N par descente d'index (O(log n + N)) ; le rang passe par RatingBucket
+        db.Index('ix_player_rating_game_type_rating_user_id', 'game_type', 'rating', 'user_id'),
+    )
+
+
+class RatingBucket(db.Model):
+    """Nombre de classements par tranche de rating, pour un rang sans parcourir les mieux classés.
+
+    Tenu à jour par RatingService avec les classements : niveau 0, tranche
+    ``floor(rating)`` ; niveau 1, tranche ``floor(rating) // RATING_BUCKET_GROUP``.
+    """
+    __tablename__ = 'rating_bucket'
+    game_type = db.Column(db.String(64), primary_key=True)
+    level = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    bucket = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
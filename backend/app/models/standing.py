@@ -0,0 +1,23 @@
+from app import db
+
+class Standing(db.Model):
+    """Ligne du classement d'un tournoi, mise à jour à chaque résultat (voir StandingsService)."""
+    __tablename__ = 'standing'
+    id = db.Column(db.Integer, primary_key=True)
+    tournament_id = db.Column(db.Integer, db.ForeignKey('tournament.id', ondelete='CASCADE'), nullable=False)
+    participant_id = db.Column(db.Integer, db.ForeignKey('tournament_participant.id', ondelete='CASCADE'), nullable=False)
+    played = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    wins = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    draws = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    losses = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    points = db.Column(db.Float, nullable=False, default=0, server_default='0')
+    score_for = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    score_against = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Départages suisses : somme des points des adversaires / des adversaires battus (+ moitié des nuls)
+    buchholz = db.Column(db.Float, nullable=False, default=0, server_default='0')
+    sonneborn_berger = db.Column(db.Float, nullable=False, default=0, server_default='0')
+    # Élimination : étape à laquelle le participant est sorti (NULL = encore en lice)
+    eliminated_stage = db.Column(db.Integer)
+    __table_args__ = (
+        db.UniqueConstraint('tournament_id', 'participant_id', name='unique_standing_participant'),
+    )
@@ -1,5 +1,17 @@
+from sqlalchemy import DDL, event
+
 from app import db
 
+# Configuration plein texte sans racinisation : noms propres et mots de plusieurs langues
+SEARCH_CONFIG = 'simple'
+# tsvector pondéré (nom A, type de jeu B, description C), colonne générée PostgreSQL
+# tournament.search_vector : hors du modèle, SQLite n'ayant pas d'équivalent
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(game_type, '')), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'C')"
+)
+
 class Tournament(db.Model):
     __tablename__ = 'tournament'
     id = db.Column(db.Integer, primary_key=True)
@@ -11,8 +23,34 @@ class Tournament(db.Model):
     creator_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     max_participants = db.Column(db.Integer)
     bracket = db.Column(db.JSON, nullable=True)
+    # Incrémenté à chaque écriture du bracket (ETag / If-Match)
+    bracket_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Places occupées (participants 'pending' ou 'accepted'), réservées par UPDATE conditionnel
+    seats_taken = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Complet : les nouvelles inscriptions passent en liste d'attente au lieu d'être refusées
+    waitlist = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
     participants = db.relationship('TournamentParticipant', backref='tournament', lazy='dynamic', cascade="all, delete-orphan")
-    matches = db.relationship('Match', backref='tournament', lazy='dynamic')
+    matches = db.relationship('Match', backref='tournament', lazy='dynamic', cascade="all, delete-orphan")
+    # Index composites pour la liste paginée : (filtre, clé de tri..., id)
+    __table_args__ = (
+        db.Index('ix_tournament_name_id', 'name', 'id'),
+        db.Index('ix_tournament_status_id', 'status', 'id'),
+        db.Index('ix_tournament_status_name_id', 'status', 'name', 'id'),
+        db.Index('ix_tournament_game_type_id', 'game_type', 'id'),
+        db.Index('ix_tournament_game_type_name_id', 'game_type', 'name', 'id'),
+        db.Index('ix_tournament_format_id', 'format', 'id'),
+        db.Index('ix_tournament_format_name_id', 'format', 'name', 'id'),
+        db.Index('ix_tournament_creator_id_id', 'creator_id', 'id'),
+        db.Index('ix_tournament_creator_id_name_id', 'creator_id', 'name', 'id'),
+    )
+
+# Recherche plein texte quand les tables sont créées par create_all (PostgreSQL uniquement)
+event.listen(Tournament.__table__, 'after_create', DDL(
+    f'ALTER TABLE tournament ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR_SQL}) STORED'
+).execute_if(dialect='postgresql'))
+event.listen(Tournament.__table__, 'after_create', DDL(
+    'CREATE INDEX ix_tournament_search_vector ON tournament USING gin (search_vector)'
+).execute_if(dialect='postgresql'))
 
 class TournamentParticipant(db.Model):
     __tablename__ = 'tournament_participant'
@@ -21,8 +59,18 @@ class TournamentParticipant(db.Model):
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     guest_name = db.Column(db.String(128), nullable=True)
     status = db.Column(db.String(32), default='pending')
+    # Place au classement final, figée quand le tournoi passe à 'completed'
+    final_rank = db.Column(db.Integer)
     __table_args__ = (
         db.UniqueConstraint('tournament_id', 'user_id', 'guest_name', name='unique_tournament_participant'),
+        # NULL n'étant jamais égal à NULL, la contrainte ci-dessus ne bloque aucun doublon :
+        # unicité partielle d'un compte et d'un nom d'invité par tournoi
+        db.Index('uq_tournament_participant_user', 'tournament_id', 'user_id', unique=True,
+                 postgresql_where=db.text('user_id IS NOT NULL'), sqlite_where=db.text('user_id IS NOT NULL')),
+        db.Index('uq_tournament_participant_guest', 'tournament_id', 'guest_name', unique=True,
+                 postgresql_where=db.text('guest_name IS NOT NULL'), sqlite_where=db.text('guest_name IS NOT NULL')),
+        # Historique d'un compte, du plus récent au plus ancien
+        db.Index('ix_tournament_participant_user_id_tournament_id', 'user_id', 'tournament_id'),
     )
 
 class Match(db.Model):
@@ -34,4 +82,19 @@ class Match(db.Model):
     score1 = db.Column(db.Integer)
     score2 = db.Column(db.Integer)
     winner_id = db.Column(db.Integer, db.ForeignKey('user.id'))
-    status = db.Column(db.String(20), default='pending') 
\ No newline at end of file
+    status = db.Column(db.String(20), default='pending')
+    # Projection du bracket JSON : identifiant du match dans le bracket ('wb-1-0'...)
+    bracket_match_id = db.Column(db.String(32))
+    section = db.Column(db.String(16))
+    # Les invités n'ont pas de compte : les participants sont aussi référencés directement
+    participant1_id = db.Column(db.Integer, db.ForeignKey('tournament_participant.id', ondelete='SET NULL'))
+    participant2_id = db.Column(db.Integer, db.ForeignKey('tournament_participant.id', ondelete='SET NULL'))
+    winner_participant_id = db.Column(db.Integer, db.ForeignKey('tournament_participant.id', ondelete='SET NULL'))
+    __table_args__ = (
+        db.UniqueConstraint('tournament_id', 'bracket_match_id', name='unique_match_bracket_match_id'),
+        db.Index('ix_match_tournament_id_round', 'tournament_id', 'round'),
+        # (joueur, id) : matchs d'un compte parcourus par id décroissant sans tri
+        db.Index('ix_match_player1_id_id', 'player1_id', 'id'),
+        db.Index('ix_match_player2_id_id', 'player2_id', 'id'),
+        db.Index('ix_match_winner_id', 'winner_id'),
+    )
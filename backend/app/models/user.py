@@ -1,5 +1,7 @@
+from sqlalchemy import DDL, event
+
 from app import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.services.password_service import password_hasher
 
 class User(db.Model):
     __tablename__ = 'user'
@@ -8,12 +10,26 @@ class User(db.Model):
     username = db.Column(db.String(64), unique=True, nullable=False)
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(256), nullable=False)
+    # Compteur maintenu à chaque création / lecture de notification
+    unread_notification_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     tournaments_created = db.relationship('Tournament', backref='creator', lazy='dynamic')
     participations = db.relationship('TournamentParticipant', backref='user', lazy='dynamic')
+    __table_args__ = (
+        # Autocomplétion : trigrammes de lower(username) pour LIKE 'préfixe%' (PostgreSQL + pg_trgm)
+        db.Index('ix_user_username_trgm', db.func.lower(username).label('username_lower'),
+                 postgresql_using='gin', postgresql_ops={'username_lower': 'gin_trgm_ops'}).ddl_if(dialect='postgresql'),
+    )
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password) 
\ No newline at end of file
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
+
+# Extension nécessaire à l'index trigramme quand les tables sont créées par create_all
+event.listen(User.__table__, 'before_create',
+             DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql'))
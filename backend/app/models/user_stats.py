@@ -0,0 +1,19 @@
+from app import db
+
+class UserStats(db.Model):
+    """Bilan d'un compte pour un type de jeu (ou ALL_GAME_TYPES), tenu à jour par UserStatsService."""
+    __tablename__ = 'user_stats'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    game_type = db.Column(db.String(64), nullable=False)
+    # Tournois terminés (statut 'completed') et places finales
+    tournaments_played = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    tournaments_won = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    podiums = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    matches_played = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    wins = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    draws = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    losses = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'game_type', name='unique_user_stats_game_type'),
+    )
@@ -0,0 +1,54 @@
+import base64
+import json
+
+from flask import request, url_for
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class PaginationError(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise PaginationError('Invalid cursor')
+    if not isinstance(values, list):
+        raise PaginationError('Invalid cursor')
+    return values
+
+
+def get_limit(default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    try:
+        limit = int(request.args.get('limit', default))
+    except ValueError:
+        raise PaginationError('limit must be an integer')
+    if limit < 1:
+        raise PaginationError('limit must be positive')
+    return min(limit, maximum)
+
+
+def set_next_cursor(response, next_cursor):
+    """Ajoute le curseur de la page suivante dans les en-têtes.
+
+    Le corps reste un tableau JSON pour les clients existants ; la page
+    suivante est annoncée par X-Next-Cursor et un en-tête Link.
+    """
+    if next_cursor is None:
+        return response
+    args = request.args.to_dict()
+    args['cursor'] = next_cursor
+    next_url = url_for(request.endpoint, **(request.view_args or {}), **args)
+    response.headers['X-Next-Cursor'] = next_cursor
+    response.headers['Link'] = f'<{next_url}>; rel="next"'
+    response.headers['Access-Control-Expose-Headers'] = 'X-Next-Cursor, Link'
+    return response
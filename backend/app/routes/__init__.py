@@ -1 +1 @@
-from . import auth, tournaments 
\ No newline at end of file
+from . import auth, tournaments, notifications, exports, ratings, users, search, debug
\ No newline at end of file
@@ -1,11 +1,20 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, jwt_required, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from app import db
 from app.models.user import User
+from app.services.password_service import PasswordHasherBusy
+from app.services.query_metrics import query_budget
+from app.services.user_cache import user_cache
 
 bp = Blueprint('auth', __name__)
 
+def _busy():
+    response = jsonify({'message': 'Server busy, please retry'})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
 @bp.route('/auth/register', methods=['POST'])
 def register():
     data = request.get_json()
@@ -19,7 +28,10 @@ def register():
         username=data['username'],
         email=data['email']
     )
-    new_user.set_password(data['password'])
+    try:
+        new_user.set_password(data['password'])
+    except PasswordHasherBusy:
+        return _busy()
     
     try:
         db.session.add(new_user)
@@ -46,7 +58,18 @@ def login():
     data = request.get_json()
     user = User.query.filter_by(email=data['email']).first()
     
-    if user and user.check_password(data['password']):
+    try:
+        valid = user is not None and user.check_password(data['password'])
+        if valid and user.password_needs_rehash():
+            # Mise à niveau transparente vers l'algorithme / coût configuré
+            user.set_password(data['password'])
+            db.session.commit()
+    except PasswordHasherBusy:
+        return _busy()
+
+    if valid:
+        # Préchauffe le cache : les requêtes authentifiées suivantes n'iront pas en base
+        user_cache.put(user)
         access_token = create_access_token(identity=str(user.id))
         return jsonify({
             'access_token': access_token,
@@ -60,16 +83,8 @@ def login():
     return jsonify({'message': 'Invalid email or password'}), 401
 
 @bp.route('/auth/me', methods=['GET'])
+@query_budget(1)
 @jwt_required()
 def get_current_user():
-    current_user_id = get_jwt_identity()
-    user = User.query.get(int(current_user_id))
-    
-    if not user:
-        return jsonify({'message': 'User not found'}), 404
-    
-    return jsonify({
-        'id': user.id,
-        'username': user.username,
-        'email': user.email
-    }), 200 
\ No newline at end of file
+    # Résolu par user_cache lors de la vérification du jeton
+    return jsonify(current_user._asdict()), 200
\ No newline at end of file
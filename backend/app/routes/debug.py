@@ -0,0 +1,26 @@
+from flask import Blueprint, abort, jsonify
+from app.services.query_metrics import query_metrics
+from app.services.response_cache import response_cache
+
+bp = Blueprint('debug', __name__)
+
+@bp.route('/debug/cache', methods=['GET'])
+def get_cache_stats():
+    # Comme /debug/queries : rien d'exposé hors instrumentation
+    if not query_metrics.enabled:
+        abort(404)
+    return jsonify(response_cache.stats())
+
+@bp.route('/debug/queries', methods=['GET'])
+def get_query_stats():
+    # Texte des requêtes SQL : exposé seulement si l'instrumentation est activée
+    if not query_metrics.enabled:
+        abort(404)
+    return jsonify(query_metrics.stats())
+
+@bp.route('/debug/queries', methods=['DELETE'])
+def reset_query_stats():
+    if not query_metrics.enabled:
+        abort(404)
+    query_metrics.reset()
+    return '', 204
@@ -0,0 +1,40 @@
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required, current_user
+from app.models.tournament import Tournament
+from app.services.export_service import EXPORT_TABLES, ExportService
+
+bp = Blueprint('exports', __name__)
+
+def _export_response(tournament_id=None, creator_id=None, filename='export'):
+    export_format = request.args.get('format', 'ndjson')
+    if export_format == 'ndjson':
+        body = ExportService.ndjson(tournament_id, creator_id)
+        mimetype = 'application/x-ndjson'
+    elif export_format == 'csv':
+        table = request.args.get('table', 'participants')
+        if table not in EXPORT_TABLES:
+            return jsonify({'error': f"Invalid table: {table} (expected one of {', '.join(EXPORT_TABLES)})"}), 400
+        body = ExportService.csv(table, tournament_id, creator_id)
+        mimetype = 'text/csv'
+        filename = f'{filename}-{table}'
+    else:
+        return jsonify({'error': f'Invalid format: {export_format}'}), 400
+    # Corps produit au fil de la lecture des curseurs : la session reste ouverte jusqu'au dernier morceau
+    return Response(stream_with_context(body), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename="{filename}.{export_format}"',
+        'X-Accel-Buffering': 'no'
+    })
+
+@bp.route('/tournaments/<int:tournament_id>/export', methods=['GET'])
+@jwt_required()
+def export_tournament(tournament_id):
+    tournament = Tournament.query.get_or_404(tournament_id)
+    if tournament.creator_id != current_user.id:
+        return jsonify({'error': 'Only the creator can export this tournament'}), 403
+    return _export_response(tournament_id=tournament_id, filename=f'tournament-{tournament_id}')
+
+@bp.route('/tournaments/export', methods=['GET'])
+@jwt_required()
+def export_my_tournaments():
+    # Tous les tournois créés par l'utilisateur connecté
+    return _export_response(creator_id=current_user.id, filename=f'tournaments-{current_user.id}')
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required, current_user
+from sqlalchemy import tuple_
+from app import db
+from app.models.notification import Notification
+from app.pagination import PaginationError, decode_cursor, encode_cursor, get_limit, set_next_cursor
+from app.services.notification_service import NotificationService
+from app.services.query_metrics import query_budget
+
+bp = Blueprint('notifications', __name__)
+
+@bp.route('/notifications', methods=['GET'])
+@query_budget(2)
+@jwt_required()
+def get_notifications():
+    current_user_id = current_user.id
+    try:
+        limit = get_limit()
+        cursor = decode_cursor(request.args['cursor']) if 'cursor' in request.args else None
+        if cursor is not None:
+            if len(cursor) != 2:
+                raise PaginationError('Invalid cursor')
+            cursor = (datetime.fromisoformat(cursor[0]), int(cursor[1]))
+    except (PaginationError, TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Les plus récentes d'abord, reprise par (created_at, id) : même coût à toute profondeur
+    query = db.select(Notification).where(Notification.user_id == current_user_id)
+    if request.args.get('unread', '').lower() in ('1', 'true', 'yes'):
+        query = query.where(Notification.read == db.false())
+    if cursor is not None:
+        query = query.where(tuple_(Notification.created_at, Notification.id) < cursor)
+    notifications = db.session.scalars(
+        query.order_by(Notification.created_at.desc(), Notification.id.desc()).limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(notifications) > limit:
+        notifications = notifications[:limit]
+        last = notifications[-1]
+        next_cursor = encode_cursor([last.created_at.isoformat(), last.id])
+    response = jsonify([
+        {
+            'id': n.id,
+            'title': n.title,
+            'message': n.message,
+            'type': n.type,
+            'read': bool(n.read),
+            'created_at': n.created_at.isoformat()
+        } for n in notifications
+    ])
+    return set_next_cursor(response, next_cursor)
+
+@bp.route('/notifications/unread_count', methods=['GET'])
+@query_budget(2)
+@jwt_required()
+def get_unread_count():
+    return jsonify({'unread': NotificationService.unread_count(current_user.id)})
+
+@bp.route('/notifications/read', methods=['POST'])
+@jwt_required()
+def mark_notifications_read():
+    current_user_id = current_user.id
+    data = request.get_json(silent=True) or {}
+    if data.get('all'):
+        ids = None
+    else:
+        ids = data.get('ids')
+        if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+            return jsonify({'error': 'ids must be a list of notification ids, or all must be true'}), 400
+    updated = NotificationService.mark_read(current_user_id, ids)
+    return jsonify({'updated': updated, 'unread': NotificationService.unread_count(current_user_id)})
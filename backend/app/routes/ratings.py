@@ -0,0 +1,80 @@
+from flask import Blueprint, request, jsonify
+from app import db
+from app.models.rating import ALL_GAME_TYPES, PlayerRating
+from app.pagination import PaginationError, decode_cursor, encode_cursor, get_limit, set_next_cursor
+from app.services.query_metrics import query_budget
+from app.services.rating_service import RatingService
+from app.services.user_cache import user_cache
+
+bp = Blueprint('ratings', __name__)
+
+def _game_type():
+    # Sans game_type : classement toutes disciplines confondues
+    return request.args.get('game_type') or ALL_GAME_TYPES
+
+def _public_game_type(game_type):
+    return None if game_type == ALL_GAME_TYPES else game_type
+
+@bp.route('/ratings', methods=['GET'])
+@query_budget(3)
+def get_leaderboard():
+    game_type = _game_type()
+    try:
+        limit = get_limit()
+        cursor = decode_cursor(request.args['cursor']) if 'cursor' in request.args else None
+        if cursor is not None:
+            if len(cursor) != 3:
+                raise PaginationError('Invalid cursor')
+            cursor = (float(cursor[0]), int(cursor[1]), int(cursor[2]))
+    except (PaginationError, TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Curseur (rating, user_id, position) : reprise par l'index sans OFFSET
+    rows = RatingService.leaderboard(game_type, limit + 1, cursor[:2] if cursor else None)
+    first_position = cursor[2] + 1 if cursor else 1
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].rating, rows[-1].user_id, first_position + limit - 1])
+    users = user_cache.get_many([row.user_id for row in rows])
+    entries = []
+    for index, row in enumerate(rows):
+        # Ex aequo : même rang ; sinon le rang est la position dans le classement
+        if index and row.rating == rows[index - 1].rating:
+            rank = entries[-1]['rank']
+        elif index or first_position == 1:
+            rank = first_position + index
+        else:
+            rank = RatingService.rank_of(game_type, row.rating)
+        user = users.get(row.user_id)
+        entries.append({
+            'rank': rank,
+            'user_id': row.user_id,
+            'username': user.username if user else None,
+            'game_type': _public_game_type(game_type),
+            'rating': round(row.rating, 1),
+            'games': row.games
+        })
+    return set_next_cursor(jsonify(entries), next_cursor)
+
+@bp.route('/ratings/users/<int:user_id>', methods=['GET'])
+@query_budget(2)
+def get_user_ratings(user_id):
+    """Classements d'un compte (tous types de jeu, ou ``game_type``) avec son rang dans chacun."""
+    if user_cache.get(user_id) is None:
+        return jsonify({'error': 'User not found'}), 404
+    # Rang calculé dans la même requête (comptes par tranche de rating, O(log n)) : pas une requête par type de jeu
+    query = db.select(PlayerRating.game_type, PlayerRating.rating, PlayerRating.games,
+                      RatingService.rank_expression().label('rank')) \
+        .where(PlayerRating.user_id == user_id)
+    if 'game_type' in request.args:
+        query = query.where(PlayerRating.game_type == _game_type())
+    rows = db.session.execute(query.order_by(PlayerRating.game_type)).all()
+    return jsonify([
+        {
+            'game_type': _public_game_type(row.game_type),
+            'rating': round(row.rating, 1),
+            'games': row.games,
+            'rank': row.rank
+        } for row in rows
+    ])
@@ -0,0 +1,67 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.pagination import PaginationError, decode_cursor, encode_cursor, get_limit, set_next_cursor
+from app.services.query_metrics import query_budget
+from app.services.search_service import SearchService
+
+bp = Blueprint('search', __name__)
+
+# Longueur maximale du texte recherché
+MAX_QUERY_LENGTH = 200
+
+def _search_args(cursor_types):
+    """(texte, limit, curseur typé ou None) ; lève PaginationError."""
+    text = request.args.get('q', '')
+    if len(text) > MAX_QUERY_LENGTH:
+        raise PaginationError(f'q must be at most {MAX_QUERY_LENGTH} characters')
+    limit = get_limit(default=20)
+    if 'cursor' not in request.args:
+        return text, limit, None
+    cursor = decode_cursor(request.args['cursor'])
+    if len(cursor) != len(cursor_types):
+        raise PaginationError('Invalid cursor')
+    try:
+        return text, limit, tuple(cast(value) for cast, value in zip(cursor_types, cursor))
+    except (TypeError, ValueError):
+        raise PaginationError('Invalid cursor')
+
+@bp.route('/search/tournaments', methods=['GET'])
+@query_budget(1)
+def search_tournaments():
+    """Recherche plein texte sur le nom, le type de jeu et la description, par pertinence."""
+    try:
+        text, limit, after = _search_args((int, int))
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+    rows = SearchService.tournaments(text, limit + 1, after)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].score, rows[-1].id])
+    return set_next_cursor(jsonify([
+        {
+            'id': row.id,
+            'name': row.name,
+            'description': row.description,
+            'game_type': row.game_type,
+            'format': row.format,
+            'status': row.status,
+            'creator_id': row.creator_id
+        } for row in rows
+    ]), next_cursor)
+
+@bp.route('/search/users', methods=['GET'])
+@query_budget(2)
+@jwt_required()
+def search_users():
+    """Autocomplétion des noms d'utilisateur (préfixe), pour ajouter un participant par user_id."""
+    try:
+        text, limit, after = _search_args((str, int))
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+    rows = SearchService.users(text, limit + 1, after)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].username_lower, rows[-1].id])
+    return set_next_cursor(jsonify([{'id': row.id, 'username': row.username} for row in rows]), next_cursor)
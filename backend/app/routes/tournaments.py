@@ -1,24 +1,150 @@
-from flask import Blueprint, request, jsonify, abort
-from flask_jwt_extended import jwt_required, get_jwt_identity
+import copy
+import csv
+import io
+import json
+import queue
+
+from flask import Blueprint, Response, current_app, request, jsonify, abort
+from flask_jwt_extended import jwt_required, current_user
+from sqlalchemy import case, cast, func, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm.attributes import flag_modified
 from app import db
-from app.models.tournament import Tournament, TournamentParticipant
+from app.conditional import etag_variants
+from app.models.tournament import Match, Tournament, TournamentParticipant
 from app.models.user import User
+from app.pagination import PaginationError, decode_cursor, encode_cursor, get_limit, set_next_cursor
+from app.services.bracket_engine import BracketEngine, BracketError
+from app.services.events import tournament_events
+from app.services.json_patch import JsonPatchConflict, JsonPatchError, apply_patch, get_value, parse_pointer, validate_operations
+from app.services.match_sync import MatchSyncService
+from app.services.notification_service import NotificationService
+from app.services.participant_service import AlreadyRegistered, ParticipantService, TournamentFull
+from app.services.query_metrics import query_budget
+from app.services.rating_service import RatingService
+from app.services import scheduler, seeding
+from app.services.response_cache import response_cache
+from app.services.scheduler import ScheduleService, SchedulerError
+from app.services.standings_service import StandingsService
+from app.services.user_stats_service import COMPLETED_STATUS, UserStatsService
 
 bp = Blueprint('tournaments', __name__)
 
+STARTED_STATUSES = ('active', 'in_progress')
+
+def _after_write(tournament_id, event, data):
+    # Après le commit : purge du cache de lecture et delta compact pour le flux SSE
+    response_cache.invalidate_tournament(tournament_id)
+    tournament_events.publish(tournament_id, event, data)
+
+def _record_results(tournament_id, completed, reopened=()):
+    # Avant le commit : classements Elo et bilans des comptes suivent chaque résultat
+    RatingService.record(tournament_id, completed, reopened)
+    UserStatsService.record_matches(tournament_id, completed, reopened)
+
+def _participant_event(tournament_id, action, participant):
+    _after_write(tournament_id, 'participant', {
+        'action': action,
+        'participant': {
+            'id': participant.id,
+            'user_id': participant.user_id,
+            'guest_name': participant.guest_name,
+            'status': participant.status
+        }
+    })
+
+# Tris stables : l'id sert toujours de départage pour la pagination par curseur
+TOURNAMENT_SORTS = {
+    'id': (Tournament.id,),
+    'name': (Tournament.name, Tournament.id),
+}
+TOURNAMENT_FILTERS = {
+    'status': (Tournament.status, str),
+    'game_type': (Tournament.game_type, str),
+    'format': (Tournament.format, str),
+    'creator_id': (Tournament.creator_id, int),
+}
+
 @bp.route('/tournaments', methods=['GET'])
+@query_budget(1)
 def get_tournaments():
-    tournaments = Tournament.query.all()
-    return jsonify([{
-        'id': t.id,
-        'name': t.name,
-        'description': t.description,
-        'game_type': t.game_type,
-        'format': t.format,
-        'status': t.status,
-        'creator_id': t.creator_id,
-        'participant_count': t.participants.count()
-    } for t in tournaments])
+    sort = request.args.get('sort', 'id')
+    descending = sort.startswith('-')
+    sort_key = sort.lstrip('-')
+    if sort_key not in TOURNAMENT_SORTS:
+        return jsonify({'error': f'Invalid sort: {sort}'}), 400
+    sort_columns = TOURNAMENT_SORTS[sort_key]
+    try:
+        limit = get_limit()
+        cursor = decode_cursor(request.args['cursor']) if 'cursor' in request.args else None
+        if cursor is not None and (len(cursor) != len(sort_columns) + 1 or cursor[0] != sort):
+            raise PaginationError('Cursor does not match sort order')
+        # Chaque valeur doit avoir le type de sa colonne (int pour id, str pour name)
+        if cursor is not None and any(type(value) is not column.type.python_type
+                                      for value, column in zip(cursor[1:], sort_columns)):
+            raise PaginationError('Invalid cursor')
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Une seule requête groupée : les compteurs de participants sont agrégés
+    # par la base au lieu d'un COUNT par tournoi (N+1)
+    with_status_counts = request.args.get('status_counts', '').lower() in ('1', 'true', 'yes')
+    columns = [
+        Tournament.id,
+        Tournament.name,
+        Tournament.description,
+        Tournament.game_type,
+        Tournament.format,
+        Tournament.status,
+        Tournament.creator_id,
+        func.count(TournamentParticipant.id).label('participant_count'),
+    ]
+    if with_status_counts:
+        columns += [
+            func.coalesce(func.sum(case((TournamentParticipant.status == 'accepted', 1), else_=0)), 0).label('accepted_count'),
+            func.coalesce(func.sum(case((TournamentParticipant.status == 'pending', 1), else_=0)), 0).label('pending_count'),
+        ]
+    query = db.select(*columns).outerjoin(
+        TournamentParticipant, TournamentParticipant.tournament_id == Tournament.id
+    )
+    for name, (column, convert) in TOURNAMENT_FILTERS.items():
+        if name in request.args:
+            try:
+                query = query.where(column == convert(request.args[name]))
+            except ValueError:
+                return jsonify({'error': f'Invalid value for {name}'}), 400
+    if cursor is not None:
+        # Keyset : on reprend strictement après la dernière ligne de la page précédente
+        key = tuple_(*sort_columns)
+        query = query.where(key < tuple(cursor[1:]) if descending else key > tuple(cursor[1:]))
+    query = query.group_by(Tournament.id).order_by(
+        *[column.desc() if descending else column.asc() for column in sort_columns]
+    ).limit(limit + 1)
+
+    rows = db.session.execute(query).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([sort] + [getattr(last, column.key) for column in sort_columns])
+    result = []
+    for row in rows:
+        item = {
+            'id': row.id,
+            'name': row.name,
+            'description': row.description,
+            'game_type': row.game_type,
+            'format': row.format,
+            'status': row.status,
+            'creator_id': row.creator_id,
+            'participant_count': row.participant_count
+        }
+        if with_status_counts:
+            item['accepted_count'] = int(row.accepted_count)
+            item['pending_count'] = int(row.pending_count)
+        result.append(item)
+    return set_next_cursor(jsonify(result), next_cursor)
 
 @bp.route('/tournaments', methods=['POST'])
 @jwt_required()
@@ -28,7 +154,7 @@ def create_tournament():
     for field in required_fields:
         if field not in data:
             return jsonify({'error': f'Missing field: {field}'}), 400
-    current_user_id = get_jwt_identity()
+    current_user_id = current_user.id
     try:
         tournament = Tournament(
             name=data['name'],
@@ -36,6 +162,7 @@ def create_tournament():
             game_type=data['game_type'],
             max_participants=data['max_participants'],
             format=data['format'],
+            waitlist=bool(data.get('waitlist', False)),
             creator_id=current_user_id
         )
         db.session.add(tournament)
@@ -45,159 +172,263 @@ def create_tournament():
     return jsonify({'message': 'Tournament created successfully', 'id': tournament.id}), 201
 
 @bp.route('/tournaments/<int:tournament_id>/join', methods=['POST'])
+@query_budget(5)
 @jwt_required()
 def join_tournament(tournament_id):
-    current_user_id = get_jwt_identity()
+    current_user_id = current_user.id
     tournament = Tournament.query.get_or_404(tournament_id)
     
     if tournament.status != 'pending':
         return jsonify({'error': 'Tournament is not accepting participants'}), 400
-        
-    if TournamentParticipant.query.filter_by(
-        tournament_id=tournament_id,
-        user_id=current_user_id
-    ).first():
+
+    # Place réservée et inscription dans la même transaction ; les doublons sont arrêtés par l'index unique
+    try:
+        participant = ParticipantService.register(tournament, user_id=current_user_id)
+    except AlreadyRegistered:
         return jsonify({'error': 'Already registered'}), 400
-        
-    participant = TournamentParticipant(
-        tournament_id=tournament_id,
-        user_id=current_user_id
-    )
-    
-    db.session.add(participant)
+    except TournamentFull:
+        return jsonify({'error': 'Tournament is full'}), 409
     db.session.commit()
-    
-    return jsonify({'message': 'Successfully joined tournament'}), 201
+    _participant_event(tournament_id, 'waitlisted' if participant.status == 'waitlisted' else 'joined', participant)
+
+    if participant.status == 'waitlisted':
+        return jsonify({'message': 'Tournament is full, added to the waitlist', 'status': participant.status}), 202
+    return jsonify({'message': 'Successfully joined tournament', 'status': participant.status}), 201
 
 @bp.route('/tournaments/<int:tournament_id>', methods=['GET'])
+@query_budget(3)
+@response_cache.cached_tournament_view
 def get_tournament(tournament_id):
-    tournament = Tournament.query.get_or_404(tournament_id)
-    participants = [
+    tournament = db.session.execute(
+        db.select(Tournament.id, Tournament.name, Tournament.description, Tournament.game_type,
+                  Tournament.format, Tournament.status, Tournament.creator_id, Tournament.max_participants,
+                  Tournament.seats_taken, Tournament.waitlist)
+        .where(Tournament.id == tournament_id)
+    ).first()
+    if tournament is None:
+        abort(404)
+    # Trois requêtes quel que soit le nombre d'inscrits : tournoi, participants + comptes, matchs
+    participants = db.session.execute(
+        db.select(TournamentParticipant.id, TournamentParticipant.user_id, TournamentParticipant.guest_name,
+                  TournamentParticipant.status, User.username, User.email)
+        .outerjoin(User, User.id == TournamentParticipant.user_id)
+        .where(TournamentParticipant.tournament_id == tournament_id)
+        .order_by(TournamentParticipant.id)
+    ).all()
+    matches = db.session.execute(
+        db.select(Match.id, Match.round, Match.player1_id, Match.player2_id,
+                  Match.score1, Match.score2, Match.winner_id, Match.status)
+        .where(Match.tournament_id == tournament_id)
+        .order_by(Match.round, Match.id)
+    ).all()
+    result = tournament._asdict()
+    result['participants'] = [
         {
             'id': p.id,
             'user_id': p.user_id,
-            'username': p.user.username if p.user_id and hasattr(p, 'user') and p.user else p.guest_name,
-            'email': p.user.email if p.user_id and hasattr(p, 'user') and p.user else None,
+            'username': p.username if p.username is not None else p.guest_name,
+            'email': p.email,
             'guest_name': p.guest_name,
             'status': p.status
         }
-        for p in tournament.participants
+        for p in participants
     ]
-    matches = [
-        {
-            'id': m.id,
-            'round': m.round,
-            'player1_id': m.player1_id,
-            'player2_id': m.player2_id,
-            'score1': m.score1,
-            'score2': m.score2,
-            'winner_id': m.winner_id,
-            'status': m.status
-        }
-        for m in tournament.matches
-    ]
-    return jsonify({
-        'id': tournament.id,
-        'name': tournament.name,
-        'description': tournament.description,
-        'game_type': tournament.game_type,
-        'format': tournament.format,
-        'status': tournament.status,
-        'creator_id': tournament.creator_id,
-        'max_participants': tournament.max_participants,
-        'participants': participants,
-        'matches': matches,
-    })
+    result['matches'] = [match._asdict() for match in matches]
+    return jsonify(result)
 
 @bp.route('/tournaments/<int:tournament_id>', methods=['PUT'])
 @jwt_required()
 def update_tournament(tournament_id):
     tournament = Tournament.query.get_or_404(tournament_id)
-    current_user_id = get_jwt_identity()
-    if str(tournament.creator_id) != current_user_id:
+    current_user_id = current_user.id
+    if tournament.creator_id != current_user_id:
         return jsonify({'error': 'Only the creator can modify this tournament'}), 403
     data = request.get_json()
-    for field in ['name', 'description', 'game_type', 'max_participants', 'format', 'status']:
+    previous_status = tournament.status
+    if previous_status == COMPLETED_STATUS and data.get('status', previous_status) != COMPLETED_STATUS:
+        UserStatsService.reopen_tournament(tournament)
+    replay = False
+    if 'game_type' in data:
+        # Résultats déjà comptés : reportés sous le nouveau type de jeu
+        UserStatsService.change_game_type(tournament, data['game_type'])
+        replay = data['game_type'] != tournament.game_type and RatingService.has_rated_matches(tournament_id)
+    for field in ['name', 'description', 'game_type', 'max_participants', 'format', 'status', 'waitlist']:
         if field in data:
             setattr(tournament, field, data[field])
+    if previous_status != COMPLETED_STATUS and tournament.status == COMPLETED_STATUS:
+        # Places finales figées et comptées dans les bilans des joueurs
+        UserStatsService.complete_tournament(tournament)
+    if replay:
+        # Elo n'est pas réversible : historique rejoué dans la même transaction
+        RatingService.replay(commit=False)
     db.session.commit()
+    _after_write(tournament_id, 'tournament', {
+        field: getattr(tournament, field)
+        for field in ['name', 'description', 'game_type', 'max_participants', 'format', 'status', 'waitlist'] if field in data
+    })
+    if previous_status == 'pending' and tournament.status in STARTED_STATUSES:
+        NotificationService.notify_tournament_start(tournament)
     return jsonify({'message': 'Tournament updated successfully'})
 
 @bp.route('/tournaments/<int:tournament_id>', methods=['DELETE'])
 @jwt_required()
 def delete_tournament(tournament_id):
     tournament = Tournament.query.get_or_404(tournament_id)
-    current_user_id = get_jwt_identity()
-    if str(tournament.creator_id) != current_user_id:
+    current_user_id = current_user.id
+    if tournament.creator_id != current_user_id:
         return jsonify({'error': 'Only the creator can delete this tournament'}), 403
+    UserStatsService.remove_tournament(tournament)
+    replay = RatingService.has_rated_matches(tournament_id)
     db.session.delete(tournament)
+    if replay:
+        RatingService.replay(commit=False)
     db.session.commit()
+    _after_write(tournament_id, 'deleted', {})
     return jsonify({'message': 'Tournament deleted successfully'})
 
 @bp.route('/tournaments/<int:tournament_id>/add_participant', methods=['POST'])
 @jwt_required()
 def add_participant(tournament_id):
     tournament = Tournament.query.get_or_404(tournament_id)
-    current_user_id = get_jwt_identity()
-    if str(tournament.creator_id) != current_user_id:
+    current_user_id = current_user.id
+    if tournament.creator_id != current_user_id:
         return jsonify({'error': 'Only the creator can add participants'}), 403
     data = request.get_json()
     email = data.get('email')
+    # user_id : compte choisi par autocomplétion (GET /search/users)
+    user_id = data.get('user_id')
     guest_name = data.get('guest_name')
-    if not email and not guest_name:
-        return jsonify({'error': 'email or guest_name is required'}), 400
-    if email:
-        user = User.query.filter_by(email=email).first()
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
-        if TournamentParticipant.query.filter_by(tournament_id=tournament_id, user_id=user.id).first():
-            return jsonify({'error': 'User already a participant or has a pending request'}), 400
-        participant = TournamentParticipant(
-            tournament_id=tournament_id,
-            user_id=user.id,
-            status='accepted'
-        )
-    else:
-        # Ajout d'un invité
-        if TournamentParticipant.query.filter_by(tournament_id=tournament_id, guest_name=guest_name).first():
-            return jsonify({'error': 'Guest already a participant'}), 400
-        participant = TournamentParticipant(
-            tournament_id=tournament_id,
-            guest_name=guest_name,
-            status='accepted'
-        )
-    db.session.add(participant)
+    if not email and user_id is None and not guest_name:
+        return jsonify({'error': 'email, user_id or guest_name is required'}), 400
+    if user_id is not None and (not isinstance(user_id, int) or isinstance(user_id, bool)):
+        return jsonify({'error': 'user_id must be an integer'}), 400
+    try:
+        if email or user_id is not None:
+            if user_id is not None:
+                user = db.session.get(User, user_id)
+            else:
+                user = User.query.filter_by(email=email).first()
+            if not user:
+                return jsonify({'error': 'User not found'}), 404
+            try:
+                participant = ParticipantService.register(tournament, 'accepted', user_id=user.id)
+            except AlreadyRegistered:
+                return jsonify({'error': 'User already a participant or has a pending request'}), 400
+        else:
+            # Ajout d'un invité
+            try:
+                participant = ParticipantService.register(tournament, 'accepted', guest_name=guest_name)
+            except AlreadyRegistered:
+                return jsonify({'error': 'Guest already a participant'}), 400
+    except TournamentFull:
+        return jsonify({'error': 'Tournament is full'}), 409
     db.session.commit()
+    _participant_event(tournament_id, 'added', participant)
+    if participant.status == 'waitlisted':
+        return jsonify({'message': 'Tournament is full, participant added to the waitlist'})
     return jsonify({'message': 'Participant added successfully'})
 
+# Taille maximale d'un import groupé (lignes)
+BULK_PARTICIPANTS_LIMIT = 5000
+
+def _bulk_entry(item):
+    """('email' | 'guest_name', valeur) depuis un objet, une chaîne ou une ligne CSV ; None si invalide."""
+    if isinstance(item, dict):
+        email = (item.get('email') or '').strip()
+        guest_name = (item.get('guest_name') or '').strip()
+        if email:
+            return ('email', email)
+        if guest_name:
+            return ('guest_name', guest_name)
+        return None
+    if isinstance(item, str) and item.strip():
+        # Une chaîne seule : adresse si elle contient '@', sinon nom d'invité
+        value = item.strip()
+        return ('email', value) if '@' in value else ('guest_name', value)
+    return None
+
+def _bulk_items():
+    """Lignes de l'import : tableau JSON (ou {"participants": [...]}) ou CSV (fichier 'file' ou corps text/csv)."""
+    upload = request.files.get('file')
+    if upload is not None or request.mimetype == 'text/csv':
+        text = (upload.read() if upload is not None else request.get_data()).decode('utf-8-sig')
+        rows = list(csv.reader(io.StringIO(text)))
+        header = [cell.strip().lower() for cell in rows[0]] if rows else []
+        if 'email' in header or 'guest_name' in header:
+            return [dict(zip(header, row)) for row in rows[1:]]
+        return [row[0] if row else '' for row in rows]
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('participants')
+    if not isinstance(data, list):
+        raise ValueError('Expected a JSON array of participants or a CSV file')
+    return data
+
+@bp.route('/tournaments/<int:tournament_id>/participants/bulk', methods=['POST'])
+@jwt_required()
+def bulk_add_participants(tournament_id):
+    tournament = Tournament.query.get_or_404(tournament_id)
+    current_user_id = current_user.id
+    if tournament.creator_id != current_user_id:
+        return jsonify({'error': 'Only the creator can add participants'}), 403
+    try:
+        items = _bulk_items()
+    except (ValueError, UnicodeDecodeError) as e:
+        return jsonify({'error': str(e)}), 400
+    if len(items) > BULK_PARTICIPANTS_LIMIT:
+        return jsonify({'error': f'At most {BULK_PARTICIPANTS_LIMIT} participants per import'}), 413
+
+    entries = [_bulk_entry(item) for item in items]
+    valid = [entry for entry in entries if entry is not None]
+    results, added = ParticipantService.bulk_add(tournament_id, valid)
+    db.session.commit()
+    if added:
+        _after_write(tournament_id, 'participant', {'action': 'bulk_added', 'count': added, 'reload': True})
+
+    # Résultats dans l'ordre des lignes reçues, lignes invalides comprises
+    valid_results = iter(results)
+    rows = []
+    for i, entry in enumerate(entries):
+        if entry is None:
+            rows.append({'row': i, 'status': 'invalid'})
+        else:
+            result = next(valid_results)
+            result['row'] = i
+            rows.append(result)
+    return jsonify({'added': added, 'results': rows})
+
 @bp.route('/tournaments/<int:tournament_id>/request_join', methods=['POST'])
 @jwt_required()
 def request_join(tournament_id):
     tournament = Tournament.query.get_or_404(tournament_id)
-    current_user_id = get_jwt_identity()
+    current_user_id = current_user.id
     existing = TournamentParticipant.query.filter_by(tournament_id=tournament_id, user_id=current_user_id).first()
-    if existing:
-        if existing.status == 'rejected':
-            existing.status = 'pending'
-            db.session.commit()
-            return jsonify({'message': 'Join request sent again'})
+    try:
+        if existing:
+            if existing.status != 'rejected':
+                return jsonify({'error': 'Already requested or already a participant'}), 400
+            ParticipantService.change_status(tournament, existing, 'pending')
+            participant = existing
+            message = 'Join request sent again'
         else:
-            return jsonify({'error': 'Already requested or already a participant'}), 400
-    participant = TournamentParticipant(
-        tournament_id=tournament_id,
-        user_id=current_user_id,
-        status='pending'
-    )
-    db.session.add(participant)
+            participant = ParticipantService.register(tournament, 'pending', user_id=current_user_id)
+            message = 'Join request sent'
+    except AlreadyRegistered:
+        return jsonify({'error': 'Already requested or already a participant'}), 400
+    except TournamentFull:
+        return jsonify({'error': 'Tournament is full'}), 409
     db.session.commit()
-    return jsonify({'message': 'Join request sent'})
+    _participant_event(tournament_id, participant.status if participant.status == 'waitlisted' else 'requested', participant)
+    if participant.status == 'waitlisted':
+        return jsonify({'message': 'Tournament is full, added to the waitlist', 'status': participant.status})
+    return jsonify({'message': message})
 
 @bp.route('/tournaments/<int:tournament_id>/handle_request', methods=['POST'])
 @jwt_required()
 def handle_request(tournament_id):
     tournament = Tournament.query.get_or_404(tournament_id)
-    current_user_id = get_jwt_identity()
-    if str(tournament.creator_id) != current_user_id:
+    current_user_id = current_user.id
+    if tournament.creator_id != current_user_id:
         return jsonify({'error': 'Only the creator can handle requests'}), 403
     data = request.get_json()
     participant_id = data.get('participant_id')
@@ -205,16 +436,27 @@ def handle_request(tournament_id):
     participant = TournamentParticipant.query.filter_by(id=participant_id, tournament_id=tournament_id).first()
     if not participant:
         return jsonify({'error': 'Request not found'}), 404
-    if action == 'accept':
-        participant.status = 'accepted'
-    elif action == 'reject':
-        participant.status = 'rejected'
-    else:
+    if action not in ('accept', 'reject'):
         return jsonify({'error': 'Invalid action'}), 400
+    try:
+        promoted = ParticipantService.change_status(
+            tournament, participant, 'accepted' if action == 'accept' else 'rejected'
+        )
+    except TournamentFull:
+        return jsonify({'error': 'Tournament is full'}), 409
     db.session.commit()
-    return jsonify({'message': f'Request {action}ed'})
+    _participant_event(tournament_id, participant.status, participant)
+    if promoted is not None:
+        _participant_event(tournament_id, 'promoted', promoted)
+    if action == 'accept' and participant.status == 'waitlisted':
+        # Aucune place libre : la demande n'est pas acceptée, le participant attend son tour
+        return jsonify({'message': 'Tournament is full, participant stays on the waitlist',
+                        'status': participant.status}), 202
+    return jsonify({'message': f'Request {action}ed', 'status': participant.status})
 
 @bp.route('/tournaments/<int:tournament_id>/participants', methods=['GET'])
+@query_budget(2)
+@response_cache.cached_tournament_view
 def get_tournament_participants(tournament_id):
     tournament = Tournament.query.get_or_404(tournament_id)
     participants = tournament.participants.all()
@@ -227,65 +469,279 @@ def get_tournament_participants(tournament_id):
     ])
 
 @bp.route('/tournaments/<int:tournament_id>/matches', methods=['GET'])
+@query_budget(2)
+@response_cache.cached_tournament_view
 def get_tournament_matches(tournament_id):
     tournament = Tournament.query.get_or_404(tournament_id)
-    matches = tournament.matches.all()
-    return jsonify([
-        {
-            'id': m.id,
-            'round': m.round,
-            'player1_id': m.player1_id,
-            'player2_id': m.player2_id,
-            'score1': m.score1,
-            'score2': m.score2,
-            'winner_id': m.winner_id,
-            'status': m.status
-        } for m in matches
-    ])
+    matches = tournament.matches.order_by(Match.round, Match.id).all()
+    return jsonify([_match_json(m) for m in matches])
+
+def _match_json(m):
+    return {
+        'id': m.id,
+        'round': m.round,
+        'section': m.section,
+        'player1_id': m.player1_id,
+        'player2_id': m.player2_id,
+        'participant1_id': m.participant1_id,
+        'participant2_id': m.participant2_id,
+        'score1': m.score1,
+        'score2': m.score2,
+        'winner_id': m.winner_id,
+        'winner_participant_id': m.winner_participant_id,
+        'status': m.status
+    }
+
+@bp.route('/tournaments/<int:tournament_id>/schedule', methods=['POST'])
+@jwt_required()
+def schedule_matches(tournament_id):
+    """Championnat : crée toutes les rondes ; suisse : apparie la ronde suivante."""
+    tournament = Tournament.query.get_or_404(tournament_id)
+    if tournament.creator_id != current_user.id:
+        return jsonify({'error': 'Only the creator can schedule matches'}), 403
+    if tournament.format not in scheduler.FORMATS:
+        return jsonify({'error': f"Scheduling is only available for {', '.join(scheduler.FORMATS)} tournaments"}), 400
+    data = request.get_json(silent=True) or {}
+    legs = data.get('legs', 1)
+    max_rounds = data.get('rounds')
+    if legs not in (1, 2):
+        return jsonify({'error': 'legs must be 1 or 2'}), 400
+    if max_rounds is not None and (not isinstance(max_rounds, int) or max_rounds < 1):
+        return jsonify({'error': 'rounds must be a positive integer'}), 400
+
+    # Verrou du tournoi : deux demandes simultanées ne créent pas deux fois la même ronde
+    ParticipantService.lock_tournament(tournament_id)
+    try:
+        if tournament.format == scheduler.ROUND_ROBIN:
+            rows = ScheduleService.create_round_robin(tournament_id, legs)
+        else:
+            rows = ScheduleService.create_swiss_round(tournament_id, max_rounds)
+    except SchedulerError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
+    rounds = sorted({row['round'] for row in rows})
+    matches = Match.query.filter(Match.tournament_id == tournament_id, Match.round.in_(rounds)) \
+        .order_by(Match.round, Match.id).all()
+    # Byes suisses : point d'office compté au classement
+    StandingsService.record(tournament_id, [m for m in matches if m.status == 'bye'])
+    db.session.commit()
+    _after_write(tournament_id, 'matches', {'action': 'scheduled', 'rounds': rounds, 'reload': True})
+    body = jsonify({'message': 'Matches scheduled', 'rounds': rounds, 'matches': [_match_json(m) for m in matches]})
+    NotificationService.notify_matches_scheduled(tournament, matches)
+    return body, 201
+
+@bp.route('/tournaments/<int:tournament_id>/matches/<int:match_id>/result', methods=['POST'])
+@jwt_required()
+def report_match_result(tournament_id, match_id):
+    tournament = Tournament.query.get_or_404(tournament_id)
+    if tournament.creator_id != current_user.id:
+        return jsonify({'error': 'Only the creator can report results'}), 403
+    match = Match.query.filter_by(id=match_id, tournament_id=tournament_id).first_or_404()
+    data = request.get_json(silent=True) or {}
+    score1, score2 = data.get('score1'), data.get('score2')
+    if not all(isinstance(score, int) and not isinstance(score, bool) for score in (score1, score2)):
+        return jsonify({'error': 'score1 and score2 must be integers (equal scores for a draw)'}), 400
+    # Correction d'un résultat : l'ancien est retiré du classement avant d'ajouter le nouveau
+    previous = StandingsService.snapshot(match) if match.status == 'completed' else None
+    try:
+        ScheduleService.report_result(match, score1, score2)
+    except SchedulerError as e:
+        return jsonify({'error': str(e)}), 400
+    db.session.flush()
+    StandingsService.record(tournament_id, [match], [previous] if previous else [])
+    _record_results(tournament_id, [match], [previous] if previous else [])
+    db.session.commit()
+    result = _match_json(match)
+    _after_write(tournament_id, 'matches', {'action': 'result', 'match': result})
+    return jsonify({'message': 'Result recorded', 'match': result})
+
+@bp.route('/tournaments/<int:tournament_id>/standings', methods=['GET'])
+@query_budget(2)
+@response_cache.cached_tournament_view
+def get_tournament_standings(tournament_id):
+    tournament_format = db.session.scalar(db.select(Tournament.format).where(Tournament.id == tournament_id))
+    if tournament_format is None:
+        abort(404)
+    return jsonify(StandingsService.table(tournament_id, tournament_format))
 
 @bp.route('/tournaments/<int:tournament_id>/leave', methods=['POST'])
 @jwt_required()
 def leave_tournament(tournament_id):
     tournament = Tournament.query.get_or_404(tournament_id)
-    current_user_id = get_jwt_identity()
-    if str(tournament.creator_id) == current_user_id:
+    current_user_id = current_user.id
+    if tournament.creator_id == current_user_id:
         return jsonify({'error': 'Creator cannot leave their own tournament'}), 403
     participant = TournamentParticipant.query.filter_by(tournament_id=tournament_id, user_id=current_user_id).first()
     if not participant:
         return jsonify({'error': 'You are not a participant'}), 400
-    db.session.delete(participant)
+    promoted = ParticipantService.remove(participant)
     db.session.commit()
+    _participant_event(tournament_id, 'left', participant)
+    if promoted is not None:
+        _participant_event(tournament_id, 'promoted', promoted)
     return jsonify({'message': 'You have left the tournament'})
 
 @bp.route('/tournaments/<int:tournament_id>/kick', methods=['POST'])
 @jwt_required()
 def kick_participant(tournament_id):
     tournament = Tournament.query.get_or_404(tournament_id)
-    current_user_id = get_jwt_identity()
-    if str(tournament.creator_id) != current_user_id:
+    current_user_id = current_user.id
+    if tournament.creator_id != current_user_id:
         return jsonify({'error': 'Only the creator can kick participants'}), 403
     data = request.get_json()
     participant_id = data.get('participant_id')
     participant = TournamentParticipant.query.filter_by(id=participant_id, tournament_id=tournament_id).first()
     if not participant:
         return jsonify({'error': 'Participant not found'}), 404
-    if str(participant.user_id) == current_user_id:
+    if participant.user_id == current_user_id:
         return jsonify({'error': 'Creator cannot kick themselves'}), 400
-    db.session.delete(participant)
+    promoted = ParticipantService.remove(participant)
     db.session.commit()
+    _participant_event(tournament_id, 'removed', participant)
+    if promoted is not None:
+        _participant_event(tournament_id, 'promoted', promoted)
     return jsonify({'message': 'Participant has been removed'})
 
+def _bracket_format_error(bracket):
+    if isinstance(bracket, dict) and 'main' in bracket and 'loser' in bracket:
+        if not isinstance(bracket['main'], list) or not isinstance(bracket['loser'], list):
+            return 'Invalid bracket format for double elimination'
+        sections = [bracket['main'], bracket['loser']]
+    elif isinstance(bracket, list):
+        sections = [bracket]
+    else:
+        return 'Invalid bracket format'
+    for rounds in sections:
+        for round_matches in rounds:
+            if not isinstance(round_matches, list) or not all(isinstance(m, dict) for m in round_matches):
+                return 'Invalid bracket format: rounds must be lists of matches'
+    return None
+
+def _with_bracket_etag(response, tournament_id, version):
+    response.set_etag(f'bracket-{tournament_id}-{version}')
+    response.headers['Access-Control-Expose-Headers'] = 'ETag'
+    return response
+
+def _bracket_precondition_error(tournament):
+    # If-Match absent : écriture acceptée (anciens clients), mais toujours versionnée
+    etags = etag_variants(f'bracket-{tournament.id}-{tournament.bracket_version}')
+    if request.if_match and not any(request.if_match.contains(etag) for etag in etags):
+        return _bracket_conflict(tournament.id, tournament.bracket_version)
+    return None
+
+def _bracket_conflict(tournament_id, version):
+    response = jsonify({'error': 'Bracket has been modified by another request', 'version': version})
+    response.status_code = 412
+    return _with_bracket_etag(response, tournament_id, version)
+
+def _store_bracket(tournament, bracket, changed_matches=None):
+    """Écrit le bracket si sa version n'a pas changé depuis la lecture (verrou optimiste).
+
+    Les lignes match sont synchronisées dans la même transaction : seulement
+    ``changed_matches`` si fourni, sinon tout le bracket. Retourne la nouvelle
+    version, ou None si une autre requête a écrit entre-temps.
+    """
+    expected = tournament.bracket_version
+    result = db.session.execute(
+        db.update(Tournament)
+        .where(Tournament.id == tournament.id, Tournament.bracket_version == expected)
+        .values(bracket=bracket, bracket_version=Tournament.bracket_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        db.session.rollback()
+        return None
+    if changed_matches is None:
+        changes = MatchSyncService.sync_bracket(tournament.id, bracket)
+    else:
+        changes = MatchSyncService.sync(tournament.id, changed_matches)
+    _record_results(tournament.id, *StandingsService.record_sync(tournament.id, changes))
+    db.session.commit()
+    return expected + 1
+
+def _store_bracket_matches(tournament, engine, changed_matches):
+    """Écrit seulement ``changed_matches``, modifiés sur place dans ``tournament.bracket`` (verrou optimiste).
+
+    PostgreSQL : un jsonb_set par match, le reste du document n'est ni
+    copié ni réécrit ; ailleurs le document chargé est marqué modifié et
+    écrit au flush. Retourne la nouvelle version, ou None en cas de conflit.
+    """
+    expected = tournament.bracket_version
+    values = {}
+    if db.engine.dialect.name == 'postgresql':
+        target = cast(Tournament.bracket, JSONB)
+        for match in changed_matches:
+            path = cast(postgresql.array(engine.path(match['id'])), postgresql.ARRAY(db.Text))
+            target = func.jsonb_set(target, path, cast(json.dumps(match), JSONB), False)
+        values['bracket'] = cast(target, db.JSON)
+    result = db.session.execute(
+        db.update(Tournament)
+        .where(Tournament.id == tournament.id, Tournament.bracket_version == expected)
+        .values(bracket_version=Tournament.bracket_version + 1, **values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        db.session.rollback()
+        return None
+    if not values:
+        flag_modified(tournament, 'bracket')
+    changes = MatchSyncService.sync(tournament.id, changed_matches)
+    _record_results(tournament.id, *StandingsService.record_sync(tournament.id, changes))
+    db.session.commit()
+    return expected + 1
+
+def _current_bracket_version(tournament_id):
+    return db.session.scalar(db.select(Tournament.bracket_version).where(Tournament.id == tournament_id))
+
 @bp.route('/tournaments/<int:tournament_id>/bracket', methods=['GET'])
+@query_budget(1)
+@response_cache.cached_tournament_view
 def get_bracket(tournament_id):
     tournament = Tournament.query.get_or_404(tournament_id)
-    return jsonify({'bracket': tournament.bracket})
+    response = jsonify({'bracket': tournament.bracket, 'version': tournament.bracket_version})
+    _with_bracket_etag(response, tournament.id, tournament.bracket_version)
+    # Répond 304 si le client possède déjà cette version
+    return response.make_conditional(request)
+
+@bp.route('/tournaments/<int:tournament_id>/events', methods=['GET'])
+def tournament_event_stream(tournament_id):
+    if db.session.get(Tournament, tournament_id) is None:
+        abort(404)
+    db.session.remove()
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        last_event_id = None
+    heartbeat = current_app.config.get('EVENTS_HEARTBEAT', 15)
+    subscriber = tournament_events.subscribe(tournament_id, last_event_id)
+
+    def stream():
+        try:
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    event = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    # Commentaire SSE : garde la connexion ouverte à travers les proxys
+                    yield ': keep-alive\n\n'
+                    continue
+                yield event.to_sse()
+                if event.name == 'deleted':
+                    return
+        finally:
+            tournament_events.unsubscribe(tournament_id, subscriber)
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
 
 @bp.route('/tournaments/<int:tournament_id>/bracket', methods=['POST'])
 @jwt_required()
 def save_bracket(tournament_id):
     tournament = Tournament.query.get_or_404(tournament_id)
-    current_user_id = get_jwt_identity()
-    if str(tournament.creator_id) != current_user_id:
+    current_user_id = current_user.id
+    if tournament.creator_id != current_user_id:
         return jsonify({'error': 'Only the creator can modify the bracket'}), 403
     
     data = request.get_json()
@@ -293,16 +749,286 @@ def save_bracket(tournament_id):
     
     if bracket is None:
         return jsonify({'error': 'No bracket data provided'}), 400
-    if isinstance(bracket, dict) and 'main' in bracket and 'loser' in bracket:
-        if not isinstance(bracket['main'], list) or not isinstance(bracket['loser'], list):
-            return jsonify({'error': 'Invalid bracket format for double elimination'}), 400
-    elif not isinstance(bracket, list):
-        return jsonify({'error': 'Invalid bracket format'}), 400
+    error = _bracket_format_error(bracket)
+    if error:
+        return jsonify({'error': error}), 400
+    conflict = _bracket_precondition_error(tournament)
+    if conflict:
+        return conflict
     
     try:
-        tournament.bracket = bracket
-        db.session.commit()
-        return jsonify({'message': 'Bracket saved successfully'})
+        version = _store_bracket(tournament, bracket)
+        if version is None:
+            return _bracket_conflict(tournament_id, _current_bracket_version(tournament_id))
+        _after_write(tournament_id, 'bracket', {'version': version, 'reload': True})
+        response = jsonify({'message': 'Bracket saved successfully', 'version': version})
+        return _with_bracket_etag(response, tournament_id, version)
     except Exception as e:
         db.session.rollback()
-        return jsonify({'error': f'Error saving bracket: {str(e)}'}), 500 
\ No newline at end of file
+        return jsonify({'error': f'Error saving bracket: {str(e)}'}), 500
+
+def _accepted_teams(tournament_id):
+    # Participants acceptés dans l'ordre d'inscription, avec le nom du compte en une requête
+    rows = db.session.execute(
+        db.select(TournamentParticipant.id, TournamentParticipant.user_id,
+                  TournamentParticipant.guest_name, User.username)
+        .outerjoin(User, User.id == TournamentParticipant.user_id)
+        .where(TournamentParticipant.tournament_id == tournament_id,
+               TournamentParticipant.status == 'accepted')
+        .order_by(TournamentParticipant.id)
+    ).all()
+    return [
+        {
+            'id': str(row.user_id or row.id),
+            'name': row.username or row.guest_name,
+            'participant_id': row.id,
+            'user_id': row.user_id
+        }
+        for row in rows
+    ]
+
+SEEDING_MODES = ('registration', 'rating', 'results')
+
+def _participant_map(data, name):
+    """Objet {participant_id: valeur} du corps de la requête, clés converties en entiers."""
+    values = data.get(name) or {}
+    if not isinstance(values, dict):
+        raise ValueError(f'{name} must be an object keyed by participant id')
+    try:
+        return {int(participant_id): value for participant_id, value in values.items()}
+    except ValueError:
+        raise ValueError(f'{name} must be an object keyed by participant id')
+
+def _prior_wins(user_ids):
+    # Victoires enregistrées dans tous les tournois, en une requête groupée
+    if not user_ids:
+        return {}
+    return dict(db.session.execute(
+        db.select(Match.winner_id, func.count(Match.id))
+        .where(Match.winner_id.in_(user_ids))
+        .group_by(Match.winner_id)
+    ).all())
+
+def _seeded_teams(teams, data):
+    """Ordre des têtes de série : liste explicite 'seeds', sinon selon le mode 'seeding'.
+
+    'registration' (défaut) garde l'ordre d'inscription, 'rating' trie selon
+    l'objet 'ratings' puis les victoires passées, 'results' selon les seules
+    victoires passées.
+    """
+    seeds = data.get('seeds') or []
+    if not isinstance(seeds, list):
+        raise ValueError('seeds must be a list of participant ids')
+    if seeds:
+        # Les participants absents de la liste suivent par ordre d'inscription
+        rank = {participant_id: i for i, participant_id in enumerate(seeds)}
+        return sorted(teams, key=lambda team: rank.get(team['participant_id'], len(rank)))
+
+    mode = data.get('seeding', 'registration')
+    if mode not in SEEDING_MODES:
+        raise ValueError(f"Invalid seeding: {mode} (expected one of {', '.join(SEEDING_MODES)})")
+    if mode == 'registration':
+        return teams
+    ratings = None
+    if mode == 'rating':
+        values = _participant_map(data, 'ratings')
+        if not all(isinstance(value, (int, float)) for value in values.values()):
+            raise ValueError('ratings must be numbers')
+        ratings = [values.get(team['participant_id']) for team in teams]
+    wins = _prior_wins([team['user_id'] for team in teams if team['user_id'] is not None])
+    results = [wins.get(team['user_id']) for team in teams]
+    return seeding.rank(teams, ratings, results)
+
+@bp.route('/tournaments/<int:tournament_id>/bracket/generate', methods=['POST'])
+@jwt_required()
+def generate_bracket(tournament_id):
+    tournament = Tournament.query.get_or_404(tournament_id)
+    current_user_id = current_user.id
+    if tournament.creator_id != current_user_id:
+        return jsonify({'error': 'Only the creator can modify the bracket'}), 403
+
+    data = request.get_json(silent=True) or {}
+    teams = _accepted_teams(tournament_id)
+    try:
+        teams = _seeded_teams(teams, data)
+        clubs = _participant_map(data, 'clubs')
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    conflict = _bracket_precondition_error(tournament)
+    if conflict:
+        return conflict
+    try:
+        engine = BracketEngine.generate(
+            teams, tournament.format,
+            [clubs.get(team['participant_id']) for team in teams] if clubs else None
+        )
+    except BracketError as e:
+        return jsonify({'error': str(e)}), 400
+    version = _store_bracket(tournament, engine.data)
+    if version is None:
+        return _bracket_conflict(tournament_id, _current_bracket_version(tournament_id))
+    _after_write(tournament_id, 'bracket', {'version': version, 'reload': True})
+    response = jsonify({'message': 'Bracket generated successfully', 'bracket': engine.data, 'version': version})
+    response.status_code = 201
+    return _with_bracket_etag(response, tournament_id, version)
+
+@bp.route('/tournaments/<int:tournament_id>/bracket/result', methods=['POST'])
+@jwt_required()
+def report_bracket_result(tournament_id):
+    tournament = Tournament.query.get_or_404(tournament_id)
+    current_user_id = current_user.id
+    if tournament.creator_id != current_user_id:
+        return jsonify({'error': 'Only the creator can modify the bracket'}), 403
+    if not tournament.bracket:
+        return jsonify({'error': 'Bracket has not been generated'}), 400
+
+    data = request.get_json()
+    if not data or 'match_id' not in data or 'winner' not in data:
+        return jsonify({'error': 'match_id and winner are required'}), 400
+    conflict = _bracket_precondition_error(tournament)
+    if conflict:
+        return conflict
+    try:
+        # Document chargé modifié sur place : seuls les matchs touchés sont écrits
+        engine = BracketEngine(tournament.bracket)
+        changed = engine.report_result(data['match_id'], data['winner'],
+                                       data.get('score_a'), data.get('score_b'))
+    except BracketError as e:
+        return jsonify({'error': str(e)}), 400
+    version = _store_bracket_matches(tournament, engine, changed)
+    if version is None:
+        return _bracket_conflict(tournament_id, _current_bracket_version(tournament_id))
+    _after_write(tournament_id, 'bracket', {'version': version, 'matches': changed})
+    response = jsonify({'message': 'Result recorded', 'matches': changed, 'version': version})
+    return _with_bracket_etag(response, tournament_id, version)
+
+# Champs d'un match modifiables par un patch, avec leur validation
+BRACKET_MATCH_FIELDS = {
+    'teamA': lambda v: v is None or (isinstance(v, dict) and 'id' in v),
+    'teamB': lambda v: v is None or (isinstance(v, dict) and 'id' in v),
+    'winner': lambda v: v in (None, 'A', 'B'),
+    'scoreA': lambda v: v is None or (isinstance(v, int) and not isinstance(v, bool)),
+    'scoreB': lambda v: v is None or (isinstance(v, int) and not isinstance(v, bool)),
+    'bye': lambda v: isinstance(v, bool),
+}
+
+def _match_field(tokens):
+    """Nom du champ visé si le chemin pointe dans un match (/r/m/champ ou /main/r/m/champ)."""
+    if tokens and tokens[0] in ('main', 'loser'):
+        tokens = tokens[1:]
+    if len(tokens) == 3 and tokens[0].isdigit() and tokens[1].isdigit():
+        return tokens[2]
+    return None
+
+def _patched_match_paths(operations):
+    """Chemins (sans le champ) des matchs modifiés, dans l'ordre d'apparition."""
+    paths = []
+    for operation in operations:
+        tokens = parse_pointer(operation['path'])
+        if operation['op'] != 'test' and tokens[:-1] not in paths:
+            paths.append(tokens[:-1])
+    return paths
+
+def _patch_bracket_in_database(tournament_id, expected_version, operations):
+    """Applique des 'replace' sur des champs de match directement en SQL (jsonb_set).
+
+    Le document n'est ni relu ni réécrit par Python ; les 'test' et l'existence
+    des chemins sont vérifiés dans le WHERE. Retourne False si aucune ligne ne
+    correspond, l'appelant repasse alors par le chemin générique pour l'erreur.
+    """
+    document = cast(Tournament.bracket, JSONB)
+    target = document
+    conditions = [Tournament.id == tournament_id, Tournament.bracket_version == expected_version]
+    for operation in operations:
+        path = cast(postgresql.array(parse_pointer(operation['path'])), postgresql.ARRAY(db.Text))
+        value = cast(json.dumps(operation['value']), JSONB)
+        current = document.op('#>', return_type=JSONB)(path)
+        if operation['op'] == 'test':
+            conditions.append(current == value)
+        else:
+            conditions.append(current.isnot(None))
+            target = func.jsonb_set(target, path, value, False)
+    result = db.session.execute(
+        db.update(Tournament)
+        .where(*conditions)
+        .values(bracket=cast(target, db.JSON), bracket_version=Tournament.bracket_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+@bp.route('/tournaments/<int:tournament_id>/bracket', methods=['PATCH'])
+@jwt_required()
+def patch_bracket(tournament_id):
+    tournament = Tournament.query.get_or_404(tournament_id)
+    current_user_id = current_user.id
+    if tournament.creator_id != current_user_id:
+        return jsonify({'error': 'Only the creator can modify the bracket'}), 403
+    if tournament.bracket is None:
+        return jsonify({'error': 'Bracket has not been generated'}), 400
+    conflict = _bracket_precondition_error(tournament)
+    if conflict:
+        return conflict
+
+    operations = request.get_json(silent=True)
+    try:
+        validate_operations(operations)
+    except JsonPatchError as e:
+        return jsonify({'error': str(e)}), 400
+    fields = []
+    for operation in operations:
+        field = _match_field(parse_pointer(operation['path']))
+        if field in BRACKET_MATCH_FIELDS and operation['op'] in ('add', 'replace', 'test'):
+            if not BRACKET_MATCH_FIELDS[field](operation['value']):
+                return jsonify({'error': f"Invalid value for {field} at {operation['path']}"}), 422
+        fields.append(field)
+
+    # Chemin rapide : uniquement des test/replace sur des champs de match, tests en tête
+    ops = [operation['op'] for operation in operations]
+    in_place = (
+        db.engine.dialect.name == 'postgresql'
+        and all(field in BRACKET_MATCH_FIELDS for field in fields)
+        and set(ops) <= {'test', 'replace'}
+        and ops == sorted(ops, key=lambda op: op != 'test')
+    )
+    expected = tournament.bracket_version
+    if in_place and _patch_bracket_in_database(tournament_id, expected, operations):
+        # Relit uniquement les matchs touchés pour synchroniser leurs lignes
+        document = cast(Tournament.bracket, JSONB)
+        paths = _patched_match_paths(operations)
+        if paths:
+            matches = db.session.execute(
+                db.select(*[
+                    document.op('#>', return_type=JSONB)(cast(postgresql.array(path), postgresql.ARRAY(db.Text)))
+                    for path in paths
+                ]).where(Tournament.id == tournament_id)
+            ).one()
+            changes = MatchSyncService.sync(tournament_id, [match for match in matches if isinstance(match, dict)])
+            _record_results(tournament_id, *StandingsService.record_sync(tournament_id, changes))
+        db.session.commit()
+        _after_write(tournament_id, 'bracket', {'version': expected + 1, 'patch': operations})
+        response = jsonify({'message': 'Bracket updated successfully', 'version': expected + 1})
+        return _with_bracket_etag(response, tournament_id, expected + 1)
+    db.session.rollback()
+
+    tournament = Tournament.query.get_or_404(tournament_id)
+    if tournament.bracket_version != expected:
+        return _bracket_conflict(tournament_id, tournament.bracket_version)
+    try:
+        bracket = apply_patch(copy.deepcopy(tournament.bracket), operations)
+    except JsonPatchConflict as e:
+        return jsonify({'error': str(e)}), 409
+    except JsonPatchError as e:
+        return jsonify({'error': str(e)}), 422
+    error = _bracket_format_error(bracket)
+    if error:
+        return jsonify({'error': error}), 422
+    changed_matches = None
+    if all(field in BRACKET_MATCH_FIELDS for field in fields) and set(ops) <= {'test', 'add', 'replace', 'remove'}:
+        changed_matches = [get_value(bracket, '/' + '/'.join(path)) for path in _patched_match_paths(operations)]
+    version = _store_bracket(tournament, bracket, changed_matches)
+    if version is None:
+        return _bracket_conflict(tournament_id, _current_bracket_version(tournament_id))
+    _after_write(tournament_id, 'bracket', {'version': version, 'patch': operations})
+    response = jsonify({'message': 'Bracket updated successfully', 'version': version})
+    return _with_bracket_etag(response, tournament_id, version)
@@ -0,0 +1,100 @@
+from flask import Blueprint, request, jsonify
+from app import db
+from app.models.tournament import Match, Tournament, TournamentParticipant
+from app.pagination import PaginationError, decode_cursor, encode_cursor, get_limit, set_next_cursor
+from app.services.query_metrics import query_budget
+from app.services.user_cache import user_cache
+from app.services.user_stats_service import UserStatsService
+
+bp = Blueprint('users', __name__)
+
+def _page_args():
+    """(limit, dernier id de la page précédente ou None) ; lève PaginationError."""
+    limit = get_limit()
+    if 'cursor' not in request.args:
+        return limit, None
+    cursor = decode_cursor(request.args['cursor'])
+    if len(cursor) != 1 or not isinstance(cursor[0], int):
+        raise PaginationError('Invalid cursor')
+    return limit, cursor[0]
+
+@bp.route('/users/<int:user_id>/tournaments', methods=['GET'])
+@query_budget(2)
+def get_user_tournaments(user_id):
+    if user_cache.get(user_id) is None:
+        return jsonify({'error': 'User not found'}), 404
+    try:
+        limit, after = _page_args()
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Plus récents d'abord, parcourus sur l'index (user_id, tournament_id)
+    query = (
+        db.select(Tournament.id, Tournament.name, Tournament.game_type, Tournament.format, Tournament.status,
+                  TournamentParticipant.status.label('participant_status'), TournamentParticipant.final_rank)
+        .join(Tournament, Tournament.id == TournamentParticipant.tournament_id)
+        .where(TournamentParticipant.user_id == user_id)
+    )
+    if after is not None:
+        query = query.where(TournamentParticipant.tournament_id < after)
+    rows = db.session.execute(query.order_by(TournamentParticipant.tournament_id.desc()).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].id])
+    return set_next_cursor(jsonify([row._asdict() for row in rows]), next_cursor)
+
+@bp.route('/users/<int:user_id>/matches', methods=['GET'])
+@query_budget(4)
+def get_user_matches(user_id):
+    if user_cache.get(user_id) is None:
+        return jsonify({'error': 'User not found'}), 404
+    try:
+        limit, after = _page_args()
+    except PaginationError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # Une branche par côté, chacune limitée sur son index (joueur, id) : pas de tri de tout l'historique
+    branches = []
+    for column in (Match.player1_id, Match.player2_id):
+        branch = db.select(Match.id).where(column == user_id)
+        if after is not None:
+            branch = branch.where(Match.id < after)
+        branch = branch.order_by(Match.id.desc()).limit(limit + 1).subquery()
+        branches.append(db.select(branch.c.id))
+    ids = sorted(set(db.session.scalars(db.union_all(*branches))), reverse=True)[:limit + 1]
+
+    next_cursor = None
+    if len(ids) > limit:
+        ids = ids[:limit]
+        next_cursor = encode_cursor([ids[-1]])
+    matches = db.session.execute(
+        db.select(Match.id, Match.tournament_id, Tournament.name.label('tournament_name'), Tournament.game_type,
+                  Match.round, Match.section, Match.status, Match.player1_id, Match.player2_id,
+                  Match.score1, Match.score2, Match.winner_id)
+        .join(Tournament, Tournament.id == Match.tournament_id)
+        .where(Match.id.in_(ids))
+        .order_by(Match.id.desc())
+    ).all() if ids else []
+
+    users = user_cache.get_many([m.player1_id for m in matches] + [m.player2_id for m in matches])
+
+    def player(player_id):
+        summary = users.get(player_id)
+        return {'id': summary.id, 'username': summary.username} if summary else None
+
+    return set_next_cursor(jsonify([
+        {
+            **m._asdict(),
+            'player1': player(m.player1_id),
+            'player2': player(m.player2_id),
+        } for m in matches
+    ]), next_cursor)
+
+@bp.route('/users/<int:user_id>/stats', methods=['GET'])
+@query_budget(2)
+def get_user_stats(user_id):
+    if user_cache.get(user_id) is None:
+        return jsonify({'error': 'User not found'}), 404
+    return jsonify(UserStatsService.stats(user_id))
@@ -0,0 +1,279 @@
+"""Génération et avancement des brackets à élimination simple et double.
+
+La structure produite est celle déjà stockée dans ``Tournament.bracket`` et
+lue par le frontend : une liste de rounds (listes de matchs) pour
+l'élimination simple, ``{'main': [...], 'loser': [...]}`` pour la double
+élimination (la grande finale est le dernier round de ``main``).
+
+Chaque match connaît ses successeurs (``nextMatchId``/``nextSlot`` et, en
+double élimination, ``loserNextMatchId``/``loserNextSlot``) : enregistrer un
+résultat ne touche que les matchs en aval, sans recopier les rounds.
+"""
+
+SINGLE_ELIMINATION = 'single_elimination'
+DOUBLE_ELIMINATION = 'double_elimination'
+FORMATS = (SINGLE_ELIMINATION, DOUBLE_ELIMINATION)
+
+SLOTS = ('A', 'B')
+
+
+class BracketError(ValueError):
+    pass
+
+
+def bracket_size(count):
+    size = 2
+    while size < count:
+        size *= 2
+    return size
+
+
+def seed_order(size):
+    """Numéros de tête de série par emplacement (1 contre N, 2 contre N-1...).
+
+    Les têtes de série 1 et 2 ne peuvent se rencontrer qu'en finale, et les
+    byes (têtes de série > nombre d'inscrits) tombent face aux mieux classés.
+    """
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [seed for top in order for seed in (top, total - top)]
+    return order
+
+
+def _team_key(slot):
+    return 'team' + slot
+
+
+def _match(match_id, round_number, index, **extra):
+    match = {
+        'id': match_id,
+        'round': round_number,
+        'matchIndex': index,
+        'teamA': None,
+        'teamB': None,
+        'winner': None,
+    }
+    match.update(extra)
+    return match
+
+
+def _link(match, next_id, next_slot, loser=False):
+    if loser:
+        match['loserNextMatchId'] = next_id
+        match['loserNextSlot'] = next_slot
+    else:
+        match['nextMatchId'] = next_id
+        match['nextSlot'] = next_slot
+
+
+def _mark_changed(changed, match):
+    if not any(item is match for item in changed):
+        changed.append(match)
+
+
+def _parity_slot(index):
+    return 'A' if index % 2 == 0 else 'B'
+
+
+def _build_single(size):
+    rounds = []
+    count = size // 2
+    round_number = 1
+    while count >= 1:
+        rounds.append([_match(f'match-{round_number}-{i}', round_number, i) for i in range(count)])
+        if count > 1:
+            for i, match in enumerate(rounds[-1]):
+                _link(match, f'match-{round_number + 1}-{i // 2}', _parity_slot(i))
+        count //= 2
+        round_number += 1
+    return rounds
+
+
+def _build_double(size):
+    depth = size.bit_length() - 1
+    winners = []
+    for r in range(1, depth + 1):
+        winners.append([_match(f'wb-{r}-{i}', r, i) for i in range(size >> r)])
+    final = _match('final-0', depth + 1, 0)
+
+    losers = []
+    for r in range(1, 2 * (depth - 1) + 1):
+        count = size >> ((r + 1) // 2 + 1)
+        losers.append([_match(f'lb-{r}-{i}', r, i, isLoserBracket=True) for i in range(count)])
+
+    for r, round_matches in enumerate(winners, start=1):
+        for i, match in enumerate(round_matches):
+            if r < depth:
+                _link(match, f'wb-{r + 1}-{i // 2}', _parity_slot(i))
+            else:
+                _link(match, final['id'], 'A')
+            if r == 1:
+                _link(match, f'lb-1-{i // 2}', _parity_slot(i), loser=True)
+            else:
+                # Les perdants du winner bracket rejoignent un round « d'entrée »
+                _link(match, f'lb-{2 * (r - 1)}-{i}', 'B', loser=True)
+
+    for r, round_matches in enumerate(losers, start=1):
+        for i, match in enumerate(round_matches):
+            if r == len(losers):
+                _link(match, final['id'], 'B')
+            elif r % 2 == 1:
+                _link(match, f'lb-{r + 1}-{i}', 'A')
+            else:
+                _link(match, f'lb-{r + 1}-{i // 2}', _parity_slot(i))
+
+    return {'main': winners + [[final]], 'loser': losers}
+
+
+class BracketEngine:
+    def __init__(self, data):
+        self.data = data
+        self._matches = {}
+        self._paths = {}
+        self._sources = {}
+        for path, match in self._positions():
+            self._matches[match['id']] = match
+            self._paths[match['id']] = path
+        for match in self._matches.values():
+            for next_key, slot_key, kind in (('nextMatchId', 'nextSlot', 'winner'),
+                                             ('loserNextMatchId', 'loserNextSlot', 'loser')):
+                next_id = match.get(next_key)
+                if next_id in self._matches:
+                    self._sources.setdefault(next_id, []).append((match['id'], match.get(slot_key), kind))
+
+    @classmethod
+    def generate(cls, teams, format=SINGLE_ELIMINATION, clubs=None):
+        """Construit un bracket à partir des équipes triées par tête de série.
+
+        ``clubs`` (liste alignée sur ``teams``) éloigne les coéquipiers, voir ``seeding.placement``.
+        """
+        from app.services.seeding import placement
+        if format not in FORMATS:
+            raise BracketError(f'Unsupported bracket format: {format}')
+        minimum = 3 if format == DOUBLE_ELIMINATION else 2
+        if len(teams) < minimum:
+            raise BracketError(f'At least {minimum} participants are required')
+        return cls.from_placement(placement(teams, clubs), format)
+
+    @classmethod
+    def from_placement(cls, slots, format=SINGLE_ELIMINATION):
+        """Construit un bracket à partir d'un placement explicite (None = bye)."""
+        size = len(slots)
+        if size < 2 or size & (size - 1):
+            raise BracketError('Placement size must be a power of two')
+        if format == DOUBLE_ELIMINATION:
+            if size < 4:
+                raise BracketError('At least 3 participants are required')
+            data = _build_double(size)
+            first_round = data['main'][0]
+        else:
+            data = _build_single(size)
+            first_round = data[0]
+        for i, match in enumerate(first_round):
+            match['teamA'] = slots[2 * i]
+            match['teamB'] = slots[2 * i + 1]
+        engine = cls(data)
+        for match in first_round:
+            engine._resolve_bye(match, [])
+        return engine
+
+    def _positions(self):
+        if isinstance(self.data, dict):
+            sections = [(['main'], self.data['main']), (['loser'], self.data['loser'])]
+        else:
+            sections = [([], self.data)]
+        for prefix, rounds in sections:
+            for round_index, round_matches in enumerate(rounds):
+                for match_index, match in enumerate(round_matches):
+                    yield prefix + [str(round_index), str(match_index)], match
+
+    def iter_matches(self):
+        for _, match in self._positions():
+            yield match
+
+    def path(self, match_id):
+        """Segments du chemin JSON du match dans le document (['main', '2', '0'] ou ['2', '0'])."""
+        self.get_match(match_id)
+        return self._paths[match_id]
+
+    def get_match(self, match_id):
+        match = self._matches.get(match_id)
+        if match is None:
+            raise BracketError(f'Unknown match: {match_id}')
+        return match
+
+    def report_result(self, match_id, winner, score_a=None, score_b=None):
+        """Enregistre le vainqueur d'un match et le fait avancer.
+
+        Retourne la liste des matchs modifiés (le match lui-même et ceux en aval).
+        """
+        if winner not in SLOTS:
+            raise BracketError("winner must be 'A' or 'B'")
+        match = self.get_match(match_id)
+        if match.get('bye'):
+            raise BracketError('Cannot report a result for a bye')
+        if match['teamA'] is None or match['teamB'] is None:
+            raise BracketError('Both participants must be known before reporting a result')
+        if match['winner'] is not None and match['winner'] != winner:
+            # Correction possible tant que les matchs suivants ne sont pas joués
+            for next_key in ('nextMatchId', 'loserNextMatchId'):
+                next_match = self._matches.get(match.get(next_key))
+                if next_match is not None and self._is_decided(next_match):
+                    raise BracketError('Cannot change a result once the next match is decided')
+
+        changed = [match]
+        match['winner'] = winner
+        if score_a is not None:
+            match['scoreA'] = score_a
+        if score_b is not None:
+            match['scoreB'] = score_b
+        self._advance(match, changed)
+        return changed
+
+    def _is_decided(self, match):
+        return match['winner'] is not None or bool(match.get('bye'))
+
+    def _slot_settled(self, match, slot):
+        if match[_team_key(slot)] is not None:
+            return True
+        for source_id, source_slot, _ in self._sources.get(match['id'], []):
+            if source_slot == slot or source_slot is None:
+                if not self._is_decided(self._matches[source_id]):
+                    return False
+        return True
+
+    def _resolve_bye(self, match, changed):
+        """Qualifie d'office le seul participant d'un match dont l'autre place restera vide."""
+        if self._is_decided(match) or not all(self._slot_settled(match, slot) for slot in SLOTS):
+            return
+        present = [slot for slot in SLOTS if match[_team_key(slot)] is not None]
+        if len(present) == 2:
+            return
+        match['bye'] = True
+        match['winner'] = present[0] if present else None
+        _mark_changed(changed, match)
+        self._advance(match, changed)
+
+    def _place(self, match_id, slot, team, changed):
+        next_match = self._matches.get(match_id)
+        if next_match is None:
+            return
+        if slot is None:
+            # Anciennes structures sans emplacement explicite : première place libre
+            slot = 'A' if next_match['teamA'] is None else 'B'
+        next_match[_team_key(slot)] = team
+        _mark_changed(changed, next_match)
+        self._resolve_bye(next_match, changed)
+
+    def _advance(self, match, changed):
+        winner_slot = match['winner']
+        winner_team = match[_team_key(winner_slot)] if winner_slot else None
+        loser_team = None
+        if winner_slot and not match.get('bye'):
+            loser_team = match[_team_key('B' if winner_slot == 'A' else 'A')]
+        if match.get('nextMatchId'):
+            slot = match.get('nextSlot') or _parity_slot(match.get('matchIndex', 0))
+            self._place(match['nextMatchId'], slot, winner_team, changed)
+        if match.get('loserNextMatchId'):
+            self._place(match['loserNextMatchId'], match.get('loserNextSlot'), loser_team, changed)
@@ -0,0 +1,214 @@
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'tournament_events'
+# Limite de taille d'un NOTIFY PostgreSQL (8000 octets par défaut)
+MAX_NOTIFY_PAYLOAD = 7900
+
+
+class Event:
+    __slots__ = ('id', 'tournament_id', 'name', 'data')
+
+    def __init__(self, id, tournament_id, name, data):
+        self.id = id
+        self.tournament_id = tournament_id
+        self.name = name
+        self.data = data
+
+    def to_sse(self):
+        # Sans id, le client garde son Last-Event-ID
+        prefix = f'id: {self.id}\n' if self.id is not None else ''
+        return f'{prefix}event: {self.name}\ndata: {json.dumps(self.data, separators=(",", ":"))}\n\n'
+
+
+class TournamentEventBroker:
+    """Pub/sub en mémoire des évènements d'un tournoi, pour le flux SSE.
+
+    Chaque abonné a sa propre file bornée : une écriture est copiée une fois
+    par connexion ouverte, sans requête SQL. Avec EVENTS_BACKEND='postgres',
+    les évènements passent par LISTEN/NOTIFY pour atteindre les autres workers.
+
+    Les ids d'évènement se suivent par tournoi : en local, le broker les
+    attribue ; avec PostgreSQL, l'émetteur les tire de
+    tournament_event_sequence et les joint au NOTIFY, pour que tous les
+    workers s'accordent sur un Last-Event-ID.
+
+    L'historique rejoué aux reconnexions est supprimé avec le tournoi, ou
+    EVENTS_HISTORY_TTL secondes après le départ du dernier abonné ; un client
+    dont l'écart n'est pas couvert par l'historique de ce worker (ou dont
+    l'id n'y a jamais été vu) reçoit 'resync'.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.backend = 'local'
+        self.queue_size = 100
+        self.history_size = 50
+        self.history_ttl = 300
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+        self._history = defaultdict(lambda: deque(maxlen=self.history_size))
+        # Tournois sans abonné, par ancienneté : leur historique expire après history_ttl
+        self._idle = OrderedDict()
+        # Dernier id émis par tournoi (backend local uniquement)
+        self._sequences = {}
+        self._listener = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.backend = app.config.get('EVENTS_BACKEND', 'local')
+        self.queue_size = app.config.get('EVENTS_QUEUE_SIZE', 100)
+        self.history_size = app.config.get('EVENTS_HISTORY_SIZE', 50)
+        self.history_ttl = app.config.get('EVENTS_HISTORY_TTL', 300)
+        app.extensions['tournament_events'] = self
+
+    def subscribe(self, tournament_id, last_event_id=None):
+        """Retourne une file d'évènements ; les évènements manqués depuis last_event_id y sont déjà."""
+        if self.backend == 'postgres':
+            self._ensure_listener()
+        subscriber = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers[tournament_id].add(subscriber)
+            self._idle.pop(tournament_id, None)
+            if last_event_id is not None:
+                history = self._history.get(tournament_id)
+                latest = history[-1].id if history else self._sequences.get(tournament_id)
+                if history and history[0].id <= last_event_id + 1 and last_event_id <= latest:
+                    for event in history:
+                        if event.id > last_event_id:
+                            subscriber.put_nowait(event)
+                elif last_event_id != latest:
+                    # Écart non couvert par l'historique, ou id jamais vu ici : le client recharge
+                    subscriber.put_nowait(Event(latest, None, 'resync', {}))
+        return subscriber
+
+    def unsubscribe(self, tournament_id, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(tournament_id)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[tournament_id]
+                    self._idle[tournament_id] = time.monotonic()
+            self._prune()
+
+    def _prune(self):
+        """Supprime l'historique des tournois sans abonné depuis history_ttl (sous verrou)."""
+        expired = time.monotonic() - self.history_ttl
+        while self._idle:
+            tournament_id, since = next(iter(self._idle.items()))
+            if since > expired:
+                return
+            del self._idle[tournament_id]
+            self._history.pop(tournament_id, None)
+
+    def publish(self, tournament_id, name, data):
+        """À appeler après le commit de l'écriture correspondante."""
+        if self.backend == 'postgres':
+            self._notify(tournament_id, name, data)
+        else:
+            self._dispatch(tournament_id, name, data)
+
+    def _dispatch(self, tournament_id, name, data, event_id=None):
+        with self._lock:
+            if event_id is None:
+                event_id = self._sequences[tournament_id] = self._sequences.get(tournament_id, 0) + 1
+            event = Event(event_id, tournament_id, name, data)
+            subscribers = list(self._subscribers.get(tournament_id, ()))
+            if name == 'deleted':
+                # Plus de reconnexion possible : rien à rejouer
+                self._history.pop(tournament_id, None)
+                self._idle.pop(tournament_id, None)
+                self._sequences.pop(tournament_id, None)
+            else:
+                history = self._history[tournament_id]
+                if history and event.id != history[-1].id + 1:
+                    # Notification manquée (écoute interrompue) : l'historique repart de cet évènement
+                    history.clear()
+                history.append(event)
+                if not subscribers and tournament_id not in self._idle:
+                    self._idle[tournament_id] = time.monotonic()
+            self._prune()
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait(event)
+            except queue.Full:
+                # Client trop lent : on lui demandera de tout recharger
+                self._overflow(subscriber, event.id)
+
+    def _overflow(self, subscriber, last_id):
+        try:
+            while True:
+                subscriber.get_nowait()
+        except queue.Empty:
+            pass
+        # Id du dernier évènement : après rechargement, le client repart de là
+        subscriber.put_nowait(Event(last_id, None, 'resync', {}))
+
+    def _notify(self, tournament_id, name, data):
+        from app import db
+        from app.models.event import TournamentEventSequence
+        # Id suivant du tournoi : le verrou de ligne ordonne les émetteurs jusqu'au commit,
+        # donc les NOTIFY arrivent dans l'ordre des ids
+        statement = insert(TournamentEventSequence).values(tournament_id=tournament_id, last_id=1)
+        event_id = db.session.scalar(statement.on_conflict_do_update(
+            index_elements=[TournamentEventSequence.tournament_id],
+            set_={'last_id': TournamentEventSequence.last_id + 1},
+        ).returning(TournamentEventSequence.last_id))
+        if name == 'deleted':
+            db.session.execute(db.delete(TournamentEventSequence)
+                               .where(TournamentEventSequence.tournament_id == tournament_id))
+        payload = json.dumps({'id': event_id, 'tournament_id': tournament_id, 'event': name, 'data': data},
+                             separators=(',', ':'))
+        if len(payload.encode()) > MAX_NOTIFY_PAYLOAD:
+            payload = json.dumps({'id': event_id, 'tournament_id': tournament_id, 'event': 'resync', 'data': {}})
+        # NOTIFY est transactionnel : il part au commit
+        db.session.execute(text('SELECT pg_notify(:channel, :payload)'), {'channel': CHANNEL, 'payload': payload})
+        db.session.commit()
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(target=self._listen, name='tournament-events', daemon=True)
+            self._listener.start()
+
+    def _listen(self):
+        from app import db
+        with self.app.app_context():
+            connection = db.engine.raw_connection()
+        try:
+            dbapi_connection = connection.dbapi_connection
+            dbapi_connection.autocommit = True
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f'LISTEN {CHANNEL}')
+            while True:
+                if select.select([dbapi_connection], [], [], 5) == ([], [], []):
+                    continue
+                dbapi_connection.poll()
+                while dbapi_connection.notifies:
+                    notify = dbapi_connection.notifies.pop(0)
+                    try:
+                        message = json.loads(notify.payload)
+                        self._dispatch(message['tournament_id'], message['event'], message['data'], message['id'])
+                    except (ValueError, KeyError):
+                        logger.warning('Invalid tournament event payload: %s', notify.payload)
+        except Exception:
+            logger.exception('Tournament events listener stopped')
+        finally:
+            connection.close()
+
+
+tournament_events = TournamentEventBroker()
@@ -0,0 +1,153 @@
+import csv
+import io
+import json
+
+from sqlalchemy.orm import aliased
+
+from app import db
+from app.models.tournament import Match, Tournament, TournamentParticipant
+from app.models.user import User
+
+# Lignes lues par aller-retour du curseur côté serveur
+EXPORT_BATCH_SIZE = 500
+# Taille visée d'un morceau envoyé au client
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+TOURNAMENT_COLUMNS = ['id', 'name', 'description', 'game_type', 'format', 'status',
+                      'creator_id', 'max_participants', 'seats_taken']
+PARTICIPANT_COLUMNS = ['tournament_id', 'id', 'user_id', 'username', 'email', 'guest_name', 'status']
+MATCH_COLUMNS = ['tournament_id', 'id', 'bracket_match_id', 'section', 'round', 'status',
+                 'participant1_id', 'participant1', 'participant2_id', 'participant2',
+                 'score1', 'score2', 'winner_participant_id', 'winner']
+EXPORT_TABLES = {
+    'tournaments': TOURNAMENT_COLUMNS,
+    'participants': PARTICIPANT_COLUMNS,
+    'matches': MATCH_COLUMNS,
+}
+
+
+class _TournamentRows:
+    """Flux trié par tournament_id, consommé tournoi par tournoi sans rien garder en mémoire."""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._next = next(self._rows, None)
+
+    def take(self, tournament_id):
+        while self._next is not None and self._next.tournament_id < tournament_id:
+            self._next = next(self._rows, None)
+        while self._next is not None and self._next.tournament_id == tournament_id:
+            yield self._next
+            self._next = next(self._rows, None)
+
+
+def _chunks(lines):
+    """Regroupe les lignes en morceaux d'environ EXPORT_CHUNK_SIZE caractères."""
+    buffer = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= EXPORT_CHUNK_SIZE:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+class ExportService:
+    """Exports NDJSON / CSV d'un tournoi ou de tous les tournois d'un créateur.
+
+    Chaque table est lue par un curseur côté serveur (``yield_per``) triée
+    par tournoi : trois requêtes au total, et la mémoire utilisée ne dépend
+    pas du nombre de lignes exportées.
+    """
+
+    @staticmethod
+    def _stream(query):
+        return db.session.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+
+    @staticmethod
+    def tournaments(tournament_id=None, creator_id=None):
+        query = db.select(*[getattr(Tournament, column) for column in TOURNAMENT_COLUMNS])
+        return ExportService._stream(ExportService._scope(query, Tournament.id, tournament_id, creator_id)
+                                     .order_by(Tournament.id))
+
+    @staticmethod
+    def participants(tournament_id=None, creator_id=None):
+        query = (
+            db.select(TournamentParticipant.tournament_id, TournamentParticipant.id, TournamentParticipant.user_id,
+                      User.username, User.email, TournamentParticipant.guest_name, TournamentParticipant.status)
+            .outerjoin(User, User.id == TournamentParticipant.user_id)
+        )
+        query = ExportService._scope(query, TournamentParticipant.tournament_id, tournament_id, creator_id)
+        return ExportService._stream(query.order_by(TournamentParticipant.tournament_id, TournamentParticipant.id))
+
+    @staticmethod
+    def matches(tournament_id=None, creator_id=None):
+        # Nom affiché de chaque participant du match : compte ou invité
+        slots = {
+            'participant1': Match.participant1_id,
+            'participant2': Match.participant2_id,
+            'winner': Match.winner_participant_id,
+        }
+        names = {}
+        joins = []
+        for slot, column in slots.items():
+            participant = aliased(TournamentParticipant)
+            user = aliased(User)
+            names[slot] = db.func.coalesce(user.username, participant.guest_name).label(slot)
+            joins.append((participant, participant.id == column, user, user.id == participant.user_id))
+        query = db.select(
+            Match.tournament_id, Match.id, Match.bracket_match_id, Match.section, Match.round, Match.status,
+            Match.participant1_id, names['participant1'], Match.participant2_id, names['participant2'],
+            Match.score1, Match.score2, Match.winner_participant_id, names['winner'],
+        )
+        for participant, on_participant, user, on_user in joins:
+            query = query.outerjoin(participant, on_participant).outerjoin(user, on_user)
+        query = ExportService._scope(query, Match.tournament_id, tournament_id, creator_id)
+        return ExportService._stream(query.order_by(Match.tournament_id, Match.section, Match.round, Match.id))
+
+    @staticmethod
+    def _scope(query, column, tournament_id, creator_id):
+        if tournament_id is not None:
+            return query.where(column == tournament_id)
+        if column is not Tournament.id:
+            query = query.join(Tournament, Tournament.id == column)
+        return query.where(Tournament.creator_id == creator_id)
+
+    @staticmethod
+    def ndjson(tournament_id=None, creator_id=None):
+        """Une ligne par tournoi, suivie de ses participants puis de ses matchs (par section et tour)."""
+        participants = _TournamentRows(ExportService.participants(tournament_id, creator_id))
+        matches = _TournamentRows(ExportService.matches(tournament_id, creator_id))
+
+        def lines():
+            for tournament in ExportService.tournaments(tournament_id, creator_id):
+                yield json.dumps({'type': 'tournament', **tournament._asdict()}) + '\n'
+                for row in participants.take(tournament.id):
+                    yield json.dumps({'type': 'participant', **row._asdict()}) + '\n'
+                for row in matches.take(tournament.id):
+                    yield json.dumps({'type': 'match', **row._asdict()}) + '\n'
+
+        return _chunks(lines())
+
+    @staticmethod
+    def csv(table, tournament_id=None, creator_id=None):
+        """Une table ('tournaments', 'participants' ou 'matches') au format CSV avec en-tête."""
+        rows = getattr(ExportService, table)(tournament_id, creator_id)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def lines():
+            writer.writerow(EXPORT_TABLES[table])
+            for row in rows:
+                writer.writerow(row)
+                if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+
+        return lines()
@@ -0,0 +1,120 @@
+"""Application de patchs JSON (RFC 6902) sur un document déjà chargé.
+
+Seules les opérations de la RFC sont acceptées (add, remove, replace, move,
+copy, test) ; le document est modifié en place et doit être validé par
+l'appelant après application.
+"""
+import copy
+
+OPERATIONS = ('add', 'remove', 'replace', 'move', 'copy', 'test')
+
+
+class JsonPatchError(ValueError):
+    pass
+
+
+class JsonPatchConflict(JsonPatchError):
+    """Une opération 'test' a échoué : le document a changé entre-temps."""
+
+
+def parse_pointer(pointer):
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith('/')):
+        raise JsonPatchError(f'Invalid JSON pointer: {pointer!r}')
+    if pointer == '':
+        return []
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def validate_operations(operations):
+    if not isinstance(operations, list) or not operations:
+        raise JsonPatchError('Patch must be a non-empty list of operations')
+    for operation in operations:
+        if not isinstance(operation, dict) or operation.get('op') not in OPERATIONS:
+            raise JsonPatchError(f'Invalid operation: {operation!r}')
+        parse_pointer(operation.get('path'))
+        if operation['op'] in ('add', 'replace', 'test') and 'value' not in operation:
+            raise JsonPatchError(f"Operation '{operation['op']}' requires a value")
+        if operation['op'] in ('move', 'copy'):
+            parse_pointer(operation.get('from'))
+    return operations
+
+
+def _index(container, token, allow_end=False):
+    if allow_end and token == '-':
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith('0')):
+        raise JsonPatchError(f'Invalid array index: {token!r}')
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise JsonPatchError(f'Array index out of range: {token}')
+    return index
+
+
+def _resolve(document, tokens):
+    node = document
+    for token in tokens:
+        if isinstance(node, list):
+            node = node[_index(node, token)]
+        elif isinstance(node, dict):
+            if token not in node:
+                raise JsonPatchError(f'Path not found: /{"/".join(tokens)}')
+            node = node[token]
+        else:
+            raise JsonPatchError(f'Path not found: /{"/".join(tokens)}')
+    return node
+
+
+def get_value(document, pointer):
+    return _resolve(document, parse_pointer(pointer))
+
+
+def _add(document, tokens, value):
+    if not tokens:
+        return value
+    parent = _resolve(document, tokens[:-1])
+    if isinstance(parent, list):
+        parent.insert(_index(parent, tokens[-1], allow_end=True), value)
+    elif isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    else:
+        raise JsonPatchError('Cannot add to a scalar value')
+    return document
+
+
+def _remove(document, tokens):
+    if not tokens:
+        raise JsonPatchError('Cannot remove the whole document')
+    parent = _resolve(document, tokens[:-1])
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, tokens[-1]))
+    if isinstance(parent, dict) and tokens[-1] in parent:
+        return parent.pop(tokens[-1])
+    raise JsonPatchError(f'Path not found: /{"/".join(tokens)}')
+
+
+def apply_patch(document, operations):
+    """Applique les opérations dans l'ordre et retourne le document obtenu."""
+    for operation in validate_operations(operations):
+        op = operation['op']
+        tokens = parse_pointer(operation['path'])
+        if op == 'test':
+            if _resolve(document, tokens) != operation['value']:
+                raise JsonPatchConflict(f"Test failed at {operation['path']}")
+        elif op == 'add':
+            document = _add(document, tokens, copy.deepcopy(operation['value']))
+        elif op == 'remove':
+            _remove(document, tokens)
+        elif op == 'replace':
+            _resolve(document, tokens)
+            if tokens:
+                _remove(document, tokens)
+            document = _add(document, tokens, copy.deepcopy(operation['value']))
+        elif op == 'move':
+            source = parse_pointer(operation['from'])
+            if tokens[:len(source)] == source and tokens != source:
+                raise JsonPatchError('Cannot move a value into one of its children')
+            document = _add(document, tokens, _remove(document, source))
+        elif op == 'copy':
+            value = copy.deepcopy(_resolve(document, parse_pointer(operation['from'])))
+            document = _add(document, tokens, value)
+    return document
@@ -0,0 +1,164 @@
+from collections import namedtuple
+
+from app import db
+from app.models.tournament import Match, Tournament, TournamentParticipant
+
+SYNCED_FIELDS = (
+    'round', 'section', 'status', 'score1', 'score2',
+    'player1_id', 'player2_id', 'winner_id',
+    'participant1_id', 'participant2_id', 'winner_participant_id',
+)
+
+# completed : ids de bracket des matchs terminés écrits (nouveaux ou corrigés) ;
+# reopened : anciennes lignes de matchs terminés modifiées ou supprimées
+SyncChanges = namedtuple('SyncChanges', ['completed', 'reopened'])
+
+
+def iter_bracket_matches(bracket):
+    if isinstance(bracket, dict):
+        sections = [bracket.get('main') or [], bracket.get('loser') or []]
+    else:
+        sections = [bracket or []]
+    for rounds in sections:
+        for round_matches in rounds:
+            yield from round_matches
+
+
+def _section(match):
+    if match.get('isLoserBracket') or str(match.get('id', '')).startswith('lb-'):
+        return 'loser'
+    return 'main'
+
+
+def _status(match):
+    if match.get('bye'):
+        return 'bye'
+    if match.get('winner') in ('A', 'B'):
+        return 'completed'
+    if match.get('teamA') and match.get('teamB'):
+        return 'ready'
+    return 'pending'
+
+
+class MatchSyncService:
+    """Projette l'état du bracket JSON dans la table match.
+
+    Seules les lignes dont le contenu a changé sont écrites, en un INSERT
+    multi-lignes et un UPDATE groupé par clé primaire.
+    """
+
+    @staticmethod
+    def _participant_lookup(tournament_id, matches):
+        # Brackets générés côté client : les équipes ne portent que str(user_id or participant.id)
+        if all(
+            team is None or 'participant_id' in team
+            for match in matches
+            for team in (match.get('teamA'), match.get('teamB'))
+        ):
+            return {}
+        rows = db.session.execute(
+            db.select(TournamentParticipant.id, TournamentParticipant.user_id)
+            .where(TournamentParticipant.tournament_id == tournament_id)
+        ).all()
+        lookup = {str(row.id): (row.id, None) for row in rows if row.user_id is None}
+        lookup.update({str(row.user_id): (row.id, row.user_id) for row in rows if row.user_id is not None})
+        return lookup
+
+    @staticmethod
+    def project(match, lookup):
+        """Valeurs de la ligne match correspondant à un match du bracket."""
+        def resolve(team):
+            if not team:
+                return None, None
+            if 'participant_id' in team:
+                return team.get('participant_id'), team.get('user_id')
+            return lookup.get(str(team.get('id')), (None, None))
+
+        participant1_id, player1_id = resolve(match.get('teamA'))
+        participant2_id, player2_id = resolve(match.get('teamB'))
+        winner = match.get('winner')
+        return {
+            'round': match.get('round') or 0,
+            'section': _section(match),
+            'status': _status(match),
+            'score1': match.get('scoreA'),
+            'score2': match.get('scoreB'),
+            'player1_id': player1_id,
+            'player2_id': player2_id,
+            'winner_id': player1_id if winner == 'A' else player2_id if winner == 'B' else None,
+            'participant1_id': participant1_id,
+            'participant2_id': participant2_id,
+            'winner_participant_id': participant1_id if winner == 'A' else participant2_id if winner == 'B' else None,
+        }
+
+    @staticmethod
+    def sync(tournament_id, matches, full=False):
+        """Met à jour les lignes des matchs donnés (dicts du bracket).
+
+        Avec ``full=True``, ``matches`` est le bracket complet et les lignes
+        des matchs qui n'y figurent plus sont supprimées. Retourne les
+        SyncChanges servant au classement incrémental. Ne commit pas.
+        """
+        matches = [match for match in matches if match.get('id')]
+        lookup = MatchSyncService._participant_lookup(tournament_id, matches)
+        wanted = {str(match['id']): MatchSyncService.project(match, lookup) for match in matches}
+
+        query = db.select(Match.id, Match.bracket_match_id, *[getattr(Match, field) for field in SYNCED_FIELDS]).where(
+            Match.tournament_id == tournament_id, Match.bracket_match_id.isnot(None)
+        )
+        if not full:
+            query = query.where(Match.bracket_match_id.in_(list(wanted)))
+        existing = {row.bracket_match_id: row for row in db.session.execute(query).all()}
+
+        inserts, updates, completed, reopened = [], [], [], []
+        for bracket_match_id, values in wanted.items():
+            row = existing.get(bracket_match_id)
+            if row is None:
+                inserts.append(dict(values, tournament_id=tournament_id, bracket_match_id=bracket_match_id))
+            elif any(getattr(row, field) != values[field] for field in SYNCED_FIELDS):
+                updates.append(dict(values, id=row.id))
+                if row.status == 'completed':
+                    reopened.append(row)
+            else:
+                continue
+            if values['status'] == 'completed':
+                completed.append(bracket_match_id)
+
+        if inserts:
+            db.session.execute(db.insert(Match), inserts)
+        if updates:
+            db.session.execute(db.update(Match), updates)
+        if full:
+            stale = [row for key, row in existing.items() if key not in wanted]
+            if stale:
+                db.session.execute(db.delete(Match).where(Match.id.in_([row.id for row in stale])))
+                reopened += [row for row in stale if row.status == 'completed']
+        return SyncChanges(completed, reopened)
+
+    @staticmethod
+    def sync_bracket(tournament_id, bracket):
+        return MatchSyncService.sync(tournament_id, list(iter_bracket_matches(bracket)), full=True)
+
+    @staticmethod
+    def backfill(batch_size=100, echo=None):
+        """Projette les brackets de tous les tournois existants, par lots de tournois."""
+        last_id = 0
+        processed = 0
+        while True:
+            rows = db.session.execute(
+                db.select(Tournament.id, Tournament.bracket)
+                .where(Tournament.id > last_id, Tournament.bracket.isnot(None))
+                .order_by(Tournament.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                return processed
+            for row in rows:
+                MatchSyncService.sync_bracket(row.id, row.bracket)
+            db.session.commit()
+            # Libère les objets chargés pour garder une mémoire constante
+            db.session.expunge_all()
+            processed += len(rows)
+            last_id = rows[-1].id
+            if echo:
+                echo(f'{processed} tournaments synchronized')
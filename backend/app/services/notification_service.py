@@ -1,5 +1,58 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+
 from app import db
-from app.models.notification import Notification
+from app.models.notification import Notification, NotificationOutbox
+from app.models.tournament import TournamentParticipant
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationDispatcher:
+    """Traite l'outbox des notifications dans un pool de threads borné.
+
+    Les requêtes n'écrivent qu'une ligne d'outbox ; l'expansion vers chaque
+    destinataire et l'INSERT groupé se font ici, donc la latence ne dépend pas
+    du nombre de participants. ``flask process-notifications`` reprend les
+    lignes restées 'pending' (redémarrage, mode synchrone), les échecs tant
+    qu'il reste des tentatives (NOTIFICATION_MAX_ATTEMPTS) et les lignes
+    'processing' abandonnées depuis NOTIFICATION_PROCESSING_TIMEOUT secondes.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.executor = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['notification_dispatcher'] = self
+        if app.config.get('NOTIFICATIONS_ASYNC'):
+            self.executor = ThreadPoolExecutor(
+                max_workers=app.config.get('NOTIFICATION_WORKERS', 2),
+                thread_name_prefix='notifications'
+            )
+
+    def submit(self, outbox_id):
+        if self.executor is None:
+            return NotificationService.process_outbox(outbox_id)
+        self.executor.submit(self._run, outbox_id)
+
+    def _run(self, outbox_id):
+        with self.app.app_context():
+            try:
+                NotificationService.process_outbox(outbox_id)
+            finally:
+                db.session.remove()
+
+
+notification_dispatcher = NotificationDispatcher()
+
 
 class NotificationService:
     @staticmethod
@@ -11,27 +64,184 @@ class NotificationService:
             type=type
         )
         db.session.add(notification)
+        NotificationService._increment_unread([user_id])
         db.session.commit()
         return notification
 
     @staticmethod
-    def notify_tournament_start(tournament):
-        participants = tournament.participants.all()
-        for participant in participants:
-            NotificationService.create_notification(
-                participant.user_id,
-                f"Tournoi {tournament.name}",
-                "Le tournoi commence maintenant !",
-                "tournament_start"
+    def create_notifications(user_ids, title, message, type):
+        """Insère une notification par utilisateur en un seul INSERT multi-lignes (sans commit)."""
+        rows = [
+            {'user_id': user_id, 'title': title, 'message': message, 'type': type, 'read': False}
+            for user_id in dict.fromkeys(user_ids) if user_id is not None
+        ]
+        if rows:
+            db.session.execute(db.insert(Notification), rows)
+            NotificationService._increment_unread([row['user_id'] for row in rows])
+        return len(rows)
+
+    @staticmethod
+    def _increment_unread(user_ids):
+        db.session.execute(
+            db.update(User)
+            .where(User.id.in_(user_ids))
+            .values(unread_notification_count=User.unread_notification_count + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def mark_read(user_id, notification_ids=None):
+        """Marque des notifications (ou toutes) comme lues et décrémente le compteur d'autant."""
+        query = db.update(Notification).where(Notification.user_id == user_id, Notification.read == db.false())
+        if notification_ids is not None:
+            query = query.where(Notification.id.in_(notification_ids))
+        updated = db.session.execute(
+            query.values(read=True).execution_options(synchronize_session=False)
+        ).rowcount
+        if updated:
+            db.session.execute(
+                db.update(User)
+                .where(User.id == user_id)
+                .values(unread_notification_count=User.unread_notification_count - updated)
+                .execution_options(synchronize_session=False)
             )
+        db.session.commit()
+        return updated
+
+    @staticmethod
+    def unread_count(user_id):
+        return db.session.scalar(db.select(User.unread_notification_count).where(User.id == user_id)) or 0
 
     @staticmethod
-    def notify_match_scheduled(match):
-        for player_id in [match.player1_id, match.player2_id]:
-            if player_id:
-                NotificationService.create_notification(
-                    player_id,
-                    "Match Programmé",
-                    f"Votre prochain match est programmé.",
-                    "match_scheduled"
-                ) 
\ No newline at end of file
+    def rebuild_unread_counts():
+        """Recalcule tous les compteurs depuis l'index partiel des non-lues."""
+        unread = (
+            db.select(db.func.count(Notification.id))
+            .where(Notification.user_id == User.id, Notification.read == db.false())
+            .scalar_subquery()
+        )
+        updated = db.session.execute(db.update(User).values(unread_notification_count=unread)).rowcount
+        db.session.commit()
+        return updated
+
+    @staticmethod
+    def enqueue(kind, payload):
+        entry = NotificationOutbox(kind=kind, payload=payload)
+        db.session.add(entry)
+        db.session.commit()
+        notification_dispatcher.submit(entry.id)
+        return entry
+
+    @staticmethod
+    def _claimable():
+        """Lignes à traiter : en attente, en échec ou abandonnées en cours, sous la limite de tentatives."""
+        config = current_app.config
+        stale = datetime.utcnow() - timedelta(seconds=config.get('NOTIFICATION_PROCESSING_TIMEOUT', 300))
+        retry = NotificationOutbox.attempts < config.get('NOTIFICATION_MAX_ATTEMPTS', 5)
+        return db.or_(
+            NotificationOutbox.status == 'pending',
+            db.and_(NotificationOutbox.status == 'failed', retry),
+            db.and_(NotificationOutbox.status == 'processing', retry,
+                    db.or_(NotificationOutbox.claimed_at.is_(None), NotificationOutbox.claimed_at < stale)),
+        )
+
+    @staticmethod
+    def process_outbox(outbox_id):
+        # Réclame la ligne : un seul worker la traite même si elle est soumise deux fois
+        claimed = db.session.execute(
+            db.update(NotificationOutbox)
+            .where(NotificationOutbox.id == outbox_id, NotificationService._claimable())
+            .values(status='processing', attempts=NotificationOutbox.attempts + 1, claimed_at=datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        if not claimed:
+            return 0
+        entry = db.session.get(NotificationOutbox, outbox_id)
+        try:
+            handler = OUTBOX_HANDLERS[entry.kind]
+            count = handler(**entry.payload)
+            entry.status = 'done'
+            db.session.commit()
+            return count
+        except Exception as e:
+            db.session.rollback()
+            logger.exception('Notification outbox %s failed', outbox_id)
+            db.session.execute(
+                db.update(NotificationOutbox)
+                .where(NotificationOutbox.id == outbox_id)
+                .values(status='failed', last_error=str(e))
+            )
+            db.session.commit()
+            return 0
+
+    @staticmethod
+    def process_pending(batch_size=100):
+        """Une passe sur les lignes à traiter : un envoi qui échoue encore attend la passe suivante."""
+        processed = 0
+        last_id = 0
+        while True:
+            ids = db.session.scalars(
+                db.select(NotificationOutbox.id)
+                .where(NotificationOutbox.id > last_id, NotificationService._claimable())
+                .order_by(NotificationOutbox.id)
+                .limit(batch_size)
+            ).all()
+            if not ids:
+                return processed
+            for outbox_id in ids:
+                NotificationService.process_outbox(outbox_id)
+            processed += len(ids)
+            last_id = ids[-1]
+
+    @staticmethod
+    def _send_tournament_start(tournament_id, tournament_name):
+        # Les invités (user_id NULL) n'ont pas de compte à notifier
+        user_ids = db.session.scalars(
+            db.select(TournamentParticipant.user_id).where(
+                TournamentParticipant.tournament_id == tournament_id,
+                TournamentParticipant.status == 'accepted',
+                TournamentParticipant.user_id.isnot(None)
+            )
+        ).all()
+        return NotificationService.create_notifications(
+            user_ids,
+            f"Tournoi {tournament_name}",
+            "Le tournoi commence maintenant !",
+            "tournament_start"
+        )
+
+    @staticmethod
+    def _send_match_scheduled(player_ids, tournament_name=None):
+        return NotificationService.create_notifications(
+            player_ids,
+            f"Tournoi {tournament_name}" if tournament_name else "Match Programmé",
+            "Votre prochain match est programmé.",
+            "match_scheduled"
+        )
+
+    @staticmethod
+    def notify_tournament_start(tournament):
+        return NotificationService.enqueue('tournament_start', {
+            'tournament_id': tournament.id,
+            'tournament_name': tournament.name
+        })
+
+    @staticmethod
+    def notify_matches_scheduled(tournament, matches):
+        """Une seule ligne d'outbox pour tous les joueurs (comptes) des matchs planifiés."""
+        player_ids = list(dict.fromkeys(
+            player_id for match in matches if match.status != 'bye'
+            for player_id in (match.player1_id, match.player2_id) if player_id
+        ))
+        if not player_ids:
+            return None
+        return NotificationService.enqueue('match_scheduled', {
+            'player_ids': player_ids,
+            'tournament_name': tournament.name
+        })
+
+
+OUTBOX_HANDLERS = {
+    'tournament_start': NotificationService._send_tournament_start,
+    'match_scheduled': NotificationService._send_match_scheduled,
+}
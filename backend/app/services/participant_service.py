@@ -0,0 +1,246 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.models.tournament import Tournament, TournamentParticipant
+from app.models.user import User
+
+
+def _insert_ignoring_conflicts():
+    """INSERT ... ON CONFLICT DO NOTHING pour le dialecte courant."""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert(TournamentParticipant).on_conflict_do_nothing()
+    if dialect == 'sqlite':
+        return sqlite.insert(TournamentParticipant).on_conflict_do_nothing()
+    return db.insert(TournamentParticipant)
+
+
+# Statuts qui occupent une place (comptés dans tournament.seats_taken)
+SEAT_STATUSES = ('pending', 'accepted')
+
+
+class ParticipantError(ValueError):
+    pass
+
+
+class AlreadyRegistered(ParticipantError):
+    pass
+
+
+class TournamentFull(ParticipantError):
+    pass
+
+
+class ParticipantService:
+    """Inscriptions sans course : les places sont réservées par un UPDATE conditionnel.
+
+    ``tournament.seats_taken`` compte les participants 'pending' et
+    'accepted' ; une place n'est prise que si l'UPDATE ... WHERE
+    seats_taken < max_participants touche la ligne, dans la même transaction
+    que l'INSERT du participant. Les doublons sont arrêtés par les index
+    uniques et un tournoi complet met en liste d'attente si ``waitlist``.
+    """
+
+    @staticmethod
+    def lock_tournament(tournament_id):
+        """Verrouille la ligne du tournoi jusqu'au commit (sérialise les inscriptions)."""
+        return db.session.execute(
+            db.select(Tournament.id, Tournament.max_participants, Tournament.seats_taken)
+            .where(Tournament.id == tournament_id)
+            .with_for_update()
+        ).first()
+
+    @staticmethod
+    def claim_seats(tournament_id, count=1):
+        """Réserve ``count`` places si la capacité le permet ; False sinon."""
+        return db.session.execute(
+            db.update(Tournament)
+            .where(
+                Tournament.id == tournament_id,
+                db.or_(Tournament.max_participants.is_(None),
+                       Tournament.seats_taken + count <= Tournament.max_participants)
+            )
+            .values(seats_taken=Tournament.seats_taken + count)
+            .execution_options(synchronize_session=False)
+        ).rowcount == 1
+
+    @staticmethod
+    def release_seat(tournament_id):
+        """Libère une place et la donne au premier de la liste d'attente ; retourne ce participant."""
+        db.session.execute(
+            db.update(Tournament)
+            .where(Tournament.id == tournament_id, Tournament.seats_taken > 0)
+            .values(seats_taken=Tournament.seats_taken - 1)
+            .execution_options(synchronize_session=False)
+        )
+        waiting = db.session.scalars(
+            db.select(TournamentParticipant)
+            .where(TournamentParticipant.tournament_id == tournament_id,
+                   TournamentParticipant.status == 'waitlisted')
+            .order_by(TournamentParticipant.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).first()
+        if waiting is None or not ParticipantService.claim_seats(tournament_id):
+            return None
+        waiting.status = 'pending'
+        return waiting
+
+    @staticmethod
+    def _is_registered(tournament_id, user_id=None, guest_name=None):
+        identity = (TournamentParticipant.user_id == user_id if user_id is not None
+                    else TournamentParticipant.guest_name == guest_name)
+        return db.session.scalar(db.select(db.exists().where(
+            TournamentParticipant.tournament_id == tournament_id, identity
+        )))
+
+    @staticmethod
+    def register(tournament, status='pending', user_id=None, guest_name=None):
+        """Inscrit un compte ou un invité ; en liste d'attente si complet et ``tournament.waitlist``.
+
+        Lève AlreadyRegistered (la transaction est alors annulée) ou
+        TournamentFull. Le commit reste à la charge de l'appelant.
+        """
+        if not ParticipantService.claim_seats(tournament.id):
+            # Tournoi complet : un inscrit qui réessaie reste « déjà inscrit », pas « complet »
+            if ParticipantService._is_registered(tournament.id, user_id, guest_name):
+                raise AlreadyRegistered('Already registered')
+            if not tournament.waitlist:
+                raise TournamentFull('Tournament is full')
+            status = 'waitlisted'
+        participant = TournamentParticipant(
+            tournament_id=tournament.id,
+            user_id=user_id,
+            guest_name=guest_name,
+            status=status
+        )
+        db.session.add(participant)
+        try:
+            db.session.flush()
+        except IntegrityError:
+            # Annule aussi la réservation de place faite plus haut
+            db.session.rollback()
+            raise AlreadyRegistered('Already registered')
+        return participant
+
+    @staticmethod
+    def change_status(tournament, participant, status):
+        """Change le statut en tenant le compteur de places ; retourne le participant promu éventuel."""
+        had_seat = participant.status in SEAT_STATUSES
+        needs_seat = status in SEAT_STATUSES
+        if needs_seat and not had_seat:
+            if not ParticipantService.claim_seats(tournament.id):
+                if not tournament.waitlist:
+                    raise TournamentFull('Tournament is full')
+                status = 'waitlisted'
+        participant.status = status
+        if had_seat and not needs_seat:
+            return ParticipantService.release_seat(tournament.id)
+        return None
+
+    @staticmethod
+    def remove(participant):
+        """Supprime une inscription ; retourne le participant promu depuis la liste d'attente."""
+        had_seat = participant.status in SEAT_STATUSES
+        db.session.delete(participant)
+        db.session.flush()
+        if had_seat:
+            return ParticipantService.release_seat(participant.tournament_id)
+        return None
+
+    @staticmethod
+    def rebuild_seat_counts():
+        """Recalcule tous les compteurs de places depuis les inscriptions."""
+        seats = (
+            db.select(db.func.count(TournamentParticipant.id))
+            .where(TournamentParticipant.tournament_id == Tournament.id,
+                   TournamentParticipant.status.in_(SEAT_STATUSES))
+            .scalar_subquery()
+        )
+        updated = db.session.execute(db.update(Tournament).values(seats_taken=seats)).rowcount
+        db.session.commit()
+        return updated
+
+    @staticmethod
+    def bulk_add(tournament_id, entries):
+        """Ajoute des participants acceptés depuis une liste de ('email' | 'guest_name', valeur).
+
+        Coût constant en requêtes : verrou du tournoi (avec son compteur de
+        places), résolution des emails (un IN), doublons existants (un IN),
+        un seul INSERT ... ON CONFLICT DO NOTHING puis la mise à jour du compteur. Retourne (résultats par ligne,
+        nombre d'ajouts) ; le commit reste à la charge de l'appelant.
+        """
+        tournament = ParticipantService.lock_tournament(tournament_id)
+        results = [{'row': i, kind: value} for i, (kind, value) in enumerate(entries)]
+
+        emails = {value for kind, value in entries if kind == 'email'}
+        users = {}
+        if emails:
+            users = dict(db.session.execute(
+                db.select(User.email, User.id).where(User.email.in_(emails))
+            ).all())
+
+        user_ids = set(users.values())
+        guest_names = {value for kind, value in entries if kind == 'guest_name'}
+        existing = db.session.execute(
+            db.select(TournamentParticipant.user_id, TournamentParticipant.guest_name).where(
+                TournamentParticipant.tournament_id == tournament_id,
+                db.or_(TournamentParticipant.user_id.in_(user_ids),
+                       TournamentParticipant.guest_name.in_(guest_names))
+            )
+        ).all() if user_ids or guest_names else []
+        taken = {('user_id', row.user_id) for row in existing if row.user_id is not None}
+        taken |= {('guest_name', row.guest_name) for row in existing if row.guest_name is not None}
+
+        remaining = None
+        if tournament.max_participants:
+            remaining = max(tournament.max_participants - tournament.seats_taken, 0)
+
+        rows = []
+        pending = {}
+        for result, (kind, value) in zip(results, entries):
+            if kind == 'email':
+                if value not in users:
+                    result['status'] = 'not_found'
+                    continue
+                key = ('user_id', users[value])
+            else:
+                key = ('guest_name', value)
+            if key in taken:
+                result['status'] = 'duplicate'
+                continue
+            if remaining is not None and len(rows) >= remaining:
+                result['status'] = 'full'
+                continue
+            taken.add(key)
+            pending[key] = result
+            rows.append({
+                'tournament_id': tournament_id,
+                'user_id': key[1] if key[0] == 'user_id' else None,
+                'guest_name': key[1] if key[0] == 'guest_name' else None,
+                'status': 'accepted'
+            })
+
+        if rows:
+            inserted = db.session.execute(
+                _insert_ignoring_conflicts().returning(
+                    TournamentParticipant.id, TournamentParticipant.user_id, TournamentParticipant.guest_name
+                ),
+                rows
+            ).all()
+            for row in inserted:
+                key = ('user_id', row.user_id) if row.user_id is not None else ('guest_name', row.guest_name)
+                pending.pop(key).update({'status': 'added', 'participant_id': row.id})
+        # Lignes écartées par ON CONFLICT : insérées entre-temps par une autre requête
+        for result in pending.values():
+            result['status'] = 'duplicate'
+        added = len(rows) - len(pending)
+        if added:
+            db.session.execute(
+                db.update(Tournament)
+                .where(Tournament.id == tournament_id)
+                .values(seats_taken=Tournament.seats_taken + added)
+                .execution_options(synchronize_session=False)
+            )
+        return results, added
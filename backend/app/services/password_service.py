@@ -0,0 +1,118 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+# Paramètres par défaut de werkzeug, pour comparer un format abrégé ('scrypt') aux hachages stockés
+DEFAULT_PARAMETERS = {
+    'pbkdf2': ['sha256', '600000'],
+    'scrypt': ['32768', '8', '1'],
+}
+
+
+def normalize_method(method):
+    name, *parameters = method.split(':')
+    defaults = DEFAULT_PARAMETERS.get(name)
+    if defaults is None or len(parameters) > len(defaults):
+        return method
+    if name == 'scrypt' and parameters:
+        # werkzeug exige les trois paramètres dès qu'un seul est donné
+        return method
+    return ':'.join([name] + parameters + defaults[len(parameters):])
+
+
+class PasswordHasherBusy(Exception):
+    """Trop de hachages en attente : la requête doit être refusée (503)."""
+
+
+class PasswordHasher:
+    """Hachage des mots de passe hors des threads de requête.
+
+    Le calcul (pbkdf2/scrypt, coûteux en CPU et détenteur du GIL) est
+    envoyé à un pool de processus borné ; le thread de requête ne fait
+    qu'attendre le résultat. L'algorithme et son coût viennent de
+    PASSWORD_HASH_METHOD (format werkzeug, ex. 'pbkdf2:sha256:600000' ou
+    'scrypt:32768:8:1') ; les hachages d'un autre format sont refaits à la
+    connexion suivante.
+    """
+
+    def __init__(self, app=None):
+        self.method = 'pbkdf2:sha256:600000'
+        self.workers = 0
+        self.max_pending = 64
+        self.timeout = 10
+        self._executor = None
+        self._executor_pid = None
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = normalize_method(app.config.get('PASSWORD_HASH_METHOD', self.method))
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', 0)
+        self.max_pending = app.config.get('PASSWORD_HASH_MAX_PENDING', 64)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        app.extensions['password_hasher'] = self
+
+    def _get_executor(self):
+        # Pool créé paresseusement dans chaque processus worker (après un éventuel fork)
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _run(self, function, *args):
+        if not self.workers:
+            return function(*args)
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PasswordHasherBusy()
+        try:
+            executor = self._get_executor()
+            future = executor.submit(function, *args)
+            try:
+                return future.result(timeout=self.timeout)
+            except FutureTimeoutError:
+                # File du pool trop longue : 503 plutôt qu'une 500, le calcul est abandonné s'il n'a pas commencé
+                future.cancel()
+                raise PasswordHasherBusy()
+            except BrokenProcessPool:
+                # Worker tué (OOM, signal) : pool recréé à l'appel suivant, celui-ci est fait sur place
+                self._discard(executor)
+                return function(*args)
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        method = password_hash.split('$', 1)[0]
+        return method != self.method
+
+    def _discard(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,178 @@
+"""Instrumentation SQL par requête HTTP : nombre de requêtes, temps en base, requêtes les plus lentes.
+
+Les événements ``before/after_cursor_execute`` du moteur alimentent les
+mesures de la requête HTTP en cours (``flask.g``) ; à la fin de la
+requête :
+
+- QUERY_METRICS_ENABLED : en-tête ``Server-Timing`` (``db`` et ``app``)
+  et cumul par endpoint exposé par GET /debug/queries ;
+- QUERY_BUDGETS ('off', 'warn' ou 'raise') : compare le nombre de
+  requêtes au budget déclaré par ``@query_budget(n)`` sur la vue ; 'raise'
+  lève QueryBudgetExceeded (réponse 500, exception propagée en test) pour
+  qu'un N+1 réintroduit fasse échouer la suite de benchmarks.
+"""
+import heapq
+import logging
+import threading
+import time
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+BUDGET_MODES = ('off', 'warn', 'raise')
+# Texte des requêtes conservé (les paramètres ne sont jamais enregistrés)
+STATEMENT_MAX_LENGTH = 500
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+def query_budget(max_queries):
+    """Déclare le nombre maximal de requêtes SQL d'une vue (sous @bp.route)."""
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+class RequestQueries:
+    """Mesures d'une requête HTTP."""
+
+    def __init__(self, slowest):
+        self.started = time.perf_counter()
+        self.count = 0
+        self.duration = 0.0
+        self.keep = slowest
+        self.slowest = []
+
+    def add(self, statement, duration):
+        self.count += 1
+        self.duration += duration
+        entry = (duration, self.count, statement)
+        if len(self.slowest) < self.keep:
+            heapq.heappush(self.slowest, entry)
+        elif duration > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+
+class EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.duration = 0.0
+        self.max_duration = 0.0
+        self.over_budget = 0
+        self.slowest = []
+
+
+class QueryMetrics:
+    def __init__(self, app=None):
+        self.enabled = False
+        self.budget_mode = 'warn'
+        self.slowest = 5
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from app import db
+
+        self.enabled = app.config.get('QUERY_METRICS_ENABLED', False)
+        self.budget_mode = app.config.get('QUERY_BUDGETS', 'warn')
+        if self.budget_mode not in BUDGET_MODES:
+            raise ValueError(f"QUERY_BUDGETS must be one of {', '.join(BUDGET_MODES)}")
+        self.slowest = app.config.get('QUERY_METRICS_SLOWEST', 5)
+        app.extensions['query_metrics'] = self
+        if not self.enabled and self.budget_mode == 'off':
+            return
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self._before_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_execute)
+        app.before_request(self._start)
+        # Enregistré avant les autres after_request : exécuté en dernier, toutes les requêtes comptées
+        app.after_request(self._finish)
+
+    def _start(self):
+        g.query_metrics = RequestQueries(self.slowest)
+
+    @staticmethod
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @staticmethod
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info['query_started'].pop()
+        if has_request_context() and 'query_metrics' in g:
+            g.query_metrics.add(statement[:STATEMENT_MAX_LENGTH], duration)
+
+    def _finish(self, response):
+        measures = g.pop('query_metrics', None)
+        if measures is None:
+            return response
+        view = current_app.view_functions.get(request.endpoint)
+        budget = getattr(view, 'query_budget', None)
+        over_budget = budget is not None and measures.count > budget
+        if self.enabled:
+            total = time.perf_counter() - measures.started
+            response.headers.add(
+                'Server-Timing',
+                f'db;dur={measures.duration * 1000:.2f};desc="{measures.count} queries", app;dur={total * 1000:.2f}'
+            )
+            response.headers['Timing-Allow-Origin'] = '*'
+            # Les lectures de /debug/queries ne se mesurent pas elles-mêmes
+            if request.blueprint != 'debug':
+                self._record(request.endpoint or 'unknown', measures, over_budget)
+        if over_budget and self.budget_mode != 'off':
+            message = f'{request.endpoint} ran {measures.count} queries (budget {budget})'
+            if self.budget_mode == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        return response
+
+    def _record(self, endpoint, measures, over_budget):
+        with self._lock:
+            stats = self._endpoints.setdefault(endpoint, EndpointStats())
+            stats.requests += 1
+            stats.queries += measures.count
+            stats.max_queries = max(stats.max_queries, measures.count)
+            stats.duration += measures.duration
+            stats.max_duration = max(stats.max_duration, measures.duration)
+            stats.over_budget += over_budget
+            stats.slowest = heapq.nlargest(self.slowest, stats.slowest + measures.slowest)
+
+    def stats(self):
+        """Cumul par endpoint depuis le démarrage (ou le dernier ``reset``), temps en base décroissant."""
+        with self._lock:
+            endpoints = sorted(self._endpoints.items(), key=lambda item: item[1].duration, reverse=True)
+            return {
+                'enabled': self.enabled,
+                'budget_mode': self.budget_mode,
+                'endpoints': [
+                    {
+                        'endpoint': endpoint,
+                        'requests': stats.requests,
+                        'queries': {'mean': round(stats.queries / stats.requests, 2), 'max': stats.max_queries},
+                        'db_ms': {'mean': round(stats.duration * 1000 / stats.requests, 3),
+                                  'max': round(stats.max_duration * 1000, 3),
+                                  'total': round(stats.duration * 1000, 3)},
+                        'budget': getattr(current_app.view_functions.get(endpoint), 'query_budget', None),
+                        'over_budget': stats.over_budget,
+                        'slowest': [{'ms': round(duration * 1000, 3), 'statement': statement}
+                                    for duration, _, statement in stats.slowest],
+                    } for endpoint, stats in endpoints
+                ],
+            }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+query_metrics = QueryMetrics()
@@ -0,0 +1,254 @@
+"""Classements Elo par type de jeu, mis à jour à chaque résultat.
+
+Chaque match terminé entre deux comptes modifie deux classements par
+joueur : celui du type de jeu du tournoi et le classement toutes
+disciplines (ALL_GAME_TYPES). Les invités ne sont pas classés.
+
+``replay`` recalcule tout l'historique quand la formule change, ou quand
+un tournoi déjà joué est supprimé ou change de type de jeu (le
+classement toutes disciplines dépend de tous les matchs) : une seule
+lecture des matchs, un calcul sur des listes d'indices en mémoire puis un
+INSERT groupé. Elo est séquentiel (chaque résultat dépend des classements
+produits par les précédents) : une version vectorisée devrait d'abord
+calculer, match par match, des vagues indépendantes, pour un coût mesuré
+supérieur à la boucle simple (voir benchmarks/bench_rating_replay.py).
+
+Le rang d'un classement se lit dans ``rating_bucket`` (comptes par point
+de rating et par groupe de RATING_BUCKET_GROUP points), tenu à jour avec
+les classements : il ne parcourt pas tous les mieux classés.
+"""
+import math
+from collections import Counter, defaultdict
+
+from flask import current_app
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import aliased
+
+from app import db
+from app.models.rating import ALL_GAME_TYPES, RATING_BUCKET_GROUP, PlayerRating, RatingBucket
+from app.models.tournament import Match, Tournament
+
+DEFAULT_INITIAL_RATING = 1500.0
+DEFAULT_K_FACTOR = 32.0
+
+
+def expected_score(rating, opponent_rating):
+    return 1.0 / (1.0 + 10 ** ((opponent_rating - rating) / 400.0))
+
+
+def match_score(match):
+    """Score du joueur 1 (1, 0.5 ou 0), None si le match ne compte pas au classement."""
+    if match.status != 'completed' or match.player1_id is None or match.player2_id is None:
+        return None
+    if match.player1_id == match.player2_id:
+        return None
+    if match.winner_id is None:
+        return 0.5
+    return 1.0 if match.winner_id == match.player1_id else 0.0
+
+
+def rating_buckets(rating):
+    """Tranches (niveau 0, niveau 1) de RatingBucket qui comptent ce rating."""
+    bucket = math.floor(rating)
+    return bucket, bucket // RATING_BUCKET_GROUP
+
+
+def replay_ratings(count, first, second, scores, initial, k_factor):
+    """Classements finaux de ``count`` indices après les matchs (first[i], second[i], scores[i]) dans l'ordre."""
+    ratings = [initial] * count
+    for a, b, score in zip(first, second, scores):
+        rating_a = ratings[a]
+        rating_b = ratings[b]
+        change = k_factor * (score - 1.0 / (1.0 + 10 ** ((rating_b - rating_a) / 400.0)))
+        ratings[a] = rating_a + change
+        ratings[b] = rating_b - change
+    return ratings
+
+
+class RatingService:
+    @staticmethod
+    def _settings():
+        return (float(current_app.config.get('RATING_INITIAL', DEFAULT_INITIAL_RATING)),
+                float(current_app.config.get('RATING_K_FACTOR', DEFAULT_K_FACTOR)))
+
+    @staticmethod
+    def _count(buckets, game_type, rating, delta):
+        bucket, group = rating_buckets(rating)
+        buckets[game_type, 0, bucket] += delta
+        buckets[game_type, 1, group] += delta
+
+    @staticmethod
+    def _shift_buckets(buckets):
+        """Ajoute les deltas {(game_type, niveau, tranche): delta} à rating_bucket en un seul upsert."""
+        changes = [{'game_type': game_type, 'level': level, 'bucket': bucket, 'count': delta}
+                   for (game_type, level, bucket), delta in buckets.items() if delta]
+        if not changes:
+            return
+        insert = postgresql.insert if db.engine.dialect.name == 'postgresql' else sqlite.insert
+        statement = insert(RatingBucket).values(changes)
+        db.session.execute(statement.on_conflict_do_update(
+            index_elements=[RatingBucket.game_type, RatingBucket.level, RatingBucket.bucket],
+            set_={'count': RatingBucket.count + statement.excluded.count},
+        ))
+
+    @staticmethod
+    def _apply(game_type, match, score, sign, initial, k_factor, buckets):
+        keys = [(match.player1_id, game_type), (match.player2_id, game_type),
+                (match.player1_id, ALL_GAME_TYPES), (match.player2_id, ALL_GAME_TYPES)]
+        ratings = {
+            (row.user_id, row.game_type): row.rating
+            for row in db.session.execute(
+                db.select(PlayerRating.user_id, PlayerRating.game_type, PlayerRating.rating)
+                .where(PlayerRating.user_id.in_([match.player1_id, match.player2_id]),
+                       PlayerRating.game_type.in_([game_type, ALL_GAME_TYPES]))
+            )
+        }
+        missing = [key for key in dict.fromkeys(keys) if key not in ratings]
+        if missing:
+            db.session.execute(db.insert(PlayerRating), [
+                {'user_id': user_id, 'game_type': rated_game_type, 'rating': initial, 'games': 0}
+                for user_id, rated_game_type in missing
+            ])
+            ratings.update({key: initial for key in missing})
+        deltas = {}
+        for first, second in (keys[:2], keys[2:]):
+            # Correction : retire l'écart que le résultat produirait aux classements actuels
+            change = sign * k_factor * (score - expected_score(ratings[first], ratings[second]))
+            deltas[first], deltas[second] = change, -change
+        for key, delta in deltas.items():
+            # Même addition que l'UPDATE : la tranche comptée est celle du rating écrit
+            if key not in missing:
+                RatingService._count(buckets, key[1], ratings[key], -1)
+            RatingService._count(buckets, key[1], ratings[key] + delta, 1)
+        # Les quatre classements en un seul UPDATE
+        key = db.tuple_(PlayerRating.user_id, PlayerRating.game_type)
+        db.session.execute(
+            db.update(PlayerRating)
+            .where(key.in_(list(deltas)))
+            .values(rating=PlayerRating.rating + db.case(*[(key == k, delta) for k, delta in deltas.items()]),
+                    games=PlayerRating.games + sign)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def record(tournament_id, completed=(), reopened=()):
+        """Met à jour les classements des joueurs des matchs ``completed`` (sans commit).
+
+        Les résultats ``reopened`` (corrigés ou annulés) sont retirés au
+        mieux : Elo n'étant pas réversible, seul ``replay`` redonne les
+        valeurs exactes après une correction.
+        """
+        rated = [(match, score, -1) for match in reopened if (score := match_score(match)) is not None]
+        rated += [(match, score, 1) for match in completed if (score := match_score(match)) is not None]
+        if not rated:
+            return 0
+        game_type = db.session.scalar(db.select(Tournament.game_type).where(Tournament.id == tournament_id))
+        initial, k_factor = RatingService._settings()
+        buckets = Counter()
+        for match, score, sign in rated:
+            RatingService._apply(game_type, match, score, sign, initial, k_factor, buckets)
+        RatingService._shift_buckets(buckets)
+        return len(rated)
+
+    @staticmethod
+    def has_rated_matches(tournament_id):
+        """Vrai si un match du tournoi compte aux classements : le supprimer ou changer son type de jeu impose un ``replay``."""
+        return db.session.scalar(db.select(db.exists().where(
+            Match.tournament_id == tournament_id, Match.status == 'completed',
+            Match.player1_id.isnot(None), Match.player2_id.isnot(None), Match.player1_id != Match.player2_id
+        )))
+
+    @staticmethod
+    def replay(commit=True):
+        """Recalcule tous les classements depuis l'historique des matchs terminés.
+
+        Les matchs sont rejoués par tournoi puis dans l'ordre de jeu : tour,
+        tableau principal avant tableau des perdants, grande finale en
+        dernier. Les classements et leurs comptes par tranche sont réécrits
+        en un DELETE et un INSERT chacun.
+        """
+        matches = db.session.execute(
+            db.select(Tournament.game_type, Match.status, Match.player1_id, Match.player2_id, Match.winner_id)
+            .join(Tournament, Tournament.id == Match.tournament_id)
+            .where(Match.status == 'completed', Match.player1_id.isnot(None), Match.player2_id.isnot(None))
+            .order_by(Match.tournament_id, db.case((Match.bracket_match_id == 'final-0', 1), else_=0),
+                      Match.round, db.case((Match.section == 'loser', 1), else_=0), Match.id)
+        ).all()
+        initial, k_factor = RatingService._settings()
+        index = {}
+        games = defaultdict(int)
+        first, second, scores = [], [], []
+        for match in matches:
+            score = match_score(match)
+            if score is None:
+                continue
+            for game_type in (match.game_type, ALL_GAME_TYPES):
+                a = index.setdefault((match.player1_id, game_type), len(index))
+                b = index.setdefault((match.player2_id, game_type), len(index))
+                first.append(a)
+                second.append(b)
+                scores.append(score)
+                games[a] += 1
+                games[b] += 1
+        ratings = replay_ratings(len(index), first, second, scores, initial, k_factor)
+
+        buckets = Counter()
+        for (_, game_type), i in index.items():
+            RatingService._count(buckets, game_type, ratings[i], 1)
+
+        db.session.execute(db.delete(PlayerRating))
+        db.session.execute(db.delete(RatingBucket))
+        if index:
+            db.session.execute(db.insert(PlayerRating), [
+                {'user_id': user_id, 'game_type': game_type, 'rating': ratings[i], 'games': games[i]}
+                for (user_id, game_type), i in index.items()
+            ])
+            db.session.execute(db.insert(RatingBucket), [
+                {'game_type': game_type, 'level': level, 'bucket': bucket, 'count': count}
+                for (game_type, level, bucket), count in buckets.items()
+            ])
+        if commit:
+            db.session.commit()
+        return len(index)
+
+    @staticmethod
+    def leaderboard(game_type=ALL_GAME_TYPES, limit=50, after=None):
+        """Meilleurs classements par (rating, user_id) décroissants, à partir du curseur ``after``."""
+        query = db.select(PlayerRating.user_id, PlayerRating.rating, PlayerRating.games) \
+            .where(PlayerRating.game_type == game_type)
+        if after is not None:
+            query = query.where(db.tuple_(PlayerRating.rating, PlayerRating.user_id) < tuple(after))
+        return db.session.execute(
+            query.order_by(PlayerRating.rating.desc(), PlayerRating.user_id.desc()).limit(limit)
+        ).all()
+
+    @staticmethod
+    def _rank(game_type, rating, bucket, group):
+        """1 + classements strictement supérieurs à ``rating`` (ex aequo partagés).
+
+        Somme des groupes au-dessus, puis des tranches d'un point au-dessus
+        dans le même groupe (au plus RATING_BUCKET_GROUP lignes lues par clé
+        primaire), puis comptage par l'index (game_type, rating) des seuls
+        classements du même point : O(log n) et non plus O(rang).
+        """
+        higher = aliased(PlayerRating)
+        groups = db.select(db.func.coalesce(db.func.sum(RatingBucket.count), 0)).where(
+            RatingBucket.game_type == game_type, RatingBucket.level == 1, RatingBucket.bucket > group)
+        buckets = db.select(db.func.coalesce(db.func.sum(RatingBucket.count), 0)).where(
+            RatingBucket.game_type == game_type, RatingBucket.level == 0, RatingBucket.bucket > bucket,
+            RatingBucket.bucket < (group + 1) * RATING_BUCKET_GROUP)
+        same = db.select(db.func.count()).select_from(higher).where(
+            higher.game_type == game_type, higher.rating > rating, higher.rating < bucket + 1)
+        return 1 + groups.scalar_subquery() + buckets.scalar_subquery() + same.scalar_subquery()
+
+    @staticmethod
+    def rank_expression():
+        """Rang de chaque ligne PlayerRating sélectionnée (sous-requêtes corrélées, même règle que ``rank_of``)."""
+        bucket = db.func.floor(PlayerRating.rating)
+        return RatingService._rank(PlayerRating.game_type, PlayerRating.rating,
+                                   bucket, db.func.floor(bucket / RATING_BUCKET_GROUP))
+
+    @staticmethod
+    def rank_of(game_type, rating):
+        """Rang d'un classement : 1 + nombre de classements strictement supérieurs (ex aequo partagés)."""
+        return db.session.scalar(db.select(RatingService._rank(game_type, rating, *rating_buckets(rating))))
@@ -0,0 +1,179 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from importlib import import_module
+
+from flask import Response, request
+
+# En-têtes conservés avec le corps mis en cache
+CACHED_HEADERS = ('Content-Type', 'ETag', 'Access-Control-Expose-Headers')
+# Compteurs de génération partagés par les tournois de même reste (mémoire bornée)
+GENERATION_SLOTS = 4096
+
+
+class MemoryLRUBackend:
+    """Cache en mémoire du processus, borné en nombre d'entrées, avec expiration."""
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class NullBackend:
+    """Désactive le cache (RESPONSE_CACHE_BACKEND='null')."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+    def clear(self):
+        pass
+
+    def __len__(self):
+        return 0
+
+
+BACKENDS = {
+    'memory': MemoryLRUBackend,
+    'null': NullBackend,
+}
+
+
+class ResponseCache:
+    """Cache des réponses JSON des endpoints de lecture d'un tournoi.
+
+    Les entrées sont indexées par (endpoint, tournoi) et supprimées
+    explicitement par les routes d'écriture via ``invalidate_tournament``,
+    qui incrémente aussi la génération du tournoi : une lecture commencée
+    avant l'écriture ne remet pas en cache son corps périmé. Le TTL ne sert
+    que de filet de sécurité (plusieurs workers, écritures
+    hors des routes). Le backend est choisi par RESPONSE_CACHE_BACKEND :
+    'memory', 'null' ou un chemin 'module:Classe'.
+    """
+
+    def __init__(self, app=None):
+        self.backend = MemoryLRUBackend()
+        self.ttl = 30
+        self.endpoints = []
+        self._stats_lock = threading.Lock()
+        self._generation_lock = threading.Lock()
+        self._generations = [0] * GENERATION_SLOTS
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+        if backend in BACKENDS:
+            backend_class = BACKENDS[backend]
+        else:
+            module_name, _, class_name = backend.partition(':')
+            backend_class = getattr(import_module(module_name), class_name)
+        if backend_class is MemoryLRUBackend:
+            self.backend = backend_class(app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 2048))
+        else:
+            self.backend = backend_class()
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', 30)
+        app.extensions['response_cache'] = self
+
+    @staticmethod
+    def key(endpoint, tournament_id):
+        return f'tournament:{tournament_id}:{endpoint}'
+
+    def cached_tournament_view(self, view):
+        """Décorateur pour une vue GET paramétrée par tournament_id."""
+        endpoint = view.__name__
+        self.endpoints.append(endpoint)
+
+        @wraps(view)
+        def wrapper(tournament_id, **kwargs):
+            key = self.key(endpoint, tournament_id)
+            entry = self.backend.get(key)
+            if entry is not None:
+                self._count('hits')
+                body, headers = entry
+                response = Response(body, status=200, headers=headers)
+                response.headers['X-Cache'] = 'HIT'
+                return response.make_conditional(request)
+
+            self._count('misses')
+            generation = self._generations[tournament_id % GENERATION_SLOTS]
+            response = view(tournament_id, **kwargs)
+            if not isinstance(response, Response):
+                return response
+            # Seules les réponses complètes sont mises en cache (pas les 304/404)
+            if response.status_code == 200 and not response.is_streamed:
+                headers = [(name, value) for name, value in response.headers.items() if name in CACHED_HEADERS]
+                with self._generation_lock:
+                    # Tournoi invalidé pendant la vue : corps peut-être antérieur à l'écriture
+                    if self._generations[tournament_id % GENERATION_SLOTS] == generation:
+                        self.backend.set(key, (response.get_data(), headers), self.ttl)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+
+        return wrapper
+
+    def invalidate_tournament(self, tournament_id):
+        with self._generation_lock:
+            self._generations[tournament_id % GENERATION_SLOTS] += 1
+            self.backend.delete(*[self.key(endpoint, tournament_id) for endpoint in self.endpoints])
+        self._count('invalidations')
+
+    def _count(self, name):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'entries': len(self.backend),
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+            'invalidations': self.invalidations,
+        }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,273 @@
+"""Calendriers de championnat (toutes rondes) et appariements suisses.
+
+Les matchs produits sont des lignes ``match`` (sans bracket JSON) : section
+'round_robin' ou 'swiss', ``participant1`` jouant les blancs / côté A.
+Un match sans second participant est un bye (exempt).
+"""
+from app import db
+from app.models.tournament import Match, TournamentParticipant
+from app.services.matching import max_weight_matching
+
+ROUND_ROBIN = 'round_robin'
+SWISS = 'swiss'
+FORMATS = (ROUND_ROBIN, SWISS)
+
+# Points d'une victoire, d'un nul et d'un bye au classement suisse
+WIN_POINTS = 1.0
+DRAW_POINTS = 0.5
+BYE_POINTS = 1.0
+# Voisins de classement candidats de chaque joueur (doublé si aucun appariement sans revanche)
+SWISS_PAIRING_WINDOW = 16
+
+
+class SchedulerError(ValueError):
+    pass
+
+
+def round_robin(entrants, legs=1):
+    """Rondes de la méthode du cercle : liste de rondes de paires (blancs, noirs), noirs None = exempt.
+
+    La première place reste fixe, les autres tournent d'une place à chaque
+    ronde ; les couleurs alternent pour rester équilibrées à une partie
+    près. En nombre impair, la place fixe est l'exemption. Avec ``legs=2``,
+    les matchs retour inversent les couleurs.
+    """
+    players = list(entrants)
+    if len(players) < 2:
+        raise SchedulerError('At least 2 participants are required')
+    if len(players) % 2:
+        players.insert(0, None)
+    count = len(players)
+    rounds = []
+    for number in range(count - 1):
+        pairs = []
+        for i in range(count // 2):
+            first, second = players[i], players[count - 1 - i]
+            # Alternance des couleurs par ronde pour le joueur fixe, par table pour les autres
+            if (i == 0 and number % 2) or (i > 0 and i % 2):
+                first, second = second, first
+            if first is None:
+                first, second = second, None
+            pairs.append((first, second))
+        rounds.append(pairs)
+        players = [players[0], players[-1]] + players[1:-1]
+    if legs == 2:
+        rounds += [[(black, white) if black is not None else (white, None) for white, black in pairs]
+                   for pairs in rounds]
+    return rounds
+
+
+class SwissPlayer:
+    __slots__ = ('id', 'score', 'rank', 'opponents', 'colour_balance', 'last_colours', 'had_bye')
+
+    def __init__(self, id, rank, score=0.0):
+        self.id = id
+        self.rank = rank
+        self.score = score
+        self.opponents = set()
+        # Blancs joués moins noirs joués, et les deux dernières couleurs ('W' / 'B')
+        self.colour_balance = 0
+        self.last_colours = ''
+        self.had_bye = False
+
+    def colour_preference(self):
+        """+1 veut les blancs, -1 veut les noirs, 0 indifférent ; +2 / -2 si obligatoire."""
+        if self.colour_balance <= -2 or self.last_colours == 'BB':
+            return 2
+        if self.colour_balance >= 2 or self.last_colours == 'WW':
+            return -2
+        if self.colour_balance:
+            return -1 if self.colour_balance > 0 else 1
+        if self.last_colours:
+            return 1 if self.last_colours[-1] == 'B' else -1
+        return 0
+
+
+def _colours(first, second):
+    """(blancs, noirs) selon les préférences, le mieux classé départageant."""
+    first_preference, second_preference = first.colour_preference(), second.colour_preference()
+    if first_preference != second_preference:
+        return (first, second) if first_preference > second_preference else (second, first)
+    return (first, second) if first.rank < second.rank else (second, first)
+
+
+def _colour_clash(first, second):
+    # Deux joueurs qui doivent absolument avoir la même couleur
+    first_preference, second_preference = first.colour_preference(), second.colour_preference()
+    return abs(first_preference) == 2 and first_preference == second_preference
+
+
+def swiss_pairings(players):
+    """Appariements d'une ronde suisse : liste de (blancs, noirs), noirs None = bye.
+
+    Les joueurs sont triés par score puis rang et appariés par un couplage
+    parfait de poids maximum (algorithme d'Edmonds). Le poids d'une paire
+    classe les critères dans l'ordre : pas de revanche, petit écart de
+    score, pas de conflit de couleur obligatoire, joueurs voisins au
+    classement (système Monrad). Les candidats de chaque joueur sont ses
+    SWISS_PAIRING_WINDOW voisins de classement ; la fenêtre double tant que
+    le couplage n'est pas complet et sans revanche, jusqu'au graphe entier.
+    Une revanche n'est donc jouée que si aucun appariement complet sans
+    revanche n'existe.
+    """
+    players = sorted(players, key=lambda player: (-player.score, player.rank))
+    pairs = []
+    if len(players) % 2:
+        # Bye au moins bien classé qui n'en a pas encore eu
+        candidates = [player for player in players if not player.had_bye] or players
+        bye = min(candidates, key=lambda player: (player.score, -player.rank))
+        players.remove(bye)
+        pairs.append((bye, None))
+    if not players:
+        return pairs
+
+    # Graphe restreint aux voisins de classement, élargi tant qu'il impose une revanche
+    window = SWISS_PAIRING_WINDOW
+    while True:
+        mate = max_weight_matching(_swiss_edges(players, window), maxcardinality=True)
+        matched = [(players[i], players[j]) for i, j in enumerate(mate) if i < j]
+        complete = len(matched) * 2 == len(players)
+        if window >= len(players) or (complete and all(second.id not in first.opponents
+                                                         for first, second in matched)):
+            break
+        window *= 2
+    if not complete:
+        raise SchedulerError('Unable to pair players')
+    return [_colours(first, second) for first, second in matched] + pairs
+
+
+def _swiss_edges(players, window):
+    # Critères du moins au plus important : (valeur, maximum). Chaque unité d'un
+    # critère vaut plus que la somme des critères inférieurs sur les n/2 paires.
+    count, boards = len(players), len(players) // 2
+    criteria = []
+    for i, first in enumerate(players):
+        for j in range(i + 1, min(i + window + 1, count)):
+            second = players[j]
+            criteria.append((i, j, round(2 * abs(first.score - second.score)) ** 2, (
+                (count - (j - i), count),
+                (not _colour_clash(first, second), 1),
+                (second.id not in first.opponents, 1),
+            )))
+    widest = max(gap for _, _, gap, _ in criteria)
+    criteria = [(i, j, (distance, clash, (widest - gap, widest), rematch))
+                for i, j, gap, (distance, clash, rematch) in criteria]
+    units, unit = [], 1
+    for level in range(4):
+        units.append(unit)
+        unit += boards * max(values[level][1] for _, _, values in criteria) * unit
+    return [(i, j, sum(value * units[level] for level, (value, _) in enumerate(values)))
+            for i, j, values in criteria]
+
+
+def _match_points(match, participant_id):
+    if match.status == 'bye':
+        return BYE_POINTS
+    if match.winner_participant_id is None:
+        return DRAW_POINTS
+    return WIN_POINTS if match.winner_participant_id == participant_id else 0.0
+
+
+class ScheduleService:
+    @staticmethod
+    def _accepted(tournament_id):
+        return db.session.execute(
+            db.select(TournamentParticipant.id, TournamentParticipant.user_id)
+            .where(TournamentParticipant.tournament_id == tournament_id,
+                   TournamentParticipant.status == 'accepted')
+            .order_by(TournamentParticipant.id)
+        ).all()
+
+    @staticmethod
+    def _rows(tournament_id, section, round_number, pairs, user_ids):
+        rows = []
+        for white, black in pairs:
+            rows.append({
+                'tournament_id': tournament_id,
+                'round': round_number,
+                'section': section,
+                'participant1_id': white,
+                'participant2_id': black,
+                'player1_id': user_ids.get(white),
+                'player2_id': user_ids.get(black),
+                'status': 'bye' if black is None else 'ready',
+                # Bye suisse : point attribué d'office ; en championnat, simple ronde de repos
+                'winner_participant_id': white if black is None and section == SWISS else None,
+                'winner_id': user_ids.get(white) if black is None and section == SWISS else None,
+            })
+        return rows
+
+    @staticmethod
+    def create_round_robin(tournament_id, legs=1):
+        """Insère toutes les rondes du championnat en un seul INSERT multi-lignes (sans commit)."""
+        if db.session.scalar(db.select(db.func.count(Match.id)).where(Match.tournament_id == tournament_id)):
+            raise SchedulerError('Matches have already been scheduled')
+        participants = ScheduleService._accepted(tournament_id)
+        user_ids = {row.id: row.user_id for row in participants}
+        rows = []
+        for number, pairs in enumerate(round_robin([row.id for row in participants], legs), start=1):
+            rows += ScheduleService._rows(tournament_id, ROUND_ROBIN, number, pairs, user_ids)
+        db.session.execute(db.insert(Match), rows)
+        return rows
+
+    @staticmethod
+    def create_swiss_round(tournament_id, max_rounds=None):
+        """Apparie la ronde suivante à partir des résultats enregistrés (sans commit)."""
+        participants = ScheduleService._accepted(tournament_id)
+        if len(participants) < 2:
+            raise SchedulerError('At least 2 participants are required')
+        matches = db.session.execute(
+            db.select(Match.round, Match.status, Match.participant1_id, Match.participant2_id,
+                      Match.winner_participant_id)
+            .where(Match.tournament_id == tournament_id, Match.section == SWISS)
+            .order_by(Match.round, Match.id)
+        ).all()
+        if any(match.status not in ('completed', 'bye') for match in matches):
+            raise SchedulerError('All matches of the current round must be completed')
+        current_round = max((match.round for match in matches), default=0)
+        if max_rounds is not None and current_round >= max_rounds:
+            raise SchedulerError(f'All {max_rounds} rounds have been played')
+
+        players = {row.id: SwissPlayer(row.id, rank) for rank, row in enumerate(participants)}
+        for match in matches:
+            white = players.get(match.participant1_id)
+            black = players.get(match.participant2_id)
+            if white is not None:
+                white.score += _match_points(match, white.id)
+            if black is None:
+                if white is not None and match.status == 'bye':
+                    white.had_bye = True
+                continue
+            black.score += _match_points(match, black.id)
+            if white is not None:
+                white.opponents.add(black.id)
+                black.opponents.add(white.id)
+                white.colour_balance += 1
+                white.last_colours = (white.last_colours + 'W')[-2:]
+                black.colour_balance -= 1
+                black.last_colours = (black.last_colours + 'B')[-2:]
+
+        pairs = [(white.id, black.id if black is not None else None)
+                 for white, black in swiss_pairings(list(players.values()))]
+        user_ids = {row.id: row.user_id for row in participants}
+        rows = ScheduleService._rows(tournament_id, SWISS, current_round + 1, pairs, user_ids)
+        db.session.execute(db.insert(Match), rows)
+        return rows
+
+    @staticmethod
+    def report_result(match, score1, score2):
+        """Enregistre le score d'un match de championnat ou suisse ; égalité = nul (sans commit)."""
+        if match.section not in FORMATS:
+            raise SchedulerError('Use the bracket endpoints for elimination matches')
+        if match.status == 'bye':
+            raise SchedulerError('Cannot report a result for a bye')
+        match.score1 = score1
+        match.score2 = score2
+        if score1 == score2:
+            match.winner_participant_id, match.winner_id = None, None
+        elif score1 > score2:
+            match.winner_participant_id, match.winner_id = match.participant1_id, match.player1_id
+        else:
+            match.winner_participant_id, match.winner_id = match.participant2_id, match.player2_id
+        match.status = 'completed'
+        return match
@@ -0,0 +1,104 @@
+"""Recherche de tournois et autocomplétion des comptes.
+
+PostgreSQL : les tournois sont cherchés dans la colonne générée
+``tournament.search_vector`` (tsvector pondéré nom, type de jeu,
+description) servie par l'index GIN ``ix_tournament_search_vector``,
+chaque mot étant pris comme préfixe ('ches' trouve 'chess') ; le score
+est ``ts_rank_cd``, calculé sur au plus SEARCH_RANK_CANDIDATES lignes
+trouvées pour qu'un mot très courant ne fasse pas classer tout le
+catalogue (au-delà, le classement ne porte que sur ces candidats). Les noms d'utilisateur sont filtrés par
+``lower(username) LIKE 'préfixe%'`` sur l'index trigramme
+``ix_user_username_trgm``. SQLite (développement) utilise LIKE avec un
+score par champ trouvé.
+
+Les pages suivent (score, id) décroissants : le curseur reprend
+strictement après la dernière ligne, sans OFFSET.
+"""
+import re
+
+from flask import current_app
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+from app import db
+from app.models.tournament import SEARCH_CONFIG, Tournament
+from app.models.user import User
+
+# Mots retenus dans une recherche (les suivants sont ignorés)
+MAX_TERMS = 8
+# Lignes trouvées classées au plus par recherche (PostgreSQL)
+DEFAULT_RANK_CANDIDATES = 5000
+# Échelle entière du score : comparaisons exactes dans le curseur
+SCORE_SCALE = 1000000
+# Poids par champ du score de repli (SQLite)
+LIKE_WEIGHTS = ((Tournament.name, 3), (Tournament.game_type, 2), (Tournament.description, 1))
+
+
+def terms(text):
+    """Mots de la recherche en minuscules (lettres, chiffres), sans doublons."""
+    return list(dict.fromkeys(re.findall(r'\w+', (text or '').lower())))[:MAX_TERMS]
+
+
+def _like_pattern(value, prefix_only=False):
+    escaped = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'{escaped}%' if prefix_only else f'%{escaped}%'
+
+
+class SearchService:
+    @staticmethod
+    def _scored_tournaments(words):
+        """Sous-requête (id, score entier) des tournois contenant tous les mots, selon le dialecte."""
+        if db.engine.dialect.name == 'postgresql':
+            # Mots issus de \w+ : aucun opérateur tsquery ne peut être injecté
+            query = db.func.to_tsquery(db.literal_column(f"'{SEARCH_CONFIG}'::regconfig"),
+                                       ' & '.join(f'{word}:*' for word in words))
+            vector = db.literal_column('tournament.search_vector', TSVECTOR)
+            limit = current_app.config.get('SEARCH_RANK_CANDIDATES', DEFAULT_RANK_CANDIDATES)
+            candidates = db.select(Tournament.id, vector.label('search_vector')) \
+                .where(vector.op('@@')(query)).limit(limit).subquery()
+            score = db.cast(db.func.ts_rank_cd(candidates.c.search_vector, query) * SCORE_SCALE, db.Integer)
+            return db.select(candidates.c.id, score.label('score')).subquery()
+        conditions = []
+        score = 0
+        for word in words:
+            pattern = _like_pattern(word)
+            found = [db.func.lower(db.func.coalesce(column, '')).like(pattern, escape='\\')
+                     for column, _ in LIKE_WEIGHTS]
+            conditions.append(db.or_(*found))
+            for condition, (_, weight) in zip(found, LIKE_WEIGHTS):
+                score = score + db.case((condition, weight), else_=0)
+        return db.select(Tournament.id, score.label('score')).where(*conditions).subquery()
+
+    @staticmethod
+    def tournaments(text, limit, after=None):
+        """Tournois correspondant à tous les mots, du plus pertinent au moins pertinent.
+
+        ``after`` : (score, id) de la dernière ligne de la page précédente.
+        """
+        words = terms(text)
+        if not words:
+            return []
+        scored = SearchService._scored_tournaments(words)
+        score = scored.c.score
+        query = db.select(
+            Tournament.id, Tournament.name, Tournament.description, Tournament.game_type, Tournament.format,
+            Tournament.status, Tournament.creator_id, score,
+        ).join(scored, scored.c.id == Tournament.id)
+        if after is not None:
+            query = query.where(db.tuple_(score, Tournament.id) < tuple(after))
+        return db.session.execute(query.order_by(score.desc(), Tournament.id.desc()).limit(limit)).all()
+
+    @staticmethod
+    def users(prefix, limit, after=None):
+        """Comptes dont le nom commence par ``prefix`` (sans casse), par nom puis id.
+
+        ``after`` : (nom en minuscules, id) de la dernière ligne de la page précédente.
+        """
+        prefix = (prefix or '').strip().lower()
+        if not prefix:
+            return []
+        username = db.func.lower(User.username).label('username_lower')
+        query = db.select(User.id, User.username, username) \
+            .where(db.func.lower(User.username).like(_like_pattern(prefix, prefix_only=True), escape='\\'))
+        if after is not None:
+            query = query.where(db.tuple_(db.func.lower(User.username), User.id) > tuple(after))
+        return db.session.execute(query.order_by(db.func.lower(User.username), User.id).limit(limit)).all()
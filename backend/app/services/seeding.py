@@ -0,0 +1,111 @@
+"""Têtes de série et placement des participants dans un bracket.
+
+Le classement se fait par classement (rating) décroissant, puis par
+résultats antérieurs, puis par ordre d'inscription. Le placement suit
+l'ordre standard de ``seed_order`` : 1 contre N au premier tour, les têtes
+de série réparties en serpentin entre les moitiés du tableau (1 et 2 ne se
+rencontrent qu'en finale, 1 à 4 qu'en demi-finale...) et les byes donnés
+aux mieux classés.
+
+Pour éloigner les joueurs d'un même club, les participants d'une même
+bande de têtes de série (3-4, 5-8, 9-16...) peuvent échanger leurs places :
+ces places sont équivalentes pour l'équité du tableau, et chacun prend
+celle où il rencontrerait le plus tard un coéquipier déjà placé.
+"""
+from app.services.bracket_engine import bracket_size, seed_order
+
+# Places examinées au plus pour un participant avec club, dans sa bande
+CLUB_SCAN_LIMIT = 32
+
+
+def rank(entrants, ratings=None, results=None):
+    """Trie les participants par rating décroissant, puis résultats antérieurs, puis ordre reçu.
+
+    ``ratings`` et ``results`` sont des listes alignées sur ``entrants``
+    (None pour une valeur inconnue, classée après les valeurs connues).
+    """
+    def key(index):
+        rating = ratings[index] if ratings else None
+        result = results[index] if results else None
+        return (rating is None, -(rating or 0), result is None, -(result or 0), index)
+
+    return [entrants[index] for index in sorted(range(len(entrants)), key=key)]
+
+
+def _bands(count):
+    """Bandes de têtes de série interchangeables : [1], [2], [3, 4], [5..8]... limitées à ``count``."""
+    start = 1
+    size = 1
+    while start <= count:
+        yield range(start, min(start + size, count + 1))
+        start += size
+        if start > 2:
+            size *= 2
+
+
+def _first_shared_level(levels, position, depth):
+    """Plus petit niveau où ``position`` partage un sous-tableau avec un coéquipier (depth si aucun).
+
+    La présence est monotone (un sous-tableau contient ceux des niveaux
+    inférieurs) : recherche dichotomique sur les niveaux.
+    """
+    low, high = 1, depth
+    while low < high:
+        middle = (low + high) // 2
+        if position >> middle in levels[middle]:
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def placement(entrants, clubs=None):
+    """Emplacements du premier tour (taille puissance de deux, None = bye) pour des participants déjà classés.
+
+    ``clubs`` est une liste alignée sur ``entrants`` (None = sans club).
+    """
+    count = len(entrants)
+    size = bracket_size(count)
+    position_of_seed = [0] * (size + 1)
+    for position, seed in enumerate(seed_order(size)):
+        position_of_seed[seed] = position
+    slots = [None] * size
+
+    if not clubs or not any(clubs):
+        for seed in range(1, count + 1):
+            slots[position_of_seed[seed]] = entrants[seed - 1]
+        return slots
+
+    depth = size.bit_length() - 1
+    # regions[club][niveau] : sous-tableaux de 2**niveau places contenant déjà un joueur du club
+    regions = {}
+    for band in _bands(count):
+        free = [position_of_seed[seed] for seed in band]
+        for seed in band:
+            club = clubs[seed - 1]
+            levels = regions.get(club) if club is not None else None
+            if levels is None:
+                position = free.pop(0)
+            else:
+                # Au mieux, avec k coéquipiers placés, la rencontre a lieu au tour depth - log2(k)
+                ideal = depth - (len(levels[0]).bit_length() - 1)
+                best_index, best_meeting = 0, -1
+                for index, candidate in enumerate(free[:CLUB_SCAN_LIMIT]):
+                    meeting = _first_shared_level(levels, candidate, depth)
+                    if meeting > best_meeting:
+                        best_index, best_meeting = index, meeting
+                        if meeting >= ideal:
+                            break
+                position = free.pop(best_index)
+            slots[position] = entrants[seed - 1]
+            if club is not None:
+                if levels is None:
+                    levels = regions[club] = [set() for _ in range(depth)]
+                for level in range(depth):
+                    levels[level].add(position >> level)
+    return slots
+
+
+def first_meeting_round(position_a, position_b):
+    """Tour où se rencontreraient les occupants de deux emplacements s'ils gagnent tous leurs matchs."""
+    return (position_a ^ position_b).bit_length()
@@ -0,0 +1,329 @@
+"""Classements de tournoi tenus à jour résultat par résultat.
+
+Chaque résultat ajoute (ou retire, s'il est corrigé) sa contribution aux
+lignes ``standing`` par des UPDATE ... SET col = col + delta : points,
+bilan, scores, et départages des adversaires déjà rencontrés (Buchholz =
+somme des points des adversaires, Sonneborn-Berger = points des
+adversaires battus plus moitié de ceux des nuls). Le coût d'un résultat
+ne dépend que du nombre de matchs joués par les deux participants, pas de
+la taille du tournoi ; ``rebuild`` recalcule tout depuis la table match.
+"""
+from collections import Counter, defaultdict, namedtuple
+
+from app import db
+from app.models.standing import Standing
+from app.models.tournament import Match, TournamentParticipant
+from app.models.user import User
+from app.services.bracket_engine import FORMATS as ELIMINATION_FORMATS
+from app.services.scheduler import BYE_POINTS, DRAW_POINTS, SWISS, WIN_POINTS
+
+MATCH_FIELDS = ('id', 'section', 'status', 'round', 'bracket_match_id', 'score1', 'score2',
+                'participant1_id', 'participant2_id', 'winner_participant_id',
+                'player1_id', 'player2_id', 'winner_id')
+# Copie figée d'un match avant correction de son résultat
+MatchResult = namedtuple('MatchResult', MATCH_FIELDS)
+
+RESULT_POINTS = {'win': WIN_POINTS, 'draw': DRAW_POINTS, 'loss': 0.0}
+# Part des points d'un adversaire comptée au Sonneborn-Berger
+SB_FACTORS = {'win': 1.0, 'draw': 0.5, 'loss': 0.0}
+COUNTERS = ('played', 'wins', 'draws', 'losses', 'points', 'score_for', 'score_against',
+            'buchholz', 'sonneborn_berger')
+# Au-delà, une synchronisation de bracket recalcule le classement d'un bloc
+REBUILD_THRESHOLD = 32
+
+
+def _outcome(match, participant_id):
+    if match.winner_participant_id is None:
+        return 'draw'
+    return 'win' if match.winner_participant_id == participant_id else 'loss'
+
+
+def _scored(match):
+    # Bye suisse : point d'office ; les byes de championnat et de bracket ne comptent pas
+    if match.status == 'bye':
+        return match.section == SWISS and match.winner_participant_id is not None
+    return match.status == 'completed' and match.participant1_id is not None and match.participant2_id is not None
+
+
+def _elimination(match):
+    """(participant éliminé, étape) pour un match d'élimination terminé, sinon None.
+
+    L'étape ordonne les sorties : tour du tableau principal en simple
+    élimination, tour du tableau des perdants en double (les perdants du
+    tableau principal y sont repêchés), la finale venant après le dernier.
+    """
+    if match.section not in ('main', 'loser') or match.status != 'completed':
+        return None
+    winner = match.winner_participant_id
+    if winner is None:
+        return None
+    loser = match.participant2_id if winner == match.participant1_id else match.participant1_id
+    if loser is None:
+        return None
+    bracket_match_id = match.bracket_match_id or ''
+    if match.section == 'loser':
+        return loser, match.round
+    if bracket_match_id.startswith('wb-'):
+        return None
+    if bracket_match_id == 'final-0':
+        return loser, 2 * (match.round - 1) - 1
+    return loser, match.round
+
+
+def _select_matches():
+    return db.select(*[getattr(Match, field) for field in MATCH_FIELDS])
+
+
+class StandingsService:
+    @staticmethod
+    def snapshot(match):
+        return MatchResult(*[getattr(match, field) for field in MATCH_FIELDS])
+
+    @staticmethod
+    def _ensure(tournament_id, participant_ids):
+        existing = set(db.session.scalars(
+            db.select(Standing.participant_id)
+            .where(Standing.tournament_id == tournament_id, Standing.participant_id.in_(participant_ids))
+        ))
+        missing = [participant_id for participant_id in dict.fromkeys(participant_ids) if participant_id not in existing]
+        if missing:
+            db.session.execute(db.insert(Standing), [
+                {'tournament_id': tournament_id, 'participant_id': participant_id} for participant_id in missing
+            ])
+
+    @staticmethod
+    def _increment(tournament_id, weights, **deltas):
+        """Ajoute ``delta * poids`` à chaque colonne, un UPDATE par poids distinct (revanches comprises)."""
+        by_weight = defaultdict(list)
+        for participant_id, weight in weights.items():
+            by_weight[weight].append(participant_id)
+        for weight, participant_ids in by_weight.items():
+            values = {column: getattr(Standing, column) + delta * weight
+                      for column, delta in deltas.items() if delta}
+            if values and weight:
+                db.session.execute(
+                    db.update(Standing)
+                    .where(Standing.tournament_id == tournament_id, Standing.participant_id.in_(participant_ids))
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+
+    @staticmethod
+    def _opponents(tournament_id, participant_ids, excluded):
+        """{participant: [(adversaire, résultat de l'adversaire)]} des matchs terminés déjà comptés."""
+        rows = db.session.execute(
+            db.select(Match.participant1_id, Match.participant2_id, Match.winner_participant_id)
+            .where(Match.tournament_id == tournament_id, Match.status == 'completed', Match.id.notin_(excluded),
+                   db.or_(Match.participant1_id.in_(participant_ids), Match.participant2_id.in_(participant_ids)))
+        ).all()
+        opponents = {participant_id: [] for participant_id in participant_ids}
+        for row in rows:
+            for player, opponent in ((row.participant1_id, row.participant2_id),
+                                     (row.participant2_id, row.participant1_id)):
+                if player in opponents and opponent is not None:
+                    opponents[player].append((opponent, _outcome(row, opponent)))
+        return opponents
+
+    @staticmethod
+    def _propagate(tournament_id, delta, opponents):
+        # Les points d'un joueur entrent dans le Buchholz de tous ses adversaires
+        # et dans le Sonneborn-Berger de ceux qui l'ont battu (moitié pour un nul)
+        if not delta:
+            return
+        StandingsService._increment(tournament_id, Counter(opponent for opponent, _ in opponents), buchholz=delta)
+        sonneborn = Counter()
+        for opponent, outcome in opponents:
+            sonneborn[opponent] += SB_FACTORS[outcome]
+        StandingsService._increment(tournament_id, sonneborn, sonneborn_berger=delta)
+
+    @staticmethod
+    def _link(tournament_id, match, sign):
+        # Chacun des deux joueurs compte les points actuels de l'autre dans ses départages
+        first, second = match.participant1_id, match.participant2_id
+        points = dict(db.session.execute(
+            db.select(Standing.participant_id, Standing.points)
+            .where(Standing.tournament_id == tournament_id, Standing.participant_id.in_([first, second]))
+        ).all())
+        for player, opponent in ((first, second), (second, first)):
+            StandingsService._increment(
+                tournament_id, {player: sign},
+                buchholz=points[opponent],
+                sonneborn_berger=points[opponent] * SB_FACTORS[_outcome(match, player)],
+            )
+
+    @staticmethod
+    def _apply(tournament_id, match, sign, pending=()):
+        """Ajoute (sign=1) ou retire (sign=-1) la contribution d'un match au classement.
+
+        ``pending`` : ids des matchs ignorés comme adversaires passés (déjà
+        écrits comme terminés mais pas encore comptés, ou rouverts et déjà
+        déliés). Un match retiré doit avoir été délié par ``record``.
+        """
+        if _scored(match):
+            players = [match.participant1_id] if match.status == 'bye' else [match.participant1_id, match.participant2_id]
+            StandingsService._ensure(tournament_id, players)
+            opponents = StandingsService._opponents(tournament_id, players, {match.id, *pending})
+            if match.status == 'bye':
+                delta = sign * BYE_POINTS
+                StandingsService._increment(tournament_id, {players[0]: 1}, points=delta)
+                StandingsService._propagate(tournament_id, delta, opponents[players[0]])
+            else:
+                scores = {match.participant1_id: (match.score1 or 0, match.score2 or 0),
+                          match.participant2_id: (match.score2 or 0, match.score1 or 0)}
+                for player in players:
+                    outcome = _outcome(match, player)
+                    delta = sign * RESULT_POINTS[outcome]
+                    StandingsService._increment(
+                        tournament_id, {player: sign},
+                        played=1,
+                        wins=int(outcome == 'win'),
+                        draws=int(outcome == 'draw'),
+                        losses=int(outcome == 'loss'),
+                        points=RESULT_POINTS[outcome],
+                        score_for=scores[player][0],
+                        score_against=scores[player][1],
+                    )
+                    StandingsService._propagate(tournament_id, delta, opponents[player])
+                if sign > 0:
+                    StandingsService._link(tournament_id, match, 1)
+
+        elimination = _elimination(match)
+        if elimination is not None:
+            loser, stage = elimination
+            StandingsService._ensure(tournament_id, [loser])
+            db.session.execute(
+                db.update(Standing)
+                .where(Standing.tournament_id == tournament_id, Standing.participant_id == loser)
+                # Bracket incohérent (perdant encore placé plus loin) : l'étape la plus tardive l'emporte
+                .values(eliminated_stage=db.case((Standing.eliminated_stage > stage, Standing.eliminated_stage),
+                                                 else_=stage) if sign > 0 else None)
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def record(tournament_id, completed=(), reopened=()):
+        """Retire les anciens résultats ``reopened`` puis ajoute les matchs ``completed`` (sans commit)."""
+        pending = {match.id for match in completed}
+        # Tous les matchs rouverts sont déliés avant de toucher aux points : deux matchs
+        # rouverts d'un même joueur ne se propagent plus l'un à l'autre des points déjà retirés
+        for match in reopened:
+            if _scored(match) and match.status != 'bye':
+                StandingsService._link(tournament_id, match, -1)
+        unlinked = pending | {match.id for match in reopened}
+        for match in reopened:
+            StandingsService._apply(tournament_id, match, -1, unlinked)
+        for match in completed:
+            pending.discard(match.id)
+            StandingsService._apply(tournament_id, match, 1, pending)
+
+    @staticmethod
+    def record_sync(tournament_id, changes):
+        """Applique les SyncChanges d'une synchronisation de bracket (sans commit).
+
+        Retourne (lignes des matchs terminés, anciennes lignes rouvertes)
+        pour les autres compteurs tenus au fil des résultats.
+        """
+        completed = []
+        if changes.completed:
+            completed = db.session.execute(
+                _select_matches()
+                .where(Match.tournament_id == tournament_id, Match.bracket_match_id.in_(changes.completed))
+                .order_by(Match.id)
+            ).all()
+        if len(completed) + len(changes.reopened) > REBUILD_THRESHOLD:
+            StandingsService.rebuild(tournament_id, commit=False)
+        else:
+            StandingsService.record(tournament_id, completed, changes.reopened)
+        return completed, changes.reopened
+
+    @staticmethod
+    def rebuild(tournament_id, commit=True):
+        """Recalcule le classement d'un tournoi depuis tous ses matchs, en mémoire puis en un INSERT."""
+        matches = db.session.execute(
+            _select_matches()
+            .where(Match.tournament_id == tournament_id, Match.status.in_(('completed', 'bye')))
+            .order_by(Match.id)
+        ).all()
+        totals = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+        eliminated = {}
+        games = []
+        for match in matches:
+            elimination = _elimination(match)
+            if elimination is not None:
+                eliminated[elimination[0]] = max(elimination[1], eliminated.get(elimination[0], 0))
+                totals[elimination[0]]
+            if not _scored(match):
+                continue
+            if match.status == 'bye':
+                totals[match.participant1_id]['points'] += BYE_POINTS
+                continue
+            scores = ((match.participant1_id, match.score1 or 0, match.score2 or 0),
+                      (match.participant2_id, match.score2 or 0, match.score1 or 0))
+            for player, scored, conceded in scores:
+                outcome = _outcome(match, player)
+                row = totals[player]
+                row['played'] += 1
+                row[{'win': 'wins', 'draw': 'draws', 'loss': 'losses'}[outcome]] += 1
+                row['points'] += RESULT_POINTS[outcome]
+                row['score_for'] += scored
+                row['score_against'] += conceded
+                opponent = match.participant2_id if player == match.participant1_id else match.participant1_id
+                games.append((player, opponent, outcome))
+        for player, opponent, outcome in games:
+            points = totals[opponent]['points']
+            totals[player]['buchholz'] += points
+            totals[player]['sonneborn_berger'] += points * SB_FACTORS[outcome]
+
+        db.session.execute(db.delete(Standing).where(Standing.tournament_id == tournament_id))
+        if totals:
+            db.session.execute(db.insert(Standing), [
+                dict(row, tournament_id=tournament_id, participant_id=participant_id,
+                     eliminated_stage=eliminated.get(participant_id))
+                for participant_id, row in totals.items()
+            ])
+        if commit:
+            db.session.commit()
+        return len(totals)
+
+    @staticmethod
+    def table(tournament_id, format):
+        """Classement trié des participants acceptés, avec places partagées en cas d'égalité parfaite."""
+        rows = db.session.execute(
+            db.select(TournamentParticipant.id.label('participant_id'), TournamentParticipant.user_id,
+                      db.func.coalesce(User.username, TournamentParticipant.guest_name).label('name'),
+                      *[getattr(Standing, column) for column in COUNTERS], Standing.eliminated_stage)
+            .outerjoin(User, User.id == TournamentParticipant.user_id)
+            .outerjoin(Standing, db.and_(Standing.tournament_id == TournamentParticipant.tournament_id,
+                                         Standing.participant_id == TournamentParticipant.id))
+            .where(TournamentParticipant.tournament_id == tournament_id, TournamentParticipant.status == 'accepted')
+            .order_by(TournamentParticipant.id)
+        ).all()
+        entries = []
+        for row in rows:
+            entry = row._asdict()
+            for column in COUNTERS:
+                entry[column] = entry[column] or 0
+            entries.append(entry)
+
+        if format == SWISS:
+            def key(entry):
+                return (-entry['points'], -entry['buchholz'], -entry['sonneborn_berger'], -entry['wins'])
+        elif format in ELIMINATION_FORMATS:
+            # Encore en lice d'abord, puis par étape de sortie la plus tardive
+            def key(entry):
+                stage = entry['eliminated_stage']
+                return (stage is not None, -(stage or 0))
+        else:
+            def key(entry):
+                return (-entry['points'], -entry['sonneborn_berger'], -entry['wins'],
+                        -(entry['score_for'] - entry['score_against']))
+
+        entries.sort(key=key)
+        previous = None
+        for index, entry in enumerate(entries):
+            current = key(entry)
+            if current != previous:
+                place = index + 1
+                previous = current
+            entry['rank'] = place
+        return entries
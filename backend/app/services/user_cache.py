@@ -0,0 +1,86 @@
+from collections import namedtuple
+
+from flask import current_app, jsonify
+
+from app import db
+from app.models.user import User
+from app.services.response_cache import MemoryLRUBackend
+
+# Données publiques d'un compte, immuables donc partageables entre requêtes
+UserSummary = namedtuple('UserSummary', ['id', 'username', 'email'])
+
+
+class UserSummaryCache:
+    """Résumés d'utilisateurs (id, username, email) gardés quelques secondes en mémoire.
+
+    Sert de ``user_lookup_loader`` à flask-jwt-extended : l'identité du
+    jeton est résolue une seule fois par requête (``current_user``) et, tant
+    que l'entrée est fraîche, sans requête SQL. ``get_many`` charge les
+    absents en un seul IN pour sérialiser une liste de participants.
+    """
+
+    def __init__(self, app=None):
+        self.backend = MemoryLRUBackend()
+        self.ttl = 60
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.backend = MemoryLRUBackend(app.config.get('USER_CACHE_MAX_ENTRIES', 10000))
+        self.ttl = app.config.get('USER_CACHE_TTL', 60)
+        app.extensions['user_cache'] = self
+
+        jwt = app.extensions['flask-jwt-extended']
+        jwt.user_lookup_loader(self._lookup_identity)
+        jwt.user_lookup_error_loader(self._lookup_error)
+
+    @staticmethod
+    def key(user_id):
+        return f'user:{user_id}'
+
+    def get(self, user_id):
+        return self.get_many([user_id]).get(user_id)
+
+    def get_many(self, user_ids):
+        """Dictionnaire {id: UserSummary} ; les ids inconnus sont absents du résultat."""
+        summaries = {}
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            if user_id is None:
+                continue
+            summary = self.backend.get(self.key(user_id))
+            if summary is None:
+                missing.append(user_id)
+            else:
+                summaries[user_id] = summary
+        if missing:
+            rows = db.session.execute(
+                db.select(User.id, User.username, User.email).where(User.id.in_(missing))
+            ).all()
+            for row in rows:
+                summary = UserSummary(*row)
+                self.backend.set(self.key(summary.id), summary, self.ttl)
+                summaries[summary.id] = summary
+        return summaries
+
+    def put(self, user):
+        summary = UserSummary(user.id, user.username, user.email)
+        self.backend.set(self.key(user.id), summary, self.ttl)
+        return summary
+
+    def invalidate(self, *user_ids):
+        self.backend.delete(*[self.key(user_id) for user_id in user_ids])
+
+    def _lookup_identity(self, jwt_header, jwt_data):
+        try:
+            user_id = int(jwt_data[current_app.config.get('JWT_IDENTITY_CLAIM', 'sub')])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return self.get(user_id)
+
+    @staticmethod
+    def _lookup_error(jwt_header, jwt_data):
+        return jsonify({'message': 'User not found'}), 401
+
+
+user_cache = UserSummaryCache()
@@ -0,0 +1,257 @@
+"""Bilans par compte (tournois, victoires, podiums, matchs) tenus à jour au fil des résultats.
+
+Une ligne ``user_stats`` par compte et type de jeu, plus la ligne toutes
+disciplines (ALL_GAME_TYPES) : lire le bilan d'un joueur ne parcourt ni
+ses inscriptions ni ses matchs. Les matchs sont comptés quand leur
+résultat est enregistré, les tournois quand ils passent à 'completed'
+(la place finale de chaque participant est alors figée dans
+``tournament_participant.final_rank``).
+"""
+from collections import defaultdict
+
+from app import db
+from app.models.rating import ALL_GAME_TYPES
+from app.models.tournament import Match, Tournament, TournamentParticipant
+from app.models.user_stats import UserStats
+from app.services.rating_service import match_score
+from app.services.standings_service import StandingsService
+
+COMPLETED_STATUS = 'completed'
+PODIUM_RANK = 3
+COUNTERS = ('tournaments_played', 'tournaments_won', 'podiums', 'matches_played', 'wins', 'draws', 'losses')
+MATCH_COLUMNS = {1.0: 'wins', 0.5: 'draws', 0.0: 'losses'}
+
+
+class UserStatsService:
+    @staticmethod
+    def _increment(game_type, deltas, overall=True):
+        """Applique {user_id: {colonne: delta}} aux lignes du type de jeu et toutes disciplines.
+
+        ``overall=False`` : seulement les lignes du type de jeu.
+
+        Un UPDATE par combinaison distincte de deltas (en général deux :
+        vainqueur et perdant), après création des lignes manquantes.
+        """
+        user_ids = [user_id for user_id, values in deltas.items() if any(values.values())]
+        if not user_ids:
+            return
+        game_types = [game_type, ALL_GAME_TYPES] if overall else [game_type]
+        existing = set(db.session.execute(
+            db.select(UserStats.user_id, UserStats.game_type)
+            .where(UserStats.user_id.in_(user_ids), UserStats.game_type.in_(game_types))
+        ).all())
+        missing = [(user_id, rated) for user_id in user_ids for rated in game_types if (user_id, rated) not in existing]
+        if missing:
+            db.session.execute(db.insert(UserStats), [
+                {'user_id': user_id, 'game_type': rated, **dict.fromkeys(COUNTERS, 0)} for user_id, rated in missing
+            ])
+        groups = defaultdict(list)
+        for user_id in user_ids:
+            groups[tuple(sorted((column, delta) for column, delta in deltas[user_id].items() if delta))].append(user_id)
+        for values, group in groups.items():
+            db.session.execute(
+                db.update(UserStats)
+                .where(UserStats.user_id.in_(group), UserStats.game_type.in_(game_types))
+                .values({column: getattr(UserStats, column) + delta for column, delta in values})
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def record_matches(tournament_id, completed=(), reopened=()):
+        """Compte les matchs ``completed`` et décompte les anciens résultats ``reopened`` (sans commit)."""
+        deltas = defaultdict(lambda: defaultdict(int))
+        for matches, sign in ((reopened, -1), (completed, 1)):
+            for match in matches:
+                score = match_score(match)
+                if score is None:
+                    continue
+                for user_id, user_score in ((match.player1_id, score), (match.player2_id, 1.0 - score)):
+                    deltas[user_id]['matches_played'] += sign
+                    deltas[user_id][MATCH_COLUMNS[user_score]] += sign
+        if deltas:
+            game_type = db.session.scalar(db.select(Tournament.game_type).where(Tournament.id == tournament_id))
+            UserStatsService._increment(game_type, deltas)
+
+    @staticmethod
+    def _placement_deltas(ranks, sign):
+        return {
+            user_id: {
+                'tournaments_played': sign,
+                'tournaments_won': sign if rank == 1 else 0,
+                'podiums': sign if rank <= PODIUM_RANK else 0,
+            } for user_id, rank in ranks.items()
+        }
+
+    @staticmethod
+    def _final_ranks(tournament):
+        """{participant_id: place} des participants acceptés, depuis le classement du tournoi."""
+        return {entry['participant_id']: entry['rank'] for entry in StandingsService.table(tournament.id, tournament.format)}
+
+    @staticmethod
+    def _store_final_ranks(tournament):
+        ranks = UserStatsService._final_ranks(tournament)
+        if ranks:
+            db.session.execute(
+                db.update(TournamentParticipant)
+                .where(TournamentParticipant.tournament_id == tournament.id,
+                       TournamentParticipant.id.in_(list(ranks)))
+                .values(final_rank=db.case(*[(TournamentParticipant.id == key, rank) for key, rank in ranks.items()]))
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def _ranked_users(tournament_id):
+        """{user_id: place finale} des comptes classés d'un tournoi terminé."""
+        return dict(db.session.execute(
+            db.select(TournamentParticipant.user_id, TournamentParticipant.final_rank)
+            .where(TournamentParticipant.tournament_id == tournament_id,
+                   TournamentParticipant.user_id.isnot(None), TournamentParticipant.final_rank.isnot(None))
+        ).all())
+
+    @staticmethod
+    def _tournament_deltas(tournament_id, sign):
+        """Contribution complète d'un tournoi : matchs terminés et places finales figées."""
+        deltas = defaultdict(lambda: defaultdict(int))
+        for user_id, values in UserStatsService._placement_deltas(UserStatsService._ranked_users(tournament_id),
+                                                                  sign).items():
+            for column, delta in values.items():
+                deltas[user_id][column] += delta
+        matches = db.session.execute(
+            db.select(Match.status, Match.player1_id, Match.player2_id, Match.winner_id)
+            .where(Match.tournament_id == tournament_id, Match.status == 'completed')
+        ).all()
+        for match in matches:
+            score = match_score(match)
+            if score is None:
+                continue
+            for user_id, user_score in ((match.player1_id, score), (match.player2_id, 1.0 - score)):
+                deltas[user_id]['matches_played'] += sign
+                deltas[user_id][MATCH_COLUMNS[user_score]] += sign
+        return deltas
+
+    @staticmethod
+    def remove_tournament(tournament):
+        """Retire toute la contribution d'un tournoi des bilans, avant sa suppression (sans commit)."""
+        UserStatsService._increment(tournament.game_type, UserStatsService._tournament_deltas(tournament.id, -1))
+
+    @staticmethod
+    def change_game_type(tournament, game_type):
+        """Reporte la contribution d'un tournoi de son type de jeu actuel vers ``game_type`` (sans commit)."""
+        if game_type == tournament.game_type:
+            return
+        deltas = UserStatsService._tournament_deltas(tournament.id, 1)
+        # La ligne toutes disciplines ne change pas
+        UserStatsService._increment(game_type, deltas, overall=False)
+        UserStatsService._increment(tournament.game_type, {
+            user_id: {column: -delta for column, delta in values.items()} for user_id, values in deltas.items()
+        }, overall=False)
+
+    @staticmethod
+    def complete_tournament(tournament):
+        """Fige les places finales et compte le tournoi dans le bilan de chaque compte (sans commit)."""
+        UserStatsService._store_final_ranks(tournament)
+        users = UserStatsService._ranked_users(tournament.id)
+        UserStatsService._increment(tournament.game_type, UserStatsService._placement_deltas(users, 1))
+
+    @staticmethod
+    def reopen_tournament(tournament):
+        """Retire un tournoi repassé d'un statut 'completed' à un autre des bilans (sans commit)."""
+        users = UserStatsService._ranked_users(tournament.id)
+        UserStatsService._increment(tournament.game_type, UserStatsService._placement_deltas(users, -1))
+        db.session.execute(
+            db.update(TournamentParticipant)
+            .where(TournamentParticipant.tournament_id == tournament.id)
+            .values(final_rank=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def rebuild(echo=None):
+        """Recalcule tous les bilans par agrégats SQL (GROUP BY) puis un INSERT groupé.
+
+        Les tournois terminés sans places finales (antérieurs à ce suivi)
+        reçoivent d'abord les leurs depuis leur classement.
+        """
+        unranked = db.session.scalars(
+            db.select(Tournament)
+            .where(Tournament.status == COMPLETED_STATUS,
+                   Tournament.id.in_(
+                       db.select(TournamentParticipant.tournament_id)
+                       .where(TournamentParticipant.status == 'accepted', TournamentParticipant.final_rank.is_(None))
+                   ))
+        ).all()
+        for tournament in unranked:
+            UserStatsService._store_final_ranks(tournament)
+        if echo and unranked:
+            echo(f'{len(unranked)} completed tournaments ranked')
+
+        totals = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+        def add(user_id, game_type, **values):
+            for rated in (game_type, ALL_GAME_TYPES):
+                row = totals[(user_id, rated)]
+                for column, value in values.items():
+                    row[column] += value
+
+        placements = db.session.execute(
+            db.select(TournamentParticipant.user_id, Tournament.game_type,
+                      db.func.count().label('played'),
+                      db.func.sum(db.case((TournamentParticipant.final_rank == 1, 1), else_=0)).label('won'),
+                      db.func.sum(db.case((TournamentParticipant.final_rank <= PODIUM_RANK, 1), else_=0)).label('podiums'))
+            .join(Tournament, Tournament.id == TournamentParticipant.tournament_id)
+            .where(Tournament.status == COMPLETED_STATUS, TournamentParticipant.user_id.isnot(None),
+                   TournamentParticipant.final_rank.isnot(None))
+            .group_by(TournamentParticipant.user_id, Tournament.game_type)
+        ).all()
+        for row in placements:
+            add(row.user_id, row.game_type, tournaments_played=row.played, tournaments_won=row.won, podiums=row.podiums)
+
+        # Un passage par côté du match, agrégé par joueur, type de jeu et résultat
+        rated = db.and_(Match.status == 'completed', Match.player1_id.isnot(None), Match.player2_id.isnot(None),
+                        Match.player1_id != Match.player2_id)
+        for player, opponent in ((Match.player1_id, Match.player2_id), (Match.player2_id, Match.player1_id)):
+            outcome = db.case((Match.winner_id.is_(None), 'draws'), (Match.winner_id == player, 'wins'),
+                              else_='losses')
+            rows = db.session.execute(
+                db.select(player.label('user_id'), Tournament.game_type, outcome.label('outcome'),
+                          db.func.count().label('total'))
+                .join(Tournament, Tournament.id == Match.tournament_id)
+                .where(rated)
+                .group_by(player, Tournament.game_type, outcome)
+            ).all()
+            for row in rows:
+                add(row.user_id, row.game_type, matches_played=row.total, **{row.outcome: row.total})
+
+        db.session.execute(db.delete(UserStats))
+        if totals:
+            db.session.execute(db.insert(UserStats), [
+                dict(values, user_id=user_id, game_type=game_type) for (user_id, game_type), values in totals.items()
+            ])
+        db.session.commit()
+        return len({user_id for user_id, _ in totals})
+
+    @staticmethod
+    def stats(user_id):
+        """Bilan toutes disciplines et détail par type de jeu (taux de victoire sur les matchs joués)."""
+        rows = db.session.execute(
+            db.select(UserStats.game_type, *[getattr(UserStats, column) for column in COUNTERS])
+            .where(UserStats.user_id == user_id)
+            .order_by(UserStats.game_type)
+        ).all()
+
+        def serialize(values):
+            values = dict(values)
+            played = values['matches_played']
+            values['win_rate'] = round(values['wins'] / played, 4) if played else None
+            return values
+
+        empty = dict.fromkeys(COUNTERS, 0)
+        totals = next((row for row in rows if row.game_type == ALL_GAME_TYPES), None)
+        return {
+            'user_id': user_id,
+            **serialize({column: getattr(totals, column) for column in COUNTERS} if totals else empty),
+            'game_types': [
+                {'game_type': row.game_type, **serialize({column: getattr(row, column) for column in COUNTERS})}
+                for row in rows if row.game_type != ALL_GAME_TYPES
+            ],
+        }
@@ -0,0 +1,90 @@
+"""Test de charge des inscriptions concurrentes sur un tournoi à capacité limitée.
+
+Chaque thread inscrit un utilisateur distinct (et une partie d'entre eux
+envoie deux fois la même demande) via POST /tournaments/<id>/join. Le
+script échoue si une réponse est une 500, si le tournoi dépasse
+max_participants ou si le compteur de places diverge des inscriptions.
+
+Usage : python -m benchmarks.bench_concurrent_joins [utilisateurs] [places] [threads] [--waitlist]
+Par défaut sur une base SQLite fichier temporaire (BENCH_DATABASE_URL pour PostgreSQL).
+"""
+import os
+import sys
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+if 'BENCH_DATABASE_URL' not in os.environ:
+    # Plusieurs threads doivent voir la même base : fichier plutôt que mémoire
+    os.environ['BENCH_DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db') + '?timeout=30'
+
+from benchmarks.common import make_app, timer
+
+
+def seed(db, n_users, seats, waitlist):
+    from app.models.tournament import Tournament, TournamentParticipant
+    from app.models.user import User
+
+    db.session.execute(db.delete(TournamentParticipant))
+    db.session.execute(db.delete(Tournament))
+    db.session.execute(db.delete(User))
+    db.session.execute(db.insert(User), [
+        {'id': i, 'username': f'user {i}', 'email': f'user{i}@example.com', 'password_hash': 'x'}
+        for i in range(1, n_users + 1)
+    ])
+    db.session.execute(db.insert(Tournament), [
+        {'id': 1, 'name': 'Open', 'description': '', 'game_type': 'chess', 'format': 'single_elimination',
+         'status': 'pending', 'creator_id': 1, 'max_participants': seats, 'waitlist': waitlist}
+    ])
+    db.session.commit()
+
+
+def main(n_users=200, seats=64, threads=32, waitlist=False):
+    from flask_jwt_extended import create_access_token
+    from app import db
+    from app.models.tournament import Tournament, TournamentParticipant
+
+    app = make_app()
+    with app.app_context():
+        seed(db, n_users, seats, waitlist)
+        tokens = [create_access_token(identity=str(i)) for i in range(1, n_users + 1)]
+    # Un utilisateur sur quatre envoie sa demande deux fois
+    requests = tokens + tokens[::4]
+
+    def join(token):
+        client = app.test_client()
+        return client.post('/tournaments/1/join', headers={'Authorization': f'Bearer {token}'}).status_code
+
+    with timer() as elapsed:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            statuses = Counter(executor.map(join, requests))
+
+    with app.app_context():
+        counts = dict(db.session.execute(
+            db.select(TournamentParticipant.status, db.func.count())
+            .where(TournamentParticipant.tournament_id == 1)
+            .group_by(TournamentParticipant.status)
+        ).all())
+        seats_taken = db.session.scalar(db.select(Tournament.seats_taken).where(Tournament.id == 1))
+
+    print(f"{len(requests)} requests, {threads} threads, {elapsed['elapsed']:.2f}s "
+          f"({len(requests) / elapsed['elapsed']:.0f} req/s)")
+    print('responses:', dict(sorted(statuses.items())))
+    print('participants:', counts, 'seats_taken:', seats_taken)
+
+    held = counts.get('pending', 0) + counts.get('accepted', 0)
+    errors = []
+    if statuses.get(500):
+        errors.append(f'{statuses[500]} server errors')
+    if held > seats:
+        errors.append(f'{held} seats held for {seats} places')
+    if held != seats_taken:
+        errors.append(f'seat counter {seats_taken} != {held} registrations')
+    if errors:
+        sys.exit('FAILED: ' + ', '.join(errors))
+    print('OK')
+
+
+if __name__ == '__main__':
+    arguments = [argument for argument in sys.argv[1:] if not argument.startswith('--')]
+    main(*[int(argument) for argument in arguments], waitlist='--waitlist' in sys.argv)
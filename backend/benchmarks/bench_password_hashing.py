@@ -0,0 +1,47 @@
+"""Débit du hachage des mots de passe selon le coût et le mode d'exécution.
+
+Mesure, pour chaque format werkzeug, le nombre de vérifications par seconde
+sur un cœur (mode inline) puis avec le pool de processus de PasswordHasher
+sollicité par autant de threads que de workers.
+
+Usage : python -m benchmarks.bench_password_hashing [méthodes...]
+"""
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import timer
+
+DEFAULT_METHODS = ['pbkdf2:sha256:260000', 'pbkdf2:sha256:600000', 'scrypt:16384:8:1', 'scrypt:32768:8:1']
+
+
+def measure(hasher, password_hash, iterations, threads):
+    with timer() as elapsed:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            results = list(executor.map(
+                lambda _: hasher.verify(password_hash, 'correct horse'), range(iterations)
+            ))
+    assert all(results)
+    return iterations / elapsed['elapsed']
+
+
+def main(methods, iterations=20):
+    from app.services.password_service import PasswordHasher
+
+    workers = min(os.cpu_count() or 1, 4)
+    print(f"{'method':<24} {'ms/hash':>8} {'logins/s/core':>14} {'pool':>5} {'logins/s':>9}")
+    for method in methods:
+        hasher = PasswordHasher()
+        hasher.method = method
+        password_hash = hasher.hash('correct horse')
+        inline = measure(hasher, password_hash, iterations, threads=1)
+
+        hasher.workers = workers
+        hasher.verify(password_hash, 'correct horse')  # démarrage du pool hors mesure
+        pooled = measure(hasher, password_hash, iterations * workers, threads=workers)
+        hasher.shutdown()
+        print(f'{method:<24} {1000 / inline:>8.1f} {inline:>14.1f} {workers:>5} {pooled:>9.1f}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:] or DEFAULT_METHODS)
@@ -0,0 +1,119 @@
+"""Classements Elo : mise à jour match par match contre rejeu complet de l'historique.
+
+Insère des tournois de championnat déjà joués, applique chaque résultat
+avec RatingService.record (comme les routes) puis rejoue tout avec
+RatingService.replay ; les deux doivent donner les mêmes classements,
+et après chacun les comptes de rating_bucket et les rangs doivent
+correspondre aux classements, sinon le script sort en erreur.
+
+Usage : python -m benchmarks.bench_rating_replay [joueurs] [tournois] [inscrits par tournoi]
+"""
+import random
+import sys
+
+from benchmarks.common import QueryCounter, make_app, timer
+
+
+def seed(db, players, tournaments, size):
+    from app.models.tournament import Match, Tournament
+    from app.models.user import User
+
+    generator = random.Random(42)
+    strength = [generator.gauss(0, 1) for _ in range(players + 1)]
+    db.session.execute(db.insert(User), [
+        {'id': i, 'username': f'user {i}', 'email': f'user{i}@example.com', 'password_hash': 'x'}
+        for i in range(1, players + 1)
+    ])
+    db.session.execute(db.insert(Tournament), [
+        {'id': t, 'name': f'Bench {t}', 'description': '', 'game_type': ('chess', 'go')[t % 2],
+         'format': 'round_robin', 'status': 'completed', 'creator_id': 1}
+        for t in range(1, tournaments + 1)
+    ])
+    rows = []
+    for t in range(1, tournaments + 1):
+        entrants = generator.sample(range(1, players + 1), size)
+        for round_number in range(1, size):
+            for i in range(size // 2):
+                a, b = entrants[i], entrants[size - 1 - i]
+                difference = strength[a] - strength[b] + generator.gauss(0, 1)
+                winner = a if difference > 0.3 else b if difference < -0.3 else None
+                rows.append({'tournament_id': t, 'round': round_number, 'section': 'round_robin',
+                             'player1_id': a, 'player2_id': b, 'winner_id': winner, 'status': 'completed'})
+            entrants = [entrants[0], entrants[-1]] + entrants[1:-1]
+    db.session.execute(db.insert(Match), rows)
+    db.session.commit()
+    return len(rows)
+
+
+def snapshot(db):
+    from app.models.rating import PlayerRating
+
+    return {(row.user_id, row.game_type): (row.rating, row.games)
+            for row in db.session.execute(db.select(PlayerRating.user_id, PlayerRating.game_type,
+                                                    PlayerRating.rating, PlayerRating.games))}
+
+
+def check_ranks(db, ratings, mode):
+    from collections import Counter
+
+    from app.models.rating import PlayerRating, RatingBucket
+    from app.services.rating_service import RatingService, rating_buckets
+
+    expected = Counter()
+    for (_, game_type), (rating, _) in ratings.items():
+        bucket, group = rating_buckets(rating)
+        expected[game_type, 0, bucket] += 1
+        expected[game_type, 1, group] += 1
+    stored = {(row.game_type, row.level, row.bucket): row.count
+              for row in db.session.execute(db.select(RatingBucket)).scalars() if row.count}
+    if stored != dict(expected):
+        sys.exit(f'{mode}: rating_bucket differs from the ratings')
+    by_game_type = {}
+    for (_, game_type), (rating, _) in ratings.items():
+        by_game_type.setdefault(game_type, []).append(rating)
+    ranks = {(row.user_id, row.game_type): row.rank for row in db.session.execute(
+        db.select(PlayerRating.user_id, PlayerRating.game_type, RatingService.rank_expression().label('rank')))}
+    for (user_id, game_type), (rating, _) in ratings.items():
+        rank = 1 + sum(1 for other in by_game_type[game_type] if other > rating)
+        if ranks[user_id, game_type] != rank or RatingService.rank_of(game_type, rating) != rank:
+            sys.exit(f'{mode}: wrong rank for user {user_id} in {game_type} (expected {rank})')
+
+
+def main(players=500, tournaments=200, size=16):
+    from app import db
+    from app.models.tournament import Match
+    from app.services.rating_service import RatingService
+
+    app = make_app()
+    with app.app_context():
+        count = seed(db, players, tournaments, size)
+        matches = db.session.execute(
+            db.select(Match.id, Match.tournament_id, Match.status, Match.player1_id, Match.player2_id,
+                      Match.winner_id)
+            .order_by(Match.tournament_id, Match.round, Match.id)
+        ).all()
+
+        with QueryCounter(db.engine) as queries, timer() as incremental:
+            for match in matches:
+                RatingService.record(match.tournament_id, [match])
+            db.session.commit()
+        recorded = snapshot(db)
+        check_ranks(db, recorded, 'incremental')
+        with timer() as replay:
+            RatingService.replay()
+        replayed = snapshot(db)
+        check_ranks(db, replayed, 'replay')
+
+    print(f'{count} matches, {players} players, {tournaments} tournaments of {size}')
+    print(f"{'mode':<12} {'ms':>10} {'ms/match':>9} {'queries/match':>14}")
+    print(f"{'incremental':<12} {incremental['elapsed'] * 1000:>10.1f} "
+          f"{incremental['elapsed'] * 1000 / count:>9.3f} {queries.count / count:>14.1f}")
+    print(f"{'replay':<12} {replay['elapsed'] * 1000:>10.1f} {replay['elapsed'] * 1000 / count:>9.3f}")
+    drift = max(abs(recorded[key][0] - replayed[key][0]) for key in replayed)
+    if recorded.keys() != replayed.keys() or any(recorded[key][1] != replayed[key][1] for key in replayed) \
+            or drift > 1e-6:
+        sys.exit(f'replay differs from incremental ratings (max drift {drift})')
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
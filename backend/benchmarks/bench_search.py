@@ -0,0 +1,106 @@
+"""Latence de GET /search/tournaments et /search/users sur une base remplie de noms générés.
+
+Cible : p95 sous SEARCH_TARGET_MS avec PostgreSQL (index GIN et trigramme),
+par exemple pour un million de tournois :
+
+    BENCH_DATABASE_URL=postgresql://... python -m benchmarks.bench_search 1000000
+
+Le script sort en erreur si la cible n'est pas tenue sur PostgreSQL ; avec
+SQLite (repli LIKE, sans index) les mesures sont seulement affichées.
+
+Usage : python -m benchmarks.bench_search [tournois] [comptes] [requêtes]
+"""
+import random
+import sys
+
+from benchmarks.common import make_app, percentile, timer
+
+SEARCH_TARGET_MS = 20
+SEED_BATCH = 10000
+CITIES = ['paris', 'lyon', 'lille', 'nantes', 'berlin', 'madrid', 'london', 'roma', 'tokyo', 'montreal',
+          'dakar', 'oslo', 'lisboa', 'praha', 'seoul', 'austin', 'quebec', 'geneve', 'torino', 'bruxelles']
+EVENTS = ['open', 'cup', 'masters', 'league', 'invitational', 'championship', 'classic', 'series', 'trophy', 'grand prix']
+GAMES = ['chess', 'go', 'checkers', 'poker', 'tennis', 'football', 'smash', 'valorant', 'rocket league', 'scrabble']
+WORDS = ['weekly', 'blitz', 'rapid', 'junior', 'senior', 'amateur', 'pro', 'online', 'summer', 'winter',
+         'spring', 'autumn', 'charity', 'student', 'club', 'regional', 'national', 'friendly', 'night', 'marathon']
+
+
+def seed(db, n_tournaments, n_users):
+    from app.models.tournament import Tournament
+    from app.models.user import User
+
+    generator = random.Random(42)
+    for start in range(0, n_users, SEED_BATCH):
+        db.session.execute(db.insert(User), [
+            {'id': i, 'username': f'{generator.choice(CITIES)}{generator.choice(WORDS)}{i}',
+             'email': f'user{i}@example.com', 'password_hash': 'x'}
+            for i in range(start + 1, min(start + SEED_BATCH, n_users) + 1)
+        ])
+    for start in range(0, n_tournaments, SEED_BATCH):
+        rows = []
+        for i in range(start + 1, min(start + SEED_BATCH, n_tournaments) + 1):
+            game = generator.choice(GAMES)
+            rows.append({
+                'id': i,
+                'name': f'{generator.choice(CITIES).title()} {game.title()} {generator.choice(EVENTS).title()} {i}',
+                'description': ' '.join(generator.sample(WORDS, 4)),
+                'game_type': game,
+                'format': 'single_elimination',
+                'status': 'pending',
+                'creator_id': generator.randint(1, n_users),
+            })
+        db.session.execute(db.insert(Tournament), rows)
+        db.session.commit()
+    if db.engine.dialect.name == 'postgresql':
+        db.session.execute(db.text('ANALYZE tournament'))
+        db.session.execute(db.text('ANALYZE "user"'))
+        db.session.commit()
+
+
+def main(n_tournaments=100000, n_users=10000, n_queries=200):
+    from app import db
+    from flask_jwt_extended import create_access_token
+
+    app = make_app()
+    app.config['RESPONSE_CACHE_BACKEND'] = 'null'
+    client = app.test_client()
+    generator = random.Random(7)
+    with app.app_context():
+        with timer() as seeding:
+            seed(db, n_tournaments, n_users)
+        headers = {'Authorization': f"Bearer {create_access_token(identity='1')}"}
+        dialect = db.engine.dialect.name
+    print(f'{n_tournaments} tournaments, {n_users} users seeded in {seeding["elapsed"]:.1f}s ({dialect})')
+
+    queries = {
+        'tournaments, 1 word': lambda: f'/search/tournaments?q={generator.choice(CITIES + GAMES + EVENTS)}',
+        'tournaments, prefix': lambda: f'/search/tournaments?q={generator.choice(CITIES + WORDS)[:4]}',
+        'tournaments, 3 words': lambda: '/search/tournaments?q=' + '+'.join(
+            [generator.choice(CITIES), generator.choice(GAMES).split()[0], generator.choice(EVENTS).split()[0]]),
+        'users, prefix': lambda: f'/search/users?q={generator.choice(CITIES)[:3]}',
+    }
+    print(f"{'query':<22} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    failures = []
+    for name, make_url in queries.items():
+        timings = []
+        for _ in range(n_queries):
+            url = make_url()
+            with timer() as elapsed:
+                response = client.get(url, headers=headers)
+            assert response.status_code == 200, response.get_json()
+            timings.append(elapsed['elapsed'] * 1000)
+            # Deuxième page : même coût grâce au curseur
+            if response.headers.get('X-Next-Cursor'):
+                with timer() as elapsed:
+                    client.get(f"{url}&cursor={response.headers['X-Next-Cursor']}", headers=headers)
+                timings.append(elapsed['elapsed'] * 1000)
+        p95 = percentile(timings, 0.95)
+        print(f'{name:<22} {percentile(timings, 0.5):>8.1f} {p95:>8.1f} {max(timings):>8.1f}')
+        if p95 > SEARCH_TARGET_MS:
+            failures.append(name)
+    if failures and dialect == 'postgresql':
+        sys.exit(f"p95 above {SEARCH_TARGET_MS} ms: {', '.join(failures)}")
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
@@ -0,0 +1,61 @@
+"""Temps de classement et de placement des têtes de série, avec et sans séparation des clubs.
+
+Affiche aussi le nombre de coéquipiers qui se rencontreraient au premier et
+au deuxième tour, avec le placement standard puis avec la séparation.
+
+Usage : python -m benchmarks.bench_seeding [participants] [clubs] [répétitions]
+"""
+import random
+import sys
+
+from benchmarks.common import timer
+
+
+def club_clashes(slots, clubs_by_team, rounds):
+    from app.services.seeding import first_meeting_round
+
+    by_club = {}
+    for position, team in enumerate(slots):
+        if team is not None and clubs_by_team[team] is not None:
+            by_club.setdefault(clubs_by_team[team], []).append(position)
+    clashes = 0
+    for positions in by_club.values():
+        for i, a in enumerate(positions):
+            for b in positions[i + 1:]:
+                if first_meeting_round(a, b) <= rounds:
+                    clashes += 1
+    return clashes
+
+
+def main(count=4096, n_clubs=256, repeat=20):
+    from app.services.seeding import placement, rank
+
+    generator = random.Random(42)
+    teams = [f'p{i}' for i in range(count)]
+    ratings = [generator.gauss(1500, 300) if i % 10 else None for i in range(count)]
+    clubs = [f'club {generator.randrange(n_clubs)}' if i % 3 else None for i in range(count)]
+    clubs_by_team = dict(zip(teams, clubs))
+
+    def best_of(function):
+        best = None
+        for _ in range(repeat):
+            with timer() as elapsed:
+                result = function()
+            best = elapsed['elapsed'] if best is None else min(best, elapsed['elapsed'])
+        return result, best * 1000
+
+    ranked, rank_ms = best_of(lambda: rank(teams, ratings))
+    ranked_clubs = [clubs_by_team[team] for team in ranked]
+    standard, standard_ms = best_of(lambda: placement(ranked))
+    separated, separated_ms = best_of(lambda: placement(ranked, ranked_clubs))
+
+    print(f'{count} entrants, {n_clubs} clubs (best of {repeat})')
+    print(f"{'step':<22} {'ms':>8} {'R1 clashes':>11} {'R1-2 clashes':>13}")
+    print(f"{'rank':<22} {rank_ms:>8.2f}")
+    for name, slots, ms in (('placement', standard, standard_ms), ('placement + clubs', separated, separated_ms)):
+        print(f'{name:<22} {ms:>8.2f} {club_clashes(slots, clubs_by_team, 1):>11} '
+              f'{club_clashes(slots, clubs_by_team, 2):>13}')
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
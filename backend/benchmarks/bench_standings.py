@@ -0,0 +1,109 @@
+"""Classements de tournoi : mise à jour résultat par résultat contre recalcul complet.
+
+Joue des rondes suisses appariées au hasard en appliquant chaque résultat
+avec StandingsService.record (comme les routes), puis des corrections qui
+rouvrent ou modifient d'un coup plusieurs matchs d'un même joueur ; le
+classement tenu au fil des résultats doit être identique à celui de
+StandingsService.rebuild, sinon le script sort en erreur.
+
+Usage : python -m benchmarks.bench_standings [participants] [rondes] [corrections]
+"""
+import random
+import sys
+
+from benchmarks.common import QueryCounter, make_app, timer
+
+COLUMNS = ('played', 'wins', 'draws', 'losses', 'points', 'score_for', 'score_against',
+           'buchholz', 'sonneborn_berger')
+
+
+def seed(db, size, rounds):
+    from app.models.tournament import Match, Tournament, TournamentParticipant
+    from app.models.user import User
+
+    generator = random.Random(42)
+    db.session.execute(db.insert(User), [
+        {'id': i, 'username': f'user {i}', 'email': f'user{i}@example.com', 'password_hash': 'x'}
+        for i in range(1, size + 1)
+    ])
+    db.session.execute(db.insert(Tournament), [
+        {'id': 1, 'name': 'Bench', 'description': '', 'game_type': 'chess', 'format': 'swiss',
+         'status': 'in_progress', 'creator_id': 1}
+    ])
+    db.session.execute(db.insert(TournamentParticipant), [
+        {'id': i, 'tournament_id': 1, 'user_id': i, 'status': 'accepted'} for i in range(1, size + 1)
+    ])
+    rows = []
+    for round_number in range(1, rounds + 1):
+        entrants = list(range(1, size + 1))
+        generator.shuffle(entrants)
+        for a, b in zip(entrants[::2], entrants[1::2]):
+            rows.append({'tournament_id': 1, 'round': round_number, 'section': 'swiss', 'status': 'ready',
+                         'participant1_id': a, 'participant2_id': b, 'player1_id': a, 'player2_id': b})
+    db.session.execute(db.insert(Match), rows)
+    db.session.commit()
+    return db.session.scalars(db.select(Match).order_by(Match.round, Match.id)).all()
+
+
+def play(match, generator):
+    match.status = 'completed'
+    match.score1, match.score2 = generator.randint(0, 3), generator.randint(0, 3)
+    match.winner_participant_id = (match.participant1_id if match.score1 > match.score2
+                                   else match.participant2_id if match.score2 > match.score1 else None)
+
+
+def snapshot(db):
+    from app.models.standing import Standing
+
+    return {row.participant_id: tuple(row[1:])
+            for row in db.session.execute(db.select(Standing.participant_id,
+                                                    *[getattr(Standing, column) for column in COLUMNS]))}
+
+
+def main(size=64, rounds=7, corrections=200):
+    from app import db
+    from app.services.standings_service import StandingsService
+
+    app = make_app()
+    generator = random.Random(7)
+    with app.app_context():
+        matches = seed(db, size, rounds)
+
+        with QueryCounter(db.engine) as queries, timer() as incremental:
+            for match in matches:
+                play(match, generator)
+                db.session.flush()
+                StandingsService.record(1, [match])
+            # Corrections groupées : plusieurs matchs d'un même participant rouverts ou rejoués ensemble
+            for _ in range(corrections):
+                player = generator.randint(1, size)
+                own = [match for match in matches if player in (match.participant1_id, match.participant2_id)]
+                group = generator.sample(own, min(len(own), generator.randint(2, 3)))
+                previous = [StandingsService.snapshot(match) for match in group if match.status == 'completed']
+                for match in group:
+                    if generator.random() < 0.5:
+                        match.status, match.score1, match.score2, match.winner_participant_id = 'ready', None, None, None
+                    else:
+                        play(match, generator)
+                db.session.flush()
+                StandingsService.record(1, [match for match in group if match.status == 'completed'], previous)
+            db.session.commit()
+        recorded = snapshot(db)
+        with timer() as rebuild:
+            StandingsService.rebuild(1)
+        rebuilt = snapshot(db)
+
+    count = len(matches) + corrections
+    print(f'{size} participants, {rounds} rounds, {corrections} grouped corrections')
+    print(f"{'mode':<12} {'ms':>10} {'queries/result':>15}")
+    print(f"{'incremental':<12} {incremental['elapsed'] * 1000:>10.1f} {queries.count / count:>15.1f}")
+    print(f"{'rebuild':<12} {rebuild['elapsed'] * 1000:>10.1f}")
+    differing = [participant for participant in rebuilt.keys() | recorded.keys()
+                 if any(abs(a - b) > 1e-9 for a, b in zip(recorded.get(participant, (0,) * len(COLUMNS)),
+                                                          rebuilt.get(participant, (0,) * len(COLUMNS))))]
+    if differing:
+        sys.exit(f'rebuild differs from incremental standings for {len(differing)} participants')
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
@@ -0,0 +1,114 @@
+"""Appariements suisses : durée par ronde et revanches évitables.
+
+Joue de nombreuses rondes suisses aux résultats aléatoires avec
+swiss_pairings. Une ronde qui contient une revanche alors qu'un
+appariement complet sans revanche existait (couplage de cardinalité
+maximale sur le graphe des adversaires pas encore rencontrés) fait sortir
+le script en erreur. Le couplage lui-même est d'abord comparé à une
+recherche exhaustive sur de petits graphes aléatoires.
+
+Usage : python -m benchmarks.bench_swiss_pairing [joueurs] [rondes] [tirages]
+"""
+import random
+import sys
+
+from benchmarks.common import timer
+
+
+def exhaustive(count, weights):
+    # (cardinalité, poids) du meilleur couplage, par énumération
+    best = (0, 0)
+
+    def search(free, size, total):
+        nonlocal best
+        best = max(best, (size, total))
+        if free:
+            first, rest = free[0], free[1:]
+            search(rest, size, total)
+            for other in rest:
+                if (first, other) in weights:
+                    search([v for v in rest if v != other], size + 1, total + weights[first, other])
+
+    search(list(range(count)), 0, 0)
+    return best
+
+
+def check_matching(generator, graphs=500):
+    from app.services.matching import max_weight_matching
+
+    for _ in range(graphs):
+        count = generator.randint(2, 9)
+        edges = [(i, j, generator.randint(-5, 30)) for i in range(count) for j in range(i + 1, count)
+                 if generator.random() < 0.6]
+        if not edges:
+            continue
+        weights = {(i, j): weight for i, j, weight in edges}
+        mate = max_weight_matching(edges, maxcardinality=True)
+        pairs = [(i, j) for i, j in enumerate(mate) if i < j]
+        if any(mate[j] != i for i, j in pairs):
+            sys.exit(f'inconsistent matching for {edges}')
+        found = (len(pairs), sum(weights[pair] for pair in pairs))
+        expected = exhaustive(1 + max(max(i, j) for i, j, _ in edges), weights)
+        if found != expected:
+            sys.exit(f'matching {found} differs from exhaustive search {expected} for {edges}')
+
+
+def rematch_free_possible(pairs):
+    from app.services.matching import max_weight_matching
+
+    players = [player for pair in pairs for player in pair if player is not None]
+    edges = [(i, j, 1) for i in range(len(players)) for j in range(i + 1, len(players))
+             if players[j].id not in players[i].opponents]
+    mate = max_weight_matching(edges, maxcardinality=True)
+    return len(mate) == len(players) and -1 not in mate
+
+
+def play(size, rounds, draw):
+    from app.services.scheduler import SwissPlayer, swiss_pairings
+
+    generator = random.Random(draw)
+    players = [SwissPlayer(i, i) for i in range(size)]
+    rematches, forced, slowest = 0, 0, 0.0
+    for number in range(1, rounds + 1):
+        with timer() as elapsed:
+            pairs = swiss_pairings(players)
+        slowest = max(slowest, elapsed['elapsed'])
+        replayed = sum(1 for white, black in pairs if black is not None and black.id in white.opponents)
+        if replayed:
+            if rematch_free_possible(pairs):
+                sys.exit(f'round {number} (draw {draw}): {replayed} rematches although a rematch-free pairing exists')
+            rematches += replayed
+            forced += 1
+        for white, black in pairs:
+            if black is None:
+                white.score += 1.0
+                white.had_bye = True
+                continue
+            white.opponents.add(black.id)
+            black.opponents.add(white.id)
+            white.colour_balance += 1
+            black.colour_balance -= 1
+            white.last_colours = (white.last_colours + 'W')[-2:]
+            black.last_colours = (black.last_colours + 'B')[-2:]
+            outcome = generator.random()
+            if outcome < 0.45:
+                white.score += 1.0
+            elif outcome < 0.9:
+                black.score += 1.0
+            else:
+                white.score += 0.5
+                black.score += 0.5
+    return rematches, forced, slowest
+
+
+def main(size=64, rounds=40, draws=3):
+    check_matching(random.Random(42))
+    print(f'{size} players, {rounds} rounds')
+    print(f"{'draw':>5} {'rematches':>10} {'forced rounds':>14} {'slowest ms':>11}")
+    for draw in range(draws):
+        rematches, forced, slowest = play(size, rounds, draw)
+        print(f'{draw:>5} {rematches:>10} {forced:>14} {slowest * 1000:>11.1f}')
+
+
+if __name__ == '__main__':
+    main(*[int(argument) for argument in sys.argv[1:]])
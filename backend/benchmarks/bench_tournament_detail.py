@@ -0,0 +1,66 @@
+"""Nombre de requêtes SQL de GET /tournaments/<id> selon le nombre d'inscrits.
+
+Le nombre de requêtes doit rester constant (tournoi, participants + comptes,
+matchs) ; le script échoue sinon.
+
+Usage : python -m benchmarks.bench_tournament_detail [tailles...]
+"""
+import sys
+
+from benchmarks.common import QueryCounter, make_app, timer
+
+
+def seed(db, n_participants):
+    from app.models.tournament import Match, Tournament, TournamentParticipant
+    from app.models.user import User
+
+    db.session.execute(db.delete(Match))
+    db.session.execute(db.delete(TournamentParticipant))
+    db.session.execute(db.delete(Tournament))
+    db.session.execute(db.delete(User))
+    db.session.execute(db.insert(User), [
+        {'id': i, 'username': f'user {i}', 'email': f'user{i}@example.com', 'password_hash': 'x'}
+        for i in range(1, n_participants + 1)
+    ])
+    db.session.execute(db.insert(Tournament), [
+        {'id': 1, 'name': 'Bench', 'description': '', 'game_type': 'chess',
+         'format': 'single_elimination', 'status': 'pending', 'creator_id': 1}
+    ])
+    # Moitié comptes, moitié invités
+    db.session.execute(db.insert(TournamentParticipant), [
+        {'tournament_id': 1, 'user_id': i if i % 2 else None,
+         'guest_name': None if i % 2 else f'guest {i}', 'status': 'accepted'}
+        for i in range(1, n_participants + 1)
+    ])
+    db.session.execute(db.insert(Match), [
+        {'tournament_id': 1, 'round': 1, 'player1_id': i, 'player2_id': i + 2, 'status': 'pending'}
+        for i in range(1, n_participants - 2, 4)
+    ])
+    db.session.commit()
+
+
+def main(sizes):
+    from app import db
+
+    app = make_app()
+    app.config['RESPONSE_CACHE_BACKEND'] = 'null'
+    from app.services.response_cache import response_cache
+    response_cache.init_app(app)
+    client = app.test_client()
+    counts = set()
+    print(f"{'participants':>12} {'queries':>8} {'ms':>10}")
+    with app.app_context():
+        for size in sizes:
+            seed(db, size)
+            with QueryCounter(db.engine) as queries, timer() as elapsed:
+                response = client.get('/tournaments/1')
+            assert response.status_code == 200
+            assert len(response.get_json()['participants']) == size
+            counts.add(queries.count)
+            print(f"{size:>12} {queries.count:>8} {elapsed['elapsed'] * 1000:>10.1f}")
+    if len(counts) != 1:
+        sys.exit(f'Query count depends on the number of participants: {sorted(counts)}')
+
+
+if __name__ == '__main__':
+    main([int(size) for size in sys.argv[1:]] or [8, 64, 256, 1024])
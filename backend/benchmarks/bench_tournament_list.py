@@ -0,0 +1,57 @@
+"""Nombre de requêtes SQL et latence de GET /tournaments selon la taille de la table.
+
+Le nombre de requêtes doit être le même pour toutes les tailles (pas de
+requête par tournoi), sinon le script sort en erreur.
+
+Usage : python -m benchmarks.bench_tournament_list [tailles...]
+"""
+import sys
+
+from benchmarks.common import QueryCounter, make_app, timer
+
+
+def seed(db, n_tournaments, participants_per_tournament=8):
+    from app.models.tournament import Tournament, TournamentParticipant
+    from app.models.user import User
+
+    db.session.execute(db.delete(TournamentParticipant))
+    db.session.execute(db.delete(Tournament))
+    db.session.execute(db.delete(User))
+    db.session.execute(db.insert(User), [
+        {'id': 1, 'username': 'bench', 'email': 'bench@example.com', 'password_hash': 'x'}
+    ])
+    db.session.execute(db.insert(Tournament), [
+        {'id': i, 'name': f'Tournament {i}', 'description': '', 'game_type': 'chess',
+         'format': 'single_elimination', 'status': 'pending', 'creator_id': 1}
+        for i in range(1, n_tournaments + 1)
+    ])
+    db.session.execute(db.insert(TournamentParticipant), [
+        {'tournament_id': t, 'guest_name': f'guest {j}',
+         'status': 'accepted' if j % 2 else 'pending'}
+        for t in range(1, n_tournaments + 1)
+        for j in range(participants_per_tournament)
+    ])
+    db.session.commit()
+
+
+def main(sizes):
+    from app import db
+
+    app = make_app()
+    client = app.test_client()
+    counts = set()
+    print(f"{'tournaments':>12} {'queries':>8} {'ms':>10}")
+    with app.app_context():
+        for size in sizes:
+            seed(db, size)
+            with QueryCounter(db.engine) as counter, timer() as t:
+                response = client.get('/tournaments?status_counts=1')
+            assert response.status_code == 200
+            counts.add(counter.count)
+            print(f"{size:>12} {counter.count:>8} {t['elapsed'] * 1000:>10.1f}")
+    if len(counts) != 1:
+        sys.exit(f'Query count depends on the number of tournaments: {sorted(counts)}')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10, 100, 1000, 5000])
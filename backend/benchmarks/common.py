@@ -0,0 +1,46 @@
+import os
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+# Base SQLite en mémoire par défaut, surchargeable avec BENCH_DATABASE_URL
+os.environ.setdefault('DATABASE_URL', os.getenv('BENCH_DATABASE_URL', 'sqlite://'))
+os.environ.setdefault('SECRET_KEY', 'bench')
+os.environ.setdefault('JWT_SECRET_KEY', 'bench')
+
+
+def make_app():
+    from app import create_app
+    return create_app()
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+
+def percentile(values, fraction):
+    """Valeur au rang ``fraction`` (0 à 1) des mesures triées, sans interpolation."""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+@contextmanager
+def timer():
+    result = {}
+    start = time.perf_counter()
+    yield result
+    result['elapsed'] = time.perf_counter() - start
@@ -0,0 +1,11 @@
+"""Suite de benchmarks de l'API : jeu de données synthétique, charge par route, résultats JSON.
+
+Usage :
+
+    python -m benchmarks.suite run --users 2000 --tournaments 200 --sizes 8,16,32,64 --output base.json
+    python -m benchmarks.suite run --mode http --threads 16 --only /search /ratings
+    python -m benchmarks.suite compare base.json new.json --threshold 20
+
+Par défaut sur une base SQLite fichier temporaire ; BENCH_DATABASE_URL
+pour PostgreSQL (la base est vidée). Voir ``python -m benchmarks.suite run -h``.
+"""
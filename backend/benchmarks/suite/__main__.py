@@ -0,0 +1,171 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+if 'BENCH_DATABASE_URL' not in os.environ:
+    # Le serveur HTTP sert plusieurs threads : fichier plutôt que mémoire
+    os.environ['BENCH_DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'suite.db') + '?timeout=30'
+
+from benchmarks.common import make_app, timer
+from benchmarks.suite import dataset as datasets
+from benchmarks.suite.runner import MODES, LocalServer, run_client, run_http
+from benchmarks.suite.scenarios import scenarios, select
+
+# Hausse de p95 tolérée par `compare` avant de signaler une régression (en %)
+DEFAULT_THRESHOLD = 20.0
+
+
+def _git(*args):
+    try:
+        return subprocess.run(['git', *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _sizes(value):
+    try:
+        sizes = [int(size) for size in value.split(',')]
+    except ValueError:
+        raise argparse.ArgumentTypeError('sizes must be comma-separated integers')
+    if not sizes or min(sizes) < 4:
+        raise argparse.ArgumentTypeError('sizes must be at least 4')
+    return sizes
+
+
+def _print_results(mode, results):
+    print(f"\n[{mode}] {'endpoint':<46} {'p50':>7} {'p95':>7} {'p99':>7} {'queries':>8} {'req/s':>8} {'errors':>6}")
+    for name, stats in results.items():
+        latency = stats['latency_ms']
+        queries = stats['queries']['mean']
+        print(f"{'':<{len(mode) + 3}}{name:<46} {latency['p50']:>7.1f} {latency['p95']:>7.1f} {latency['p99']:>7.1f} "
+              f"{queries if queries is not None else '-':>8} {stats['throughput_rps'] or 0:>8.0f} {stats['errors']:>6}")
+
+
+def run(args):
+    # Avant l'import de l'application : Config lit l'environnement à son chargement
+    if args.no_cache:
+        os.environ['RESPONSE_CACHE_BACKEND'] = 'null'
+    # Server-Timing pour les mesures ; un budget de requêtes dépassé rend la route en erreur (500)
+    os.environ['QUERY_METRICS_ENABLED'] = 'true'
+    os.environ['QUERY_BUDGETS'] = 'warn' if args.ignore_budgets else 'raise'
+    from flask_jwt_extended import create_access_token
+    from app import db
+
+    app = make_app()
+    with app.app_context():
+        with timer() as seeding:
+            data = datasets.seed(db, app, args.users, args.tournaments, args.sizes, args.seed)
+        dialect = db.engine.dialect.name
+        tokens = {user: create_access_token(identity=str(user)) for user in data.users}
+        db.session.remove()
+    print(f"{args.users} users, {args.tournaments} tournaments (sizes {args.sizes}) "
+          f"seeded in {seeding['elapsed']:.1f}s ({dialect})")
+
+    selected = [scenario for scenario in select(scenarios(data), args.only)
+                if not (args.read_only and scenario.writes)]
+    modes = MODES if args.mode == 'both' else (args.mode,)
+    report = {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': _git('rev-parse', '--short', 'HEAD'),
+            'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')),
+            'python': platform.python_version(),
+            'database': dialect,
+            'response_cache': not args.no_cache,
+            'query_budgets': not args.ignore_budgets,
+            'dataset': {'users': args.users, 'tournaments': args.tournaments, 'sizes': args.sizes, 'seed': args.seed},
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'threads': args.threads,
+        },
+        'results': {},
+    }
+    for mode in modes:
+        results = {}
+        if mode == 'client':
+            for scenario in selected:
+                results[scenario.name] = run_client(app, scenario, tokens, args.requests, args.warmup, args.seed)
+        else:
+            with LocalServer(app) as server:
+                for scenario in selected:
+                    results[scenario.name] = run_http(server, scenario, tokens, args.requests, args.warmup,
+                                                      args.seed, args.threads)
+        report['results'][mode] = results
+        _print_results(mode, results)
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+        print(f'\nResults written to {args.output}')
+    errors = [f'{mode} {name}' for mode, results in report['results'].items()
+              for name, stats in results.items() if stats['errors']]
+    if errors:
+        sys.exit(f"Unexpected statuses: {', '.join(errors)}")
+
+
+def compare(args):
+    with open(args.base) as base_file, open(args.new) as new_file:
+        base, new = json.load(base_file), json.load(new_file)
+    print(f"base {base['meta'].get('commit')} ({base['meta'].get('database')}) -> "
+          f"new {new['meta'].get('commit')} ({new['meta'].get('database')})")
+    regressions = []
+    for mode, results in new['results'].items():
+        print(f"\n[{mode}] {'endpoint':<46} {'p95 base':>9} {'p95 new':>9} {'change':>8} {'queries':>12}")
+        for name, stats in results.items():
+            before = base['results'].get(mode, {}).get(name)
+            if before is None:
+                print(f"{'':<{len(mode) + 3}}{name:<46} {'-':>9} {stats['latency_ms']['p95']:>9.1f}")
+                continue
+            old_p95, new_p95 = before['latency_ms']['p95'], stats['latency_ms']['p95']
+            change = (new_p95 - old_p95) / old_p95 * 100 if old_p95 else 0.0
+            old_queries, new_queries = before['queries']['mean'], stats['queries']['mean']
+            print(f"{'':<{len(mode) + 3}}{name:<46} {old_p95:>9.1f} {new_p95:>9.1f} {change:>+7.0f}% "
+                  f"{f'{old_queries} -> {new_queries}':>12}")
+            if change > args.threshold:
+                regressions.append(f'{mode} {name}: p95 {change:+.0f}%')
+            if old_queries is not None and new_queries is not None and new_queries > old_queries:
+                regressions.append(f'{mode} {name}: queries {old_queries} -> {new_queries}')
+    if regressions:
+        sys.exit('Regressions:\n  ' + '\n  '.join(regressions))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='seed a synthetic dataset and measure every endpoint')
+    run_parser.add_argument('--users', type=int, default=2000)
+    run_parser.add_argument('--tournaments', type=int, default=200)
+    run_parser.add_argument('--sizes', type=_sizes, default=[8, 16, 32, 64],
+                            help='participants per tournament, cycled (default: 8,16,32,64)')
+    run_parser.add_argument('--requests', type=int, default=200, help='measured requests per endpoint and mode')
+    run_parser.add_argument('--warmup', type=int, default=10, help='unmeasured requests before each endpoint')
+    run_parser.add_argument('--threads', type=int, default=8, help='concurrent clients in http mode')
+    run_parser.add_argument('--mode', choices=MODES + ('both',), default='both')
+    run_parser.add_argument('--only', nargs='+', metavar='PATTERN', help='endpoints whose name contains a pattern')
+    run_parser.add_argument('--read-only', action='store_true', help='skip the endpoints that write')
+    run_parser.add_argument('--no-cache', action='store_true', help='disable the response cache')
+    run_parser.add_argument('--ignore-budgets', action='store_true',
+                            help='log exceeded query budgets instead of failing the request')
+    run_parser.add_argument('--seed', type=int, default=42, help='random seed of the dataset and requests')
+    run_parser.add_argument('--output', help='JSON file receiving the results')
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser('compare', help='compare two result files (exit 1 on regression)')
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help='tolerated p95 increase in percent (default: %(default)s)')
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""Jeu de données synthétique : comptes, tournois de tous formats, brackets et résultats.
+
+Les lignes de base (comptes, tournois, inscriptions) sont insérées en
+masse ; les brackets et calendriers sont créés par les vraies routes
+(génération, sauvegarde, planification) pour que matchs, classements et
+bilans aient la forme produite en production. Les résultats de
+championnat sont saisis par les services puis les tables dérivées sont
+reconstruites (``rebuild``/``replay``).
+
+La base visée est vidée (drop_all/create_all) : ne jamais pointer
+BENCH_DATABASE_URL vers une base utile.
+"""
+import random
+from collections import namedtuple
+
+from benchmarks.bench_search import CITIES, EVENTS, GAMES, WORDS
+
+SEED_BATCH = 10000
+FORMATS = ('single_elimination', 'double_elimination', 'round_robin', 'swiss')
+# Un tournoi sur OPEN_EVERY reste ouvert aux inscriptions (à moitié rempli)
+OPEN_EVERY = 5
+
+Dataset = namedtuple('Dataset', 'users tournaments open_tournaments creators game_types scheduled_matches')
+
+
+def _insert(db, model, rows):
+    for start in range(0, len(rows), SEED_BATCH):
+        db.session.execute(db.insert(model), rows[start:start + SEED_BATCH])
+
+
+def _base_rows(db, generator, n_users, n_tournaments, sizes):
+    from app.models.tournament import Tournament, TournamentParticipant
+    from app.models.user import User
+
+    _insert(db, User, [
+        {'id': i, 'username': f'{generator.choice(CITIES)}{generator.choice(WORDS)}{i}',
+         'email': f'user{i}@example.com', 'password_hash': 'x'}
+        for i in range(1, n_users + 1)
+    ])
+    tournaments, participants = [], []
+    for i in range(1, n_tournaments + 1):
+        size = min(sizes[i % len(sizes)], n_users)
+        game = generator.choice(GAMES)
+        is_open = i % OPEN_EVERY == 0
+        entrants = generator.sample(range(1, n_users + 1), size // 2 if is_open else size)
+        tournaments.append({
+            'id': i,
+            'name': f'{generator.choice(CITIES).title()} {game.title()} {generator.choice(EVENTS).title()} {i}',
+            'description': ' '.join(generator.sample(WORDS, 4)),
+            'game_type': game,
+            'format': FORMATS[i % len(FORMATS)],
+            'status': 'pending' if is_open else 'in_progress',
+            'creator_id': generator.randint(1, n_users),
+            'max_participants': size,
+            'seats_taken': len(entrants),
+        })
+        participants += [{'tournament_id': i, 'user_id': user_id, 'status': 'accepted'} for user_id in entrants]
+    _insert(db, Tournament, tournaments)
+    _insert(db, TournamentParticipant, participants)
+    db.session.commit()
+    if db.engine.dialect.name == 'postgresql':
+        # Identifiants explicites : les séquences repartent après les lignes insérées
+        for table in ('user', 'tournament'):
+            db.session.execute(db.text(
+                f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), (SELECT max(id) FROM \"{table}\"))"
+            ))
+        db.session.commit()
+    return tournaments
+
+
+def _play_bracket(client, generator, tournament, headers):
+    """Génère le bracket puis le renvoie avec une part aléatoire des résultats (tous pour un sur deux)."""
+    from app.services.bracket_engine import BracketEngine, BracketError
+
+    url = f"/tournaments/{tournament['id']}/bracket"
+    response = client.post(f'{url}/generate', headers=headers)
+    assert response.status_code == 201, response.get_json()
+    engine = BracketEngine(response.get_json()['bracket'])
+    finished = generator.random() < 0.5
+    playable = True
+    while playable:
+        playable = [match for match in engine.iter_matches()
+                    if match['winner'] is None and not match.get('bye') and match['teamA'] and match['teamB']]
+        if not finished:
+            playable = playable[:generator.randint(0, len(playable))]
+        for match in playable:
+            try:
+                engine.report_result(match['id'], generator.choice('AB'),
+                                     generator.randint(0, 3), generator.randint(0, 3))
+            except BracketError:
+                continue
+        if not finished:
+            break
+    response = client.post(url, json={'bracket': engine.data}, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return finished
+
+
+def _play_schedule(db, client, generator, tournament, headers):
+    """Planifie le championnat (ou les rondes suisses) et saisit les scores par le service."""
+    from app.models.tournament import Match
+    from app.services.scheduler import ScheduleService
+
+    url = f"/tournaments/{tournament['id']}/schedule"
+    rounds = max(1, tournament['max_participants'].bit_length() - 1)
+    finished = generator.random() < 0.5
+    for number in range(1, (rounds if tournament['format'] == 'swiss' else 1) + 1):
+        response = client.post(url, headers=headers)
+        if response.status_code != 201:
+            break
+        matches = db.session.scalars(
+            db.select(Match)
+            .where(Match.tournament_id == tournament['id'], Match.status.notin_(('completed', 'bye')))
+            .order_by(Match.round, Match.id)
+        ).all()
+        last = number == rounds or tournament['format'] == 'round_robin'
+        if last and not finished:
+            matches = matches[:generator.randint(0, len(matches))]
+        for match in matches:
+            ScheduleService.report_result(match, generator.randint(0, 3), generator.randint(0, 3))
+        db.session.commit()
+    return finished
+
+
+def seed(db, app, n_users, n_tournaments, sizes, seed_value=42):
+    """Remplit la base et retourne les identifiants utilisés par les scénarios."""
+    from flask_jwt_extended import create_access_token
+    from app.models.tournament import Match
+    from app.services.rating_service import RatingService
+    from app.services.standings_service import StandingsService
+    from app.services.user_stats_service import UserStatsService
+
+    generator = random.Random(seed_value)
+    db.drop_all()
+    db.create_all()
+    tournaments = _base_rows(db, generator, n_users, n_tournaments, sizes)
+
+    client = app.test_client()
+    for tournament in tournaments:
+        if tournament['status'] == 'pending':
+            continue
+        headers = {'Authorization': f"Bearer {create_access_token(identity=str(tournament['creator_id']))}"}
+        if tournament['format'] in ('single_elimination', 'double_elimination'):
+            finished = _play_bracket(client, generator, tournament, headers)
+        else:
+            finished = _play_schedule(db, client, generator, tournament, headers)
+            StandingsService.rebuild(tournament['id'])
+        if finished:
+            response = client.put(f"/tournaments/{tournament['id']}", json={'status': 'completed'}, headers=headers)
+            assert response.status_code == 200, response.get_json()
+    RatingService.replay()
+    UserStatsService.rebuild()
+
+    scheduled = db.session.execute(
+        db.select(Match.tournament_id, Match.id)
+        .where(Match.section.in_(('round_robin', 'swiss')), Match.status != 'bye')
+    ).all()
+    return Dataset(
+        users=list(range(1, n_users + 1)),
+        tournaments=[tournament['id'] for tournament in tournaments],
+        open_tournaments=[tournament['id'] for tournament in tournaments if tournament['status'] == 'pending'],
+        creators={tournament['id']: tournament['creator_id'] for tournament in tournaments},
+        game_types=sorted({tournament['game_type'] for tournament in tournaments}),
+        scheduled_matches=[tuple(row) for row in scheduled],
+    )
@@ -0,0 +1,134 @@
+"""Exécution des scénarios et agrégation des mesures.
+
+Deux modes :
+
+- ``client`` : client de test Flask, requêtes en série dans le processus
+  (latence de l'application seule, sans réseau) ;
+- ``http`` : serveur WSGI multi-threadé sur un port local et ``threads``
+  clients simultanés (latence sous charge et débit).
+
+Le nombre de requêtes SQL et le temps en base de chaque réponse sont lus
+dans l'en-tête Server-Timing de l'instrumentation de l'application
+(QUERY_METRICS_ENABLED), identique dans les deux modes.
+"""
+import json
+import logging
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import percentile
+from benchmarks.suite.scenarios import generator_for
+
+MODES = ('client', 'http')
+DB_TIMING = re.compile(r'\bdb;dur=([\d.]+);desc="(\d+) queries"')
+
+
+def db_timing(headers):
+    """(requêtes SQL, ms en base) de l'en-tête Server-Timing, (None, None) s'il est absent."""
+    match = DB_TIMING.search(headers.get('Server-Timing') or '')
+    return (int(match.group(2)), float(match.group(1))) if match else (None, None)
+
+
+def summarize(samples, expected, elapsed):
+    """Statistiques d'un scénario à partir des mesures (ms, statut, requêtes SQL, ms en base)."""
+    timings = [sample[0] for sample in samples]
+    queries = [sample[2] for sample in samples if sample[2] is not None]
+    database = [sample[3] for sample in samples if sample[3] is not None]
+    statuses = {}
+    for sample in samples:
+        statuses[str(sample[1])] = statuses.get(str(sample[1]), 0) + 1
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for sample in samples if sample[1] not in expected),
+        'statuses': statuses,
+        'latency_ms': {
+            'p50': round(percentile(timings, 0.5), 3),
+            'p95': round(percentile(timings, 0.95), 3),
+            'p99': round(percentile(timings, 0.99), 3),
+            'mean': round(sum(timings) / len(timings), 3),
+            'max': round(max(timings), 3),
+        },
+        'queries': {
+            'mean': round(sum(queries) / len(queries), 2) if queries else None,
+            'max': max(queries) if queries else None,
+        },
+        'db_ms_mean': round(sum(database) / len(database), 3) if database else None,
+        'throughput_rps': round(len(samples) / elapsed, 1) if elapsed else None,
+    }
+
+
+def _headers(tokens, user):
+    return {'Authorization': f'Bearer {tokens[user]}'} if user is not None else {}
+
+
+def _plan(scenario, count, seed_value):
+    generator = generator_for(scenario.name, seed_value)
+    return [scenario.build(generator) for _ in range(count)]
+
+
+def run_client(app, scenario, tokens, count, warmup, seed_value):
+    client = app.test_client()
+    plan = _plan(scenario, warmup + count, seed_value)
+    samples = []
+    started = time.perf_counter()
+    for position, (method, url, body, user) in enumerate(plan):
+        if position == warmup:
+            started = time.perf_counter()
+        start = time.perf_counter()
+        response = client.open(url, method=method, json=body, headers=_headers(tokens, user))
+        elapsed = (time.perf_counter() - start) * 1000
+        if position >= warmup:
+            samples.append((elapsed, response.status_code, *db_timing(response.headers)))
+    return summarize(samples, scenario.expected, time.perf_counter() - started)
+
+
+class LocalServer:
+    """Serveur WSGI multi-threadé de l'application sur un port libre de 127.0.0.1."""
+
+    def __init__(self, app):
+        from werkzeug.serving import make_server
+
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        self.server = make_server('127.0.0.1', 0, app, threaded=True)
+        self.url = f'http://127.0.0.1:{self.server.server_port}'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.thread.join()
+
+
+def _send(base_url, tokens, request):
+    method, url, body, user = request
+    headers = _headers(tokens, user)
+    data = None
+    if body is not None:
+        data = json.dumps(body).encode()
+        headers['Content-Type'] = 'application/json'
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(urllib.request.Request(base_url + url, data, headers, method=method)) as response:
+            response.read()
+            status, headers = response.status, response.headers
+    except urllib.error.HTTPError as e:
+        status, headers = e.code, e.headers
+    elapsed = (time.perf_counter() - start) * 1000
+    return (elapsed, status, *db_timing(headers))
+
+
+def run_http(server, scenario, tokens, count, warmup, seed_value, threads):
+    plan = _plan(scenario, warmup + count, seed_value)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda request: _send(server.url, tokens, request), plan[:warmup]))
+        started = time.perf_counter()
+        samples = list(executor.map(lambda request: _send(server.url, tokens, request), plan[warmup:]))
+        elapsed = time.perf_counter() - started
+    return summarize(samples, scenario.expected, elapsed)
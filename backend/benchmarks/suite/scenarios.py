@@ -0,0 +1,74 @@
+"""Requêtes mesurées par la suite : une entrée par route, construite à partir du jeu de données.
+
+Chaque scénario tire ses paramètres au hasard (tournoi, compte, mot
+recherché) pour ne pas mesurer une seule ligne en cache. ``build``
+retourne (méthode, url, corps JSON, compte authentifié ou None) ;
+``expected`` liste les statuts considérés comme des succès.
+"""
+import random
+from collections import namedtuple
+from urllib.parse import urlencode
+
+from benchmarks.bench_search import CITIES, WORDS
+
+Scenario = namedtuple('Scenario', 'name build expected writes')
+
+
+def _get(path, user=None, **params):
+    return 'GET', f'{path}?{urlencode(params)}' if params else path, None, user
+
+
+def scenarios(dataset):
+    def tournament(generator):
+        return generator.choice(dataset.tournaments)
+
+    def user(generator):
+        return generator.choice(dataset.users)
+
+    def join(generator):
+        return 'POST', f'/tournaments/{generator.choice(dataset.open_tournaments)}/join', None, user(generator)
+
+    def report(generator):
+        tournament_id, match_id = generator.choice(dataset.scheduled_matches)
+        body = {'score1': generator.randint(0, 3), 'score2': generator.randint(0, 3)}
+        return 'POST', f'/tournaments/{tournament_id}/matches/{match_id}/result', body, dataset.creators[tournament_id]
+
+    available = [
+        Scenario('GET /tournaments', lambda g: _get('/tournaments', limit=20), (200,), False),
+        Scenario('GET /tournaments?game_type', lambda g: _get(
+            '/tournaments', game_type=g.choice(dataset.game_types), status='in_progress', sort='name', limit=20),
+            (200,), False),
+        Scenario('GET /tournaments/<id>', lambda g: _get(f'/tournaments/{tournament(g)}'), (200,), False),
+        Scenario('GET /tournaments/<id>/bracket', lambda g: _get(f'/tournaments/{tournament(g)}/bracket'), (200,), False),
+        Scenario('GET /tournaments/<id>/matches', lambda g: _get(f'/tournaments/{tournament(g)}/matches'), (200,), False),
+        Scenario('GET /tournaments/<id>/standings', lambda g: _get(f'/tournaments/{tournament(g)}/standings'),
+                 (200,), False),
+        Scenario('GET /ratings', lambda g: _get('/ratings', game_type=g.choice(dataset.game_types), limit=20),
+                 (200,), False),
+        Scenario('GET /users/<id>/matches', lambda g: _get(f'/users/{user(g)}/matches', limit=20), (200,), False),
+        Scenario('GET /users/<id>/stats', lambda g: _get(f'/users/{user(g)}/stats'), (200,), False),
+        Scenario('GET /search/tournaments', lambda g: _get('/search/tournaments', q=g.choice(CITIES + WORDS)[:4]),
+                 (200,), False),
+        Scenario('GET /search/users', lambda g: _get('/search/users', user(g), q=g.choice(CITIES)[:3]),
+                 (200,), False),
+        Scenario('GET /notifications/unread_count', lambda g: _get('/notifications/unread_count', user(g)),
+                 (200,), False),
+    ]
+    # Écritures : déjà inscrit (400) ou complet (409) sont des réponses normales sous charge
+    if dataset.open_tournaments:
+        available.append(Scenario('POST /tournaments/<id>/join', join, (201, 202, 400, 409), True))
+    if dataset.scheduled_matches:
+        available.append(Scenario('POST /tournaments/<id>/matches/<id>/result', report, (200,), True))
+    return available
+
+
+def select(available, patterns):
+    """Scénarios dont le nom contient l'un des motifs (tous si aucun motif)."""
+    if not patterns:
+        return available
+    return [scenario for scenario in available if any(pattern in scenario.name for pattern in patterns)]
+
+
+def generator_for(name, seed_value):
+    """Générateur reproductible propre à un scénario (mêmes requêtes d'un commit à l'autre)."""
+    return random.Random(f'{seed_value}:{name}')
@@ -0,0 +1,35 @@
+"""add tournament seat counter and waitlist flag
+
+Revision ID: 0b7d3e95c2a4
+Revises: f2a8c4d61b93
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b7d3e95c2a4'
+down_revision = 'f2a8c4d61b93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tournament', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('seats_taken', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('waitlist', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    # Initialisation du compteur à partir des inscriptions existantes
+    op.execute(
+        'UPDATE tournament SET seats_taken = '
+        '(SELECT count(*) FROM tournament_participant WHERE tournament_participant.tournament_id = tournament.id '
+        "AND tournament_participant.status IN ('pending', 'accepted'))"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('tournament', schema=None) as batch_op:
+        batch_op.drop_column('waitlist')
+        batch_op.drop_column('seats_taken')
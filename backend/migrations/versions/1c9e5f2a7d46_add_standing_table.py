@@ -0,0 +1,43 @@
+"""add standing table
+
+Revision ID: 1c9e5f2a7d46
+Revises: 0b7d3e95c2a4
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c9e5f2a7d46'
+down_revision = '0b7d3e95c2a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('standing',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('tournament_id', sa.Integer(), nullable=False),
+    sa.Column('participant_id', sa.Integer(), nullable=False),
+    sa.Column('played', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('wins', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('draws', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('losses', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('points', sa.Float(), server_default='0', nullable=False),
+    sa.Column('score_for', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('score_against', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('buchholz', sa.Float(), server_default='0', nullable=False),
+    sa.Column('sonneborn_berger', sa.Float(), server_default='0', nullable=False),
+    sa.Column('eliminated_stage', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['participant_id'], ['tournament_participant.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tournament_id'], ['tournament.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('tournament_id', 'participant_id', name='unique_standing_participant')
+    )
+    # Les classements sont remplis par `flask rebuild-standings`
+
+
+def downgrade():
+    op.drop_table('standing')
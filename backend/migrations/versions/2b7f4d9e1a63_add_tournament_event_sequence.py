@@ -0,0 +1,28 @@
+"""add tournament event sequence table
+
+Revision ID: 2b7f4d9e1a63
+Revises: 6c2e9f4b8d15
+Create Date: 2026-10-18 22:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2b7f4d9e1a63'
+down_revision = '6c2e9f4b8d15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tournament_event_sequence',
+    sa.Column('tournament_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('last_id', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('tournament_id')
+    )
+
+
+def downgrade():
+    op.drop_table('tournament_event_sequence')
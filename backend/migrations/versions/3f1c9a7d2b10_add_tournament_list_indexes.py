@@ -0,0 +1,41 @@
+"""add composite indexes for paginated tournament list
+
+Revision ID: 3f1c9a7d2b10
+Revises: 5b08795a9c46, remove_is_admin
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7d2b10'
+down_revision = ('5b08795a9c46', 'remove_is_admin')
+branch_labels = None
+depends_on = None
+
+# (nom, colonnes) : un index par filtre, pour chaque tri stable (id, puis name + id)
+INDEXES = [
+    ('ix_tournament_name_id', ['name', 'id']),
+    ('ix_tournament_status_id', ['status', 'id']),
+    ('ix_tournament_status_name_id', ['status', 'name', 'id']),
+    ('ix_tournament_game_type_id', ['game_type', 'id']),
+    ('ix_tournament_game_type_name_id', ['game_type', 'name', 'id']),
+    ('ix_tournament_format_id', ['format', 'id']),
+    ('ix_tournament_format_name_id', ['format', 'name', 'id']),
+    ('ix_tournament_creator_id_id', ['creator_id', 'id']),
+    ('ix_tournament_creator_id_name_id', ['creator_id', 'name', 'id']),
+]
+
+
+def upgrade():
+    with op.batch_alter_table('tournament', schema=None) as batch_op:
+        for name, columns in INDEXES:
+            batch_op.create_index(name, columns, unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tournament', schema=None) as batch_op:
+        for name, _ in reversed(INDEXES):
+            batch_op.drop_index(name)
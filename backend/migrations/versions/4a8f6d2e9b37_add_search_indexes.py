@@ -0,0 +1,42 @@
+"""add tournament search vector and trigram username index
+
+Revision ID: 4a8f6d2e9b37
+Revises: 9d5b3e7a2c14
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4a8f6d2e9b37'
+down_revision = '9d5b3e7a2c14'
+branch_labels = None
+depends_on = None
+
+# Même expression que app.models.tournament.SEARCH_VECTOR_SQL
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(game_type, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+)
+
+
+def upgrade():
+    # SQLite : la recherche se replie sur LIKE, sans index
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # Colonne stockée : ts_rank_cd lit le tsvector sans le recalculer pour chaque ligne trouvée
+    op.execute(f'ALTER TABLE tournament ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED')
+    op.execute('CREATE INDEX ix_tournament_search_vector ON tournament USING gin (search_vector)')
+    op.execute('CREATE INDEX ix_user_username_trgm ON "user" USING gin (lower(username) gin_trgm_ops)')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('DROP INDEX IF EXISTS ix_user_username_trgm')
+    op.execute('DROP INDEX IF EXISTS ix_tournament_search_vector')
+    op.execute('ALTER TABLE tournament DROP COLUMN IF EXISTS search_vector')
@@ -0,0 +1,31 @@
+"""add rating bucket table
+
+Revision ID: 5e1d7a3c9f82
+Revises: 2b7f4d9e1a63
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e1d7a3c9f82'
+down_revision = '2b7f4d9e1a63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('rating_bucket',
+    sa.Column('game_type', sa.String(length=64), nullable=False),
+    sa.Column('level', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('bucket', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('game_type', 'level', 'bucket')
+    )
+    # Les comptes sont remplis par `flask replay-ratings`
+
+
+def downgrade():
+    op.drop_table('rating_bucket')
@@ -0,0 +1,26 @@
+"""add claimed_at to notification outbox
+
+Revision ID: 6c2e9f4b8d15
+Revises: 4a8f6d2e9b37
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6c2e9f4b8d15'
+down_revision = '4a8f6d2e9b37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notification_outbox', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('claimed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('notification_outbox', schema=None) as batch_op:
+        batch_op.drop_column('claimed_at')
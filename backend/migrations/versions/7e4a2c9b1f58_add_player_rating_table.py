@@ -0,0 +1,39 @@
+"""add player rating table
+
+Revision ID: 7e4a2c9b1f58
+Revises: 1c9e5f2a7d46
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e4a2c9b1f58'
+down_revision = '1c9e5f2a7d46'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('player_rating',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('game_type', sa.String(length=64), nullable=False),
+    sa.Column('rating', sa.Float(), nullable=False),
+    sa.Column('games', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'game_type', name='unique_player_rating_game_type')
+    )
+    with op.batch_alter_table('player_rating', schema=None) as batch_op:
+        batch_op.create_index('ix_player_rating_game_type_rating_user_id', ['game_type', 'rating', 'user_id'], unique=False)
+    # Les classements de l'historique sont calculés par `flask replay-ratings`
+
+
+def downgrade():
+    with op.batch_alter_table('player_rating', schema=None) as batch_op:
+        batch_op.drop_index('ix_player_rating_game_type_rating_user_id')
+
+    op.drop_table('player_rating')
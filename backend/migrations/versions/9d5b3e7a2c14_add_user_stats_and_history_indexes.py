@@ -0,0 +1,59 @@
+"""add user stats table, final rank and user history indexes
+
+Revision ID: 9d5b3e7a2c14
+Revises: 7e4a2c9b1f58
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d5b3e7a2c14'
+down_revision = '7e4a2c9b1f58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('game_type', sa.String(length=64), nullable=False),
+    sa.Column('tournaments_played', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('tournaments_won', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('podiums', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('matches_played', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('wins', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('draws', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('losses', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'game_type', name='unique_user_stats_game_type')
+    )
+    with op.batch_alter_table('tournament_participant', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('final_rank', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_tournament_participant_user_id_tournament_id', ['user_id', 'tournament_id'], unique=False)
+
+    # Les index (joueur, id) remplacent les index sur le joueur seul
+    with op.batch_alter_table('match', schema=None) as batch_op:
+        batch_op.drop_index('ix_match_player1_id')
+        batch_op.drop_index('ix_match_player2_id')
+        batch_op.create_index('ix_match_player1_id_id', ['player1_id', 'id'], unique=False)
+        batch_op.create_index('ix_match_player2_id_id', ['player2_id', 'id'], unique=False)
+    # Les places finales et les bilans sont calculés par `flask rebuild-user-stats`
+
+
+def downgrade():
+    with op.batch_alter_table('match', schema=None) as batch_op:
+        batch_op.drop_index('ix_match_player2_id_id')
+        batch_op.drop_index('ix_match_player1_id_id')
+        batch_op.create_index('ix_match_player2_id', ['player2_id'], unique=False)
+        batch_op.create_index('ix_match_player1_id', ['player1_id'], unique=False)
+
+    with op.batch_alter_table('tournament_participant', schema=None) as batch_op:
+        batch_op.drop_index('ix_tournament_participant_user_id_tournament_id')
+        batch_op.drop_column('final_rank')
+
+    op.drop_table('user_stats')
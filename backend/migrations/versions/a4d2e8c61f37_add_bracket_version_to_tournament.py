@@ -0,0 +1,26 @@
+"""add bracket_version to tournament
+
+Revision ID: a4d2e8c61f37
+Revises: 3f1c9a7d2b10
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d2e8c61f37'
+down_revision = '3f1c9a7d2b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tournament', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('bracket_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('tournament', schema=None) as batch_op:
+        batch_op.drop_column('bracket_version')
@@ -0,0 +1,50 @@
+"""project bracket results into match
+
+Revision ID: c7b3f05e9d21
+Revises: a4d2e8c61f37
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7b3f05e9d21'
+down_revision = 'a4d2e8c61f37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('match', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('bracket_match_id', sa.String(length=32), nullable=True))
+        batch_op.add_column(sa.Column('section', sa.String(length=16), nullable=True))
+        batch_op.add_column(sa.Column('participant1_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('participant2_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('winner_participant_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_match_participant1_id', 'tournament_participant', ['participant1_id'], ['id'], ondelete='SET NULL')
+        batch_op.create_foreign_key('fk_match_participant2_id', 'tournament_participant', ['participant2_id'], ['id'], ondelete='SET NULL')
+        batch_op.create_foreign_key('fk_match_winner_participant_id', 'tournament_participant', ['winner_participant_id'], ['id'], ondelete='SET NULL')
+        batch_op.create_unique_constraint('unique_match_bracket_match_id', ['tournament_id', 'bracket_match_id'])
+        batch_op.create_index('ix_match_tournament_id_round', ['tournament_id', 'round'], unique=False)
+        batch_op.create_index('ix_match_player1_id', ['player1_id'], unique=False)
+        batch_op.create_index('ix_match_player2_id', ['player2_id'], unique=False)
+        batch_op.create_index('ix_match_winner_id', ['winner_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('match', schema=None) as batch_op:
+        batch_op.drop_index('ix_match_winner_id')
+        batch_op.drop_index('ix_match_player2_id')
+        batch_op.drop_index('ix_match_player1_id')
+        batch_op.drop_index('ix_match_tournament_id_round')
+        batch_op.drop_constraint('unique_match_bracket_match_id', type_='unique')
+        batch_op.drop_constraint('fk_match_winner_participant_id', type_='foreignkey')
+        batch_op.drop_constraint('fk_match_participant2_id', type_='foreignkey')
+        batch_op.drop_constraint('fk_match_participant1_id', type_='foreignkey')
+        batch_op.drop_column('winner_participant_id')
+        batch_op.drop_column('participant2_id')
+        batch_op.drop_column('participant1_id')
+        batch_op.drop_column('section')
+        batch_op.drop_column('bracket_match_id')
@@ -0,0 +1,43 @@
+"""add notification created_at, feed indexes and unread counter
+
+Revision ID: e3f6b19a4d72
+Revises: d91e4a7b3c58
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3f6b19a4d72'
+down_revision = 'd91e4a7b3c58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+        batch_op.create_index('ix_notification_user_id_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_notification_user_id_unread', 'notification', ['user_id'], unique=False,
+                    postgresql_where=sa.text('read = false'))
+
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('unread_notification_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Initialisation des compteurs à partir des notifications existantes
+    op.execute(
+        'UPDATE "user" SET unread_notification_count = '
+        '(SELECT count(*) FROM notification WHERE notification.user_id = "user".id AND notification.read = false)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('unread_notification_count')
+
+    op.drop_index('ix_notification_user_id_unread', table_name='notification')
+    with op.batch_alter_table('notification', schema=None) as batch_op:
+        batch_op.drop_index('ix_notification_user_id_created_at_id')
+        batch_op.drop_column('created_at')
@@ -0,0 +1,37 @@
+"""add partial unique indexes on tournament participants
+
+Revision ID: f2a8c4d61b93
+Revises: e3f6b19a4d72
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a8c4d61b93'
+down_revision = 'e3f6b19a4d72'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Suppression des doublons existants (on garde la première inscription)
+    op.execute(
+        'DELETE FROM tournament_participant WHERE user_id IS NOT NULL AND id NOT IN '
+        '(SELECT min(id) FROM tournament_participant WHERE user_id IS NOT NULL GROUP BY tournament_id, user_id)'
+    )
+    op.execute(
+        'DELETE FROM tournament_participant WHERE guest_name IS NOT NULL AND id NOT IN '
+        '(SELECT min(id) FROM tournament_participant WHERE guest_name IS NOT NULL GROUP BY tournament_id, guest_name)'
+    )
+    op.create_index('uq_tournament_participant_user', 'tournament_participant', ['tournament_id', 'user_id'],
+                    unique=True, postgresql_where=sa.text('user_id IS NOT NULL'))
+    op.create_index('uq_tournament_participant_guest', 'tournament_participant', ['tournament_id', 'guest_name'],
+                    unique=True, postgresql_where=sa.text('guest_name IS NOT NULL'))
+
+
+def downgrade():
+    op.drop_index('uq_tournament_participant_guest', table_name='tournament_participant')
+    op.drop_index('uq_tournament_participant_user', table_name='tournament_participant')
@@ -1,9 +1,12 @@
 from dotenv import load_dotenv
 load_dotenv()
 
-from app import create_app
+# Les processus 'spawn' du pool de hachage réimportent ce module sous le nom
+# __mp_main__ : ils n'ont besoin que de werkzeug, pas d'une application complète
+if __name__ != '__mp_main__':
+    from app import create_app
 
-app = create_app()
+    app = create_app()
 
 if __name__ == '__main__':
-    app.run(debug=True) 
\ No newline at end of file
+    app.run(debug=True)